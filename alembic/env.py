@@ -10,6 +10,7 @@ from alembic import context
 from app.db.base import Base
 from app.models.assignment import Assignment  # noqa: F401
 from app.models.exercise import Exercise  # noqa: F401
+from app.models.progress import PatientDailyProgress  # noqa: F401
 from app.models.session import Session, SessionSummary  # noqa: F401
 from app.models.user import User  # noqa: F401
 
@@ -0,0 +1,53 @@
+"""keyset pagination indexes
+
+Revision ID: 3b7d52e1a9c4
+Revises: c1e23c407dc4
+Create Date: 2026-10-19 12:55:10.418233
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d52e1a9c4"
+down_revision: str | Sequence[str] | None = "c1e23c407dc4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # sessions.created_at: chave estável de ordenação (started_at muda no start)
+    op.add_column("sessions", sa.Column("created_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE sessions SET created_at = started_at WHERE created_at IS NULL")
+    op.alter_column("sessions", "created_at", existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index("ix_users_role_created", "users", ["role", "created_at", "id"], unique=False)
+    op.create_index("ix_exercises_created", "exercises", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_sessions_patient_created",
+        "sessions",
+        ["patient_user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_assignments_patient_created",
+        "assignments",
+        ["patient_user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_assignments_created", "assignments", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_assignments_created", table_name="assignments")
+    op.drop_index("ix_assignments_patient_created", table_name="assignments")
+    op.drop_index("ix_sessions_patient_created", table_name="sessions")
+    op.drop_index("ix_exercises_created", table_name="exercises")
+    op.drop_index("ix_users_role_created", table_name="users")
+    op.drop_column("sessions", "created_at")
@@ -0,0 +1,69 @@
+"""patient daily progress rollup
+
+Revision ID: 5a9f3c6e1d20
+Revises: 8e41c0d7b2f5
+Create Date: 2026-10-19 14:02:31.557104
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a9f3c6e1d20"
+down_revision: str | Sequence[str] | None = "8e41c0d7b2f5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "patient_daily_progress",
+        sa.Column("patient_user_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=False),
+        sa.Column("rom_sum", sa.Float(), nullable=False),
+        sa.Column("rom_max", sa.Float(), nullable=True),
+        sa.Column("cadence_sum", sa.Float(), nullable=False),
+        sa.Column("cadence_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["patient_user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("patient_user_id", "day"),
+    )
+
+    # backfill com o histórico já existente
+    op.execute(
+        """
+        INSERT INTO patient_daily_progress (
+            patient_user_id, day, sessions, reps, rom_sum, rom_max,
+            cadence_sum, cadence_count, updated_at
+        )
+        SELECT
+            s.patient_user_id,
+            s.started_at::date,
+            count(ss.session_id),
+            coalesce(sum(ss.reps), 0),
+            coalesce(sum(ss.rom), 0),
+            max(ss.rom),
+            coalesce(sum(ss.cadence), 0),
+            count(ss.cadence),
+            now() at time zone 'utc'
+        FROM sessions s
+        JOIN session_summaries ss ON ss.session_id = s.id
+        WHERE s.status = 'FINISHED'
+        GROUP BY s.patient_user_id, s.started_at::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("patient_daily_progress")
@@ -0,0 +1,45 @@
+"""foreign key indexes
+
+Revision ID: 8e41c0d7b2f5
+Revises: 3b7d52e1a9c4
+Create Date: 2026-10-19 13:20:44.901512
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e41c0d7b2f5"
+down_revision: str | Sequence[str] | None = "3b7d52e1a9c4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# sessions.patient_user_id e assignments.patient_user_id já são cobertos pelos
+# índices compostos (patient_user_id, created_at, id) da 3b7d52e1a9c4.
+FK_INDEXES = [
+    ("ix_sessions_assignment_id", "sessions", ["assignment_id"]),
+    ("ix_sessions_exercise_id", "sessions", ["exercise_id"]),
+    ("ix_assignments_exercise_id", "assignments", ["exercise_id"]),
+    ("ix_assignments_config_id", "assignments", ["config_id"]),
+    (
+        "ix_exercise_configs_patient_exercise",
+        "exercise_configs",
+        ["patient_user_id", "exercise_id"],
+    ),
+    ("ix_exercise_configs_exercise_id", "exercise_configs", ["exercise_id"]),
+    ("ix_exercises_created_by_user_id", "exercises", ["created_by_user_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in FK_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(FK_INDEXES):
+        op.drop_index(name, table_name=table)
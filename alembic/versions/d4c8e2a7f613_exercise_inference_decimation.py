@@ -0,0 +1,37 @@
+"""exercise inference decimation
+
+Revision ID: d4c8e2a7f613
+Revises: 5a9f3c6e1d20
+Create Date: 2026-10-19 16:40:12.204518
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4c8e2a7f613"
+down_revision: str | Sequence[str] | None = "5a9f3c6e1d20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "exercises",
+        sa.Column("inference_mode", sa.String(length=20), server_default="FULL", nullable=False),
+    )
+    op.add_column(
+        "exercises",
+        sa.Column("inference_stride", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("exercises", "inference_stride")
+    op.drop_column("exercises", "inference_mode")
@@ -0,0 +1,293 @@
+"""
+Benchmark offline de acurácia e vazão do pipeline de inferência sobre sequências gravadas.
+
+Cada sequência é um diretório com `labels.json` e os frames, em um destes formatos:
+  frames/*.jpg      JPEGs em ordem (passam por decode -> pose -> ROM -> analisador)
+  keypoints.jsonl   uma linha por frame: {"ts_ms": 0, "keypoints": [[x, y, vis], ...] | null}
+                    (pula decode e pose; o model_complexity não se aplica)
+
+labels.json:
+  {"reps": 10, "cadence": 0.33, "fps": 10, "analysis_kind": "KNEE_EXTENSION_V1"}
+  (cadence em reps/s e opcional; fps dá os timestamps dos JPEGs)
+
+Roda cada sequência x configuração do analisador x model_complexity num pool de
+processos e, por configuração, reporta erro de contagem de reps, erro de cadência,
+frames/s e tempo por etapa; "recommended" é a configuração mais rápida cujo erro
+médio de reps fica dentro de --max-rep-error.
+
+Uso:
+  python -m scripts.bench_accuracy --make-synthetic data/bench_sint --sequences 12
+  python -m scripts.bench_accuracy data/bench_sint --configs configs.json --complexities 0,1,2
+
+configs.json: [{"name": "padrao", "params": {}}, {"name": "low90", "params": {"low_deg": 90}}]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# --- garante imports do pacote app/ dentro de src/ ---
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+STAGES = ("read", "decode", "pose", "rom", "analyzer")
+DEFAULT_CONFIGS = [{"name": "padrao", "params": {}}]
+
+
+def load_sequence(seq_dir: Path) -> dict:
+    labels = json.loads((seq_dir / "labels.json").read_text(encoding="utf-8"))
+    if (seq_dir / "keypoints.jsonl").exists():
+        kind = "keypoints"
+    elif (seq_dir / "frames").is_dir():
+        kind = "jpeg"
+    else:
+        raise SystemExit(f"{seq_dir}: sem frames/ nem keypoints.jsonl")
+    return {"name": seq_dir.name, "path": str(seq_dir), "kind": kind, "labels": labels}
+
+
+def find_sequences(root: Path) -> list[dict]:
+    if (root / "labels.json").exists():
+        return [load_sequence(root)]
+    seqs = [load_sequence(d) for d in sorted(root.iterdir()) if (d / "labels.json").exists()]
+    if not seqs:
+        raise SystemExit(f"Nenhuma sequência (labels.json) em {root}")
+    return seqs
+
+
+def _iter_frames(seq: dict):
+    """(ts_ms, jpeg_bytes | None, keypoints | None), lendo do disco sob demanda."""
+    path = Path(seq["path"])
+    if seq["kind"] == "keypoints":
+        with open(path / "keypoints.jsonl", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield int(row["ts_ms"]), None, row.get("keypoints")
+        return
+    step_ms = 1000 / float(seq["labels"].get("fps", 10))
+    files = sorted(p for p in (path / "frames").iterdir() if p.suffix.lower() in (".jpg", ".jpeg"))
+    for i, p in enumerate(files):
+        yield int(i * step_ms), p.read_bytes(), None
+
+
+def run_job(seq: dict, config: dict, complexity: int | None, pose_backend: str | None) -> dict:
+    """Uma sequência com uma configuração; roda num processo do pool."""
+    from app.core.config import settings
+    from app.services.exercise_analysis.dispatcher import create_analyzer
+    from app.services.pose_logic import rom_from_keypoints
+
+    labels = seq["labels"]
+    analyzer = create_analyzer(labels.get("analysis_kind", "KNEE_EXTENSION_V1"))
+    runtime = None
+    if seq["kind"] == "jpeg":
+        from app.services.pose_runtime import PoseRuntime
+
+        if pose_backend:
+            settings.pose_backend = pose_backend
+        # o sintético anda no relógio da gravação, não no tempo real
+        settings.synthetic_pose_fps = float(labels.get("fps", 10))
+        runtime = PoseRuntime(model_complexity=complexity if complexity is not None else 1)
+
+    stage_s = dict.fromkeys(STAGES, 0.0)
+    frames = no_pose = 0
+    metrics = {"reps": 0, "cadence": None}
+    t_read = time.perf_counter()
+    try:
+        for ts_ms, jpeg, keypoints in _iter_frames(seq):
+            t0 = time.perf_counter()
+            stage_s["read"] += t0 - t_read
+            frames += 1
+            if runtime is not None:
+                bgr = runtime.decode_jpeg(jpeg)
+                t1 = time.perf_counter()
+                stage_s["decode"] += t1 - t0
+                keypoints = runtime.infer_keypoints(bgr) if bgr is not None else None
+                t0 = time.perf_counter()
+                stage_s["pose"] += t0 - t1
+            rom = rom_from_keypoints(keypoints) if keypoints else None
+            t1 = time.perf_counter()
+            stage_s["rom"] += t1 - t0
+            if rom is None:
+                no_pose += 1
+            else:
+                metrics = analyzer.run(rom, config["params"], ts_ms)
+            t_read = time.perf_counter()
+            stage_s["analyzer"] += t_read - t1
+    finally:
+        if runtime is not None:
+            runtime.close()
+
+    total_s = sum(stage_s.values()) - stage_s["read"]
+    cadence = metrics.get("cadence")
+    label_cadence = labels.get("cadence")
+    return {
+        "sequence": seq["name"],
+        "config": config["name"],
+        "complexity": complexity,
+        "frames": frames,
+        "no_pose": no_pose,
+        "reps": metrics["reps"],
+        "label_reps": labels["reps"],
+        "rep_error": metrics["reps"] - labels["reps"],
+        "cadence": cadence,
+        "cadence_error": (
+            abs(cadence - label_cadence)
+            if cadence is not None and label_cadence is not None
+            else None
+        ),
+        "process_s": total_s,
+        "stage_s": stage_s,
+    }
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _r(v: float | None, nd: int = 3) -> float | None:
+    return None if v is None else round(v, nd)
+
+
+def aggregate(results: list[dict], max_rep_error: float) -> dict:
+    groups: dict[tuple, list[dict]] = {}
+    for r in results:
+        groups.setdefault((r["config"], r["complexity"]), []).append(r)
+
+    rows = []
+    for (config, complexity), rs in groups.items():
+        frames = sum(r["frames"] for r in rs)
+        process_s = sum(r["process_s"] for r in rs)
+        cadence_errors = [r["cadence_error"] for r in rs if r["cadence_error"] is not None]
+        rows.append(
+            {
+                "config": config,
+                "complexity": complexity,
+                "sequences": len(rs),
+                "frames": frames,
+                "rep_mae": _r(_mean([abs(r["rep_error"]) for r in rs])),
+                "rep_bias": _r(_mean([r["rep_error"] for r in rs])),
+                "rep_exact_rate": _r(sum(r["rep_error"] == 0 for r in rs) / len(rs)),
+                "cadence_mae": _r(_mean(cadence_errors), 4),
+                "no_pose_rate": _r(sum(r["no_pose"] for r in rs) / frames if frames else None),
+                "frames_per_s": _r(frames / process_s if process_s else None, 1),
+                "ms_per_frame": {
+                    stage: _r(
+                        sum(r["stage_s"][stage] for r in rs) * 1000 / frames if frames else None
+                    )
+                    for stage in STAGES
+                },
+            }
+        )
+    rows.sort(key=lambda row: (row["rep_mae"], -(row["frames_per_s"] or 0)))
+
+    accurate = [row for row in rows if row["rep_mae"] <= max_rep_error]
+    recommended = max(accurate, key=lambda row: row["frames_per_s"] or 0, default=None)
+    return {"configurations": rows, "recommended": recommended}
+
+
+def make_synthetic(out: Path, n: int, seed: int) -> None:
+    """Gera sequências de keypoints com reps conhecidas (backend sintético) para testar o bench."""
+    from app.services.pose_backends import SyntheticPoseBackend
+
+    rng = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    rgb = None
+    for i in range(n):
+        fps = rng.choice((8, 10, 15))
+        period_s = rng.uniform(2.0, 4.5)
+        reps = rng.randint(4, 12)
+        backend = SyntheticPoseBackend(
+            fps=fps,
+            period_s=period_s,
+            noise=rng.uniform(0.0, 0.008),
+            dropout=rng.uniform(0.0, 0.05),
+            seed=seed + i,
+        )
+        seq_dir = out / f"sint_{i:03d}"
+        seq_dir.mkdir(exist_ok=True)
+        # uma rep completa termina em 60% do ciclo (pico da extensão)
+        n_frames = int((reps - 1 + 0.75) * period_s * fps)
+        with open(seq_dir / "keypoints.jsonl", "w", encoding="utf-8") as f:
+            for k in range(n_frames):
+                kps = backend.process(rgb)
+                f.write(json.dumps({"ts_ms": int(k * 1000 / fps), "keypoints": kps}) + "\n")
+        labels = {
+            "reps": reps,
+            "cadence": round(1 / period_s, 4),
+            "fps": fps,
+            "analysis_kind": "KNEE_EXTENSION_V1",
+        }
+        (seq_dir / "labels.json").write_text(json.dumps(labels), encoding="utf-8")
+    print(f"{n} sequências sintéticas em {out}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", nargs="?", help="diretório de sequências (ou uma sequência)")
+    parser.add_argument("--configs", help="JSON com [{name, params}] do analisador")
+    parser.add_argument("--complexities", default="1", help="model_complexity, ex.: 0,1,2")
+    parser.add_argument("--pose-backend", help="força POSE_BACKEND (mediapipe | synthetic)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-rep-error", type=float, default=0.5, help="rep_mae aceitável")
+    parser.add_argument("--per-sequence", action="store_true", help="inclui cada execução")
+    parser.add_argument("--make-synthetic", metavar="DIR", help="gera um dataset e sai")
+    parser.add_argument("--sequences", type=int, default=10, help="com --make-synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="arquivo JSON de saída (default: stdout)")
+    args = parser.parse_args()
+
+    if args.make_synthetic:
+        make_synthetic(Path(args.make_synthetic), args.sequences, args.seed)
+        return
+    if not args.dataset:
+        parser.error("informe o dataset (ou --make-synthetic DIR)")
+
+    sequences = find_sequences(Path(args.dataset))
+    configs = (
+        json.loads(Path(args.configs).read_text(encoding="utf-8"))
+        if args.configs
+        else DEFAULT_CONFIGS
+    )
+    complexities = [int(c) for c in args.complexities.split(",") if c.strip()]
+
+    jobs = []
+    for seq in sequences:
+        # keypoints gravados não passam pelo pose: uma execução por configuração
+        seq_complexities = complexities if seq["kind"] == "jpeg" else [None]
+        for config in configs:
+            for complexity in seq_complexities:
+                jobs.append((seq, config, complexity, args.pose_backend))
+
+    print(
+        f"{len(sequences)} sequências, {len(jobs)} execuções em {args.workers} processos...",
+        file=sys.stderr,
+    )
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(run_job, *zip(*jobs, strict=True)))
+
+    report = {
+        "dataset": str(args.dataset),
+        "sequences": len(sequences),
+        "wall_s": round(time.perf_counter() - t0, 2),
+        "max_rep_error": args.max_rep_error,
+        **aggregate(results, args.max_rep_error),
+    }
+    if args.per_sequence:
+        report["runs"] = results
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(payload, encoding="utf-8")
+        print(f"Resultado salvo em {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
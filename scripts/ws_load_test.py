@@ -0,0 +1,354 @@
+"""
+Teste de carga do WS de inferência: N sessões simultâneas enviando frames no fps alvo.
+
+Cria pelo REST um paciente/config/assignment/sessão por conexão (todos no mesmo
+exercício), abre N sockets e envia os JPEGs de --frames em ciclo. Cada frame
+enviado gera exatamente uma mensagem "metrics" do servidor, então a latência
+frame->métrica é medida casando as respostas com os envios, em ordem.
+
+Saída em JSON (vazão, p50/p95/p99 de latência, descartes por motivo, recusas e
+erros), para comparar builds:
+
+  python -m scripts.ws_load_test --sessions 8 --fps 10 --duration 30 --out carga_8x10.json
+
+Frame sem resposta em mais de --max-inflight envios não é enviado (como a
+câmera faria): conta em "skipped". As mensagens "control" (QoS) são aplicadas ao
+fps, a menos que --ignore-qos.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import urllib.parse
+from collections import Counter, deque
+from pathlib import Path
+
+import httpx
+import websockets
+
+BASE_URL = os.getenv("BASE_URL", "http://127.0.0.1:8000").rstrip("/")
+WS_BASE = os.getenv("WS_BASE", "ws://127.0.0.1:8000").rstrip("/")
+PRO_EMAIL = os.getenv("TEST_PRO_EMAIL", "admin@admin.com")
+PRO_PASSWORD = os.getenv("TEST_PRO_PASSWORD", "123456")
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_FRAMES = ROOT / "tests" / "assets"
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank (mesmo critério do monitor do event loop)."""
+    if not sorted_values:
+        return None
+    i = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[i]
+
+
+def load_frames(path: Path) -> list[bytes]:
+    files = sorted(path.glob("*.jp*g")) if path.is_dir() else [path]
+    frames = [f.read_bytes() for f in files]
+    if not frames:
+        raise SystemExit(f"Nenhum JPEG em {path}")
+    return frames
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+class SessionRun:
+    """Uma conexão do teste: envia no ritmo do fps e mede as respostas."""
+
+    def __init__(self, session_id: str, fps: float, max_inflight: int, follow_qos: bool) -> None:
+        self.session_id = session_id
+        self.fps = fps
+        self.max_inflight = max_inflight
+        self.follow_qos = follow_qos
+        self.status = "pending"  # ok | busy | error
+        self.detail: str | None = None
+        self.connect_ms: float | None = None
+        self.sent = 0
+        self.skipped = 0
+        self.answered = 0
+        self.ok = 0
+        self.not_ok: Counter = Counter()
+        self.controls = 0
+        self.latencies_ms: list[float] = []
+        self._inflight: deque[float] = deque()
+
+    async def run(self, url: str, frames: list[bytes], duration_s: float) -> None:
+        t0 = time.perf_counter()
+        try:
+            async with websockets.connect(url, max_size=None, open_timeout=20) as ws:
+                first = json.loads(await ws.recv())
+                self.connect_ms = (time.perf_counter() - t0) * 1000
+                if first.get("type") != "ready":
+                    self.status = "busy" if first.get("type") == "busy" else "error"
+                    self.detail = first.get("detail") or first.get("reason")
+                    return
+                self.status = "ok"
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    await self._send(ws, frames, duration_s)
+                    # espera as respostas que faltam (até 2 s)
+                    deadline = time.perf_counter() + 2
+                    while self._inflight and time.perf_counter() < deadline:
+                        await asyncio.sleep(0.01)
+                finally:
+                    receiver.cancel()
+                    try:
+                        await receiver
+                    except asyncio.CancelledError:
+                        pass
+        except Exception as e:
+            if self.status in ("pending", "ok"):
+                self.status = "error"
+                self.detail = f"{type(e).__name__}: {e}"
+
+    async def _send(self, ws, frames: list[bytes], duration_s: float) -> None:
+        end = time.perf_counter() + duration_s
+        next_at = time.perf_counter()
+        i = 0
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(self._inflight) >= self.max_inflight:
+                self.skipped += 1
+            else:
+                self._inflight.append(time.perf_counter())
+                await ws.send(frames[i % len(frames)])
+                self.sent += 1
+                i += 1
+            next_at += 1 / self.fps
+
+    async def _receive(self, ws) -> None:
+        async for raw in ws:
+            now = time.perf_counter()
+            msg = json.loads(raw)
+            kind = msg.get("type")
+            if kind == "control":
+                self.controls += 1
+                if self.follow_qos and msg.get("fps"):
+                    self.fps = float(msg["fps"])
+                continue
+            if kind == "error":
+                self.status = "error"
+                self.detail = msg.get("detail")
+                continue
+            if kind != "metrics" or not self._inflight:
+                continue
+            self.latencies_ms.append((now - self._inflight.popleft()) * 1000)
+            self.answered += 1
+            if msg.get("ok"):
+                self.ok += 1
+            else:
+                self.not_ok[msg.get("reason") or msg.get("motivo") or "unknown"] += 1
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies_ms)
+        return {
+            "session_id": self.session_id,
+            "status": self.status,
+            "detail": self.detail,
+            "connect_ms": round(self.connect_ms, 1) if self.connect_ms is not None else None,
+            "sent": self.sent,
+            "answered": self.answered,
+            "skipped": self.skipped,
+            "latency_ms_p50": _round(percentile(lat, 0.5)),
+            "latency_ms_p95": _round(percentile(lat, 0.95)),
+            "final_fps": self.fps,
+        }
+
+
+def _round(v: float | None, nd: int = 2) -> float | None:
+    return None if v is None else round(v, nd)
+
+
+async def _post(client: httpx.AsyncClient, path: str, payload: dict) -> dict:
+    r = await client.post(path, json=payload)
+    if r.status_code not in (200, 201):
+        raise SystemExit(f"POST {path} falhou: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def create_session(client: httpx.AsyncClient, exercise_id: int, n: int) -> str:
+    unique = f"{time.time_ns()}_{n}"
+    patient = await _post(
+        client,
+        "/v1/patients",
+        {"name": f"Carga {n}", "email": f"carga_{unique}@teste.com", "password": "teste1234"},
+    )
+    config = await _post(
+        client,
+        "/v1/assignments/configs",
+        {"exercise_id": exercise_id, "patient_user_id": patient["id"], "params": {}},
+    )
+    assignment = await _post(
+        client,
+        "/v1/assignments",
+        {
+            "patient_user_id": patient["id"],
+            "exercise_id": exercise_id,
+            "config_id": config["id"],
+            "schedule": "DAILY",
+            "active": True,
+        },
+    )
+    session = await _post(
+        client,
+        f"/v1/patients/{patient['id']}/sessions",
+        {"exercise_id": exercise_id, "assignment_id": assignment["id"], "config_snapshot": {}},
+    )
+    return session["id"]
+
+
+async def setup(n_sessions: int, analysis_kind: str) -> tuple[str, list[str]]:
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30) as client:
+        r = await client.post(
+            "/v1/auth/login",
+            data={"username": PRO_EMAIL, "password": PRO_PASSWORD},
+        )
+        if r.status_code != 200:
+            raise SystemExit(f"Login falhou: {r.status_code} {r.text}")
+        token = r.json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        exercise = await _post(
+            client,
+            "/v1/exercises",
+            {
+                "title": f"Carga WS {time.time_ns()}",
+                "description": "Criado pelo ws_load_test",
+                "body_focus": "LOWER",
+                "analysis_kind": analysis_kind,
+            },
+        )
+        session_ids = await asyncio.gather(
+            *(create_session(client, exercise["id"], i) for i in range(n_sessions))
+        )
+    return token, list(session_ids)
+
+
+def build_report(args, runs: list[SessionRun], wall_s: float) -> dict:
+    lat = sorted(v for r in runs for v in r.latencies_ms)
+    sent = sum(r.sent for r in runs)
+    answered = sum(r.answered for r in runs)
+    ok = sum(r.ok for r in runs)
+    skipped = sum(r.skipped for r in runs)
+    not_ok: Counter = Counter()
+    for r in runs:
+        not_ok.update(r.not_ok)
+    statuses = Counter(r.status for r in runs)
+    offered = sent + skipped
+    return {
+        "revision": git_revision(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "sessions": args.sessions,
+            "fps": args.fps,
+            "duration_s": args.duration,
+            "ramp_up_s": args.ramp_up,
+            "max_inflight": args.max_inflight,
+            "follow_qos": not args.ignore_qos,
+            "analysis_kind": args.analysis_kind,
+        },
+        "sessions": {
+            "connected": statuses.get("ok", 0),
+            "busy": statuses.get("busy", 0),
+            "errors": statuses.get("error", 0),
+            "error_details": sorted({r.detail for r in runs if r.status == "error" and r.detail}),
+        },
+        "frames": {
+            "offered": offered,
+            "sent": sent,
+            "answered": answered,
+            "ok": ok,
+            "not_ok": dict(not_ok),
+            "skipped": skipped,
+            "unanswered": sent - answered,
+            "drop_rate": round(1 - ok / offered, 4) if offered else None,
+        },
+        "throughput": {
+            "wall_s": round(wall_s, 2),
+            "answered_per_s": round(answered / wall_s, 2) if wall_s else None,
+            "ok_per_s": round(ok / wall_s, 2) if wall_s else None,
+        },
+        "latency_ms": {
+            "p50": _round(percentile(lat, 0.5)),
+            "p95": _round(percentile(lat, 0.95)),
+            "p99": _round(percentile(lat, 0.99)),
+            "max": _round(lat[-1] if lat else None),
+            "mean": _round(sum(lat) / len(lat) if lat else None),
+        },
+        "qos_controls": sum(r.controls for r in runs),
+        "per_session": [r.summary() for r in runs] if args.per_session else None,
+    }
+
+
+async def run(args) -> dict:
+    frames = load_frames(Path(args.frames))
+    print(f"Criando {args.sessions} sessões...", file=sys.stderr)
+    token, session_ids = await setup(args.sessions, args.analysis_kind)
+    token_q = urllib.parse.quote(token, safe="")
+
+    runs = [
+        SessionRun(sid, args.fps, args.max_inflight, follow_qos=not args.ignore_qos)
+        for sid in session_ids
+    ]
+
+    async def start(i: int, r: SessionRun) -> None:
+        # espalha as conexões ao longo do ramp-up
+        if args.ramp_up > 0:
+            await asyncio.sleep(args.ramp_up * i / len(runs))
+        url = f"{WS_BASE}/v1/infer/ws/session/{r.session_id}?token={token_q}"
+        await r.run(url, frames, args.duration)
+
+    print(
+        f"Enviando {args.fps} fps por {args.duration}s em {len(runs)} conexões...",
+        file=sys.stderr,
+    )
+    t0 = time.perf_counter()
+    await asyncio.gather(*(start(i, r) for i, r in enumerate(runs)))
+    return build_report(args, runs, time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="conexões simultâneas")
+    parser.add_argument("--fps", type=float, default=10.0, help="fps alvo por conexão")
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos enviando")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="segundos para abrir todas")
+    parser.add_argument("--frames", default=str(DEFAULT_FRAMES), help="JPEG ou diretório")
+    parser.add_argument("--max-inflight", type=int, default=3, help="frames sem resposta")
+    parser.add_argument("--ignore-qos", action="store_true", help="não aplica 'control'")
+    parser.add_argument("--analysis-kind", default="KNEE_EXTENSION_V1")
+    parser.add_argument("--per-session", action="store_true", help="inclui cada conexão")
+    parser.add_argument("--out", help="arquivo JSON de saída (default: stdout)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(payload, encoding="utf-8")
+        print(f"Resultado salvo em {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
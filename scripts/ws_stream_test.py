@@ -123,6 +123,17 @@ def get_summary(token: str, session_id: str) -> tuple[int, str]:
     return r.status_code, r.text
 
 
+def recv_metrics(ws, qos: dict) -> str:
+    """Lê até a próxima mensagem que não seja "control", aplicando o ajuste pedido."""
+    while True:
+        msg = ws.recv()
+        data = json.loads(msg)
+        if data.get("type") != "control":
+            return msg
+        qos.update(data)
+        print("WS control:", msg)
+
+
 def main():
     _assert(os.path.exists(FRAME_PATH), f"Frame não encontrado: {FRAME_PATH}")
     with open(FRAME_PATH, "rb") as f:
@@ -147,15 +158,18 @@ def main():
     ready = ws.recv()
     print("WS ready:", ready)
 
+    # o servidor pode pedir outro fps ("control"); o frame é fixo, então só o fps se aplica
+    qos = {"fps": 1 / SLEEP_BETWEEN}
+
     print(f"4) Enviando {N_FRAMES} frames...")
     # last_metrics = None
     for i in range(N_FRAMES):
         ws.send_binary(frame_bytes)
-        msg = ws.recv()
+        msg = recv_metrics(ws, qos)
         # last_metrics = msg
         if i < 3 or i == N_FRAMES - 1:
             print("WS msg:", msg)
-        time.sleep(SLEEP_BETWEEN)
+        time.sleep(1 / qos["fps"])
 
     print("5) Fechando WS...")
     ws.close()
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session as DBSession
 
 from app.api.deps import get_current_user, require_role
+from app.db.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.assignment import (
     AssignmentCreate,
+    AssignmentExpandedOut,
     AssignmentOut,
     AssignmentUpdate,
     ConfigParamsUpdate,
@@ -21,6 +23,7 @@ from app.services.assignments_service import (
     get_config,
     list_assignments,
     list_configs,
+    parse_expand,
     update_assignment,
 )
 from app.services.exercise_config_service import BadRequestError as CfgBadRequest
@@ -94,13 +97,28 @@ def create_assignment_endpoint(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("", response_model=list[AssignmentOut])
+@router.get("", response_model=list[AssignmentExpandedOut])
 def list_assignments_endpoint(
+    response: Response,
     db: DBSession = Depends(get_db),
     user: User = Depends(get_current_user),
     patient_user_id: str | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    expand: str | None = None,
 ):
-    return list_assignments(db, user, patient_user_id)
+    """?expand=exercise,config,last_session devolve tudo que a home do app precisa."""
+    try:
+        page = list_assignments(
+            db, user, patient_user_id, cursor=cursor, limit=limit, expand=parse_expand(expand)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BadRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{assignment_id}", response_model=AssignmentOut)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import require_debug_admin
+from app.core.config import settings
+from app.core.logging import log_event
+from app.models.user import User
+from app.schemas.debug import ProfileRequest
+from app.services.capacity import capacity
+from app.services.live_sessions import live_sessions
+from app.services.profiler import (
+    ProfilerBusyError,
+    code_matcher,
+    run_profile,
+    session_matcher,
+)
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+logger = logging.getLogger("app.debug")
+
+
+def _route_codes(request: Request, path: str, method: str | None) -> set:
+    codes = set()
+    for route in request.app.routes:
+        if getattr(route, "path", None) != path or not hasattr(route, "endpoint"):
+            continue
+        methods = getattr(route, "methods", None)
+        if method and methods and method.upper() not in methods:
+            continue
+        codes.add(inspect.unwrap(route.endpoint).__code__)
+    return codes
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile(
+    body: ProfileRequest,
+    request: Request,
+    user: User = Depends(require_debug_admin),
+):
+    """
+    Perfil por amostragem de uma sessão de inferência ou de uma rota, por `seconds`,
+    neste worker (sem reiniciar). Responde as pilhas no formato "folded"
+    (flamegraph.pl, speedscope, inferno).
+    """
+    if (body.session_id is None) == (body.route is None):
+        raise HTTPException(status_code=422, detail="Informe session_id ou route (só um).")
+
+    if body.session_id is not None:
+        # a sessão precisa estar rodando neste worker (com vários workers, repita até cair nele)
+        if not capacity.has_session(body.session_id):
+            raise HTTPException(status_code=404, detail="Sessão não está ativa neste worker.")
+        target = f"session:{body.session_id}"
+        matcher = session_matcher(
+            asyncio.get_running_loop(), threading.get_ident(), body.session_id
+        )
+    else:
+        codes = _route_codes(request, body.route, body.method)
+        if not codes:
+            raise HTTPException(status_code=404, detail="Rota não encontrada.")
+        target = f"route:{body.method.upper() + ' ' if body.method else ''}{body.route}"
+        matcher = code_matcher(codes)
+
+    seconds = min(body.seconds, settings.profiling_max_seconds)
+    interval_s = body.interval_ms / 1000 if body.interval_ms else None
+    try:
+        profiler = await run_profile(matcher, seconds, interval_s)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    stats = profiler.stats()
+    log_event(logger, logging.INFO, "profile_finished", target=target, user=user.email, **stats)
+    filename = f"profile-{int(time.time())}.folded"
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Target": target,
+            "X-Profile-Samples": str(stats["samples"]),
+            "X-Profile-Ticks": str(stats["ticks"]),
+            "X-Profile-Overhead-Ms": str(stats["overhead_ms"]),
+        },
+    )
+
+
+@router.get("/live-sessions")
+async def list_live_sessions(_=Depends(require_debug_admin)):
+    """
+    Sessões de inferência rodando agora em todos os workers (as dos outros vêm do
+    último snapshot publicado no event broker), da maior latência p95 para a menor.
+    """
+    return live_sessions.snapshot()
+
+
+@router.delete("/live-sessions/{session_id}", status_code=status.HTTP_202_ACCEPTED)
+async def kill_live_session(
+    session_id: str,
+    reason: str = "",
+    user: User = Depends(require_debug_admin),
+):
+    """Fecha o WS de uma sessão (em qualquer worker); ela é finalizada como numa desconexão."""
+    known = next(
+        (s for s in live_sessions.snapshot()["sessions"] if s["session_id"] == session_id), None
+    )
+    if known is None:
+        raise HTTPException(status_code=404, detail="Sessão não está ativa.")
+    local = live_sessions.kill(session_id, reason)
+    log_event(
+        logger,
+        logging.WARNING,
+        "live_session_kill_requested",
+        session_id=session_id,
+        worker=known["worker"],
+        user=user.email,
+    )
+    return {"session_id": session_id, "worker": known["worker"], "local": local}
@@ -1,14 +1,16 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
+from app.core.config import settings
 from app.core.security import ALGORITHM, SECRET_KEY, decode_access_token
 from app.db.session import get_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/v1/auth/login", auto_error=False)
 
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: DBSession = Depends(get_db)) -> User:
@@ -36,6 +38,16 @@ def require_role(role: str):
     return _inner
 
 
+def require_debug_admin(user: User = Depends(get_current_user)) -> User:
+    """Rotas de depuração: só com DEBUG_API_ENABLED e para PROs em DEBUG_ADMINS."""
+    if not settings.debug_api_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    admins = {e.strip().lower() for e in settings.debug_admins.split(",") if e.strip()}
+    if user.role != "PRO" or (admins and user.email.lower() not in admins):
+        raise HTTPException(status_code=403, detail="Sem permissão")
+    return user
+
+
 def get_current_user_from_token(db: DBSession, token: str) -> User:
     try:
         payload = decode_access_token(token)
@@ -51,3 +63,18 @@ def get_current_user_from_token(db: DBSession, token: str) -> User:
         raise HTTPException(status_code=401, detail="Usuário não encontrado")
 
     return user
+
+
+def get_current_user_header_or_query(
+    bearer: str | None = Depends(oauth2_scheme_optional),
+    token: str | None = Query(None),
+    db: DBSession = Depends(get_db),
+) -> User:
+    """
+    Para EventSource (SSE), que não consegue mandar headers:
+    aceita Authorization: Bearer <token> ou ?token=<token>.
+    """
+    token = bearer or token
+    if not token:
+        raise HTTPException(status_code=401, detail="Token ausente")
+    return get_current_user_from_token(db, token)
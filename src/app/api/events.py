@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session as DBSession
+
+from app.api.deps import get_current_user_header_or_query
+from app.db.session import get_db
+from app.models.session import Session as SessionModel
+from app.models.session import SessionSummary as SessionSummaryModel
+from app.models.user import User
+from app.services.event_bus import (
+    Subscription,
+    event_bus,
+    patient_topic,
+    session_status_event,
+    session_summary_event,
+    session_topic,
+)
+from app.services.sessions_service import (
+    SessionAccessError,
+    SessionNotFoundError,
+    ensure_session_access,
+    get_session,
+)
+
+router = APIRouter(tags=["events"])
+
+# comentário periódico mantém a conexão viva atrás de proxies
+HEARTBEAT_S = 15.0
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: dict) -> bytes:
+    data = json.dumps(event, ensure_ascii=False)
+    return f"event: {event['type']}\ndata: {data}\n\n".encode()
+
+
+def _is_finished(event: dict) -> bool:
+    return event["type"] == "status" and event["status"] == "FINISHED"
+
+
+async def _stream(
+    sub: Subscription, initial: list[dict], stop_on_finished: bool
+) -> AsyncIterator[bytes]:
+    try:
+        for event in initial:
+            yield _sse(event)
+        if stop_on_finished and any(_is_finished(e) for e in initial):
+            return
+
+        while True:
+            event = await sub.get(timeout=HEARTBEAT_S)
+            if event is None:
+                yield b": ping\n\n"
+                continue
+            yield _sse(event)
+            if stop_on_finished and _is_finished(event):
+                return
+    finally:
+        sub.close()
+
+
+@router.get("/sessions/{session_id}/events")
+def session_events(
+    session_id: str,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user_header_or_query),
+):
+    """
+    SSE com as mudanças de status e o summary de uma sessão.
+    Começa com o estado atual e encerra quando a sessão chega em FINISHED.
+    """
+    try:
+        sess = get_session(db, session_id)
+        ensure_session_access(user, sess)
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SessionAccessError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    # assina antes de ler o estado atual para não perder eventos no meio
+    sub = event_bus.subscribe(session_topic(session_id))
+    try:
+        db.refresh(sess)
+        summary = db.execute(
+            select(SessionSummaryModel).where(SessionSummaryModel.session_id == session_id)
+        ).scalar_one_or_none()
+    except Exception:
+        sub.close()
+        raise
+
+    initial = []
+    if summary:
+        initial.append(session_summary_event(sess.patient_user_id, summary))
+    initial.append(session_status_event(sess))
+
+    return StreamingResponse(
+        _stream(sub, initial, stop_on_finished=True),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/patients/{patient_id}/events")
+def patient_events(
+    patient_id: str,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user_header_or_query),
+):
+    """SSE com os eventos de todas as sessões do paciente. Começa pelas sessões em andamento."""
+    if user.role == "PATIENT" and user.id != patient_id:
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    sub = event_bus.subscribe(patient_topic(patient_id))
+    try:
+        running = (
+            db.execute(
+                select(SessionModel).where(
+                    SessionModel.patient_user_id == patient_id,
+                    SessionModel.status == "RUNNING",
+                )
+            )
+            .scalars()
+            .all()
+        )
+    except Exception:
+        sub.close()
+        raise
+
+    return StreamingResponse(
+        _stream(sub, [session_status_event(s) for s in running], stop_on_finished=False),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
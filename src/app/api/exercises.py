@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
 from app.api.deps import get_current_user, require_role
+from app.db.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError
 from app.db.session import get_db
 from app.models.exercise import Exercise
 from app.models.user import User
 from app.schemas.exercise import ExerciseCreate, ExerciseOut, ExerciseUpdate
+from app.services.exercise_catalog import catalog_cache, etag_matches
 
 router = APIRouter(prefix="/exercises", tags=["exercises"])
 
+# o cliente sempre revalida; com ETag igual a resposta é um 304 sem corpo
+CACHE_CONTROL = "no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
 
 @router.post("", response_model=ExerciseOut, status_code=status.HTTP_201_CREATED)
 def create_exercise(
@@ -24,28 +36,56 @@ def create_exercise(
         description=payload.description or "",
         body_focus=payload.body_focus,
         analysis_kind=payload.analysis_kind,
+        inference_mode=payload.inference_mode,
+        inference_stride=payload.inference_stride,
     )
     db.add(ex)
     db.commit()
     db.refresh(ex)
+    catalog_cache.invalidate()
     return ex
 
 
 @router.get("", response_model=list[ExerciseOut])
 def list_exercises(
+    response: Response,
     db: DBSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 50,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    if_none_match: str | None = Header(None),
 ):
-    return db.execute(select(Exercise).offset(skip).limit(limit)).scalars().all()
+    # servido do catálogo em memória: sem query no banco enquanto o cache vale
+    try:
+        page, etag = catalog_cache.list_page(db, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{exercise_id}", response_model=ExerciseOut)
-def get_exercise(exercise_id: int, db: DBSession = Depends(get_db)):
-    ex = db.execute(select(Exercise).where(Exercise.id == exercise_id)).scalar_one_or_none()
-    if not ex:
+def get_exercise(
+    exercise_id: int,
+    response: Response,
+    db: DBSession = Depends(get_db),
+    if_none_match: str | None = Header(None),
+):
+    cached = catalog_cache.get(db, exercise_id)
+    if not cached:
         raise HTTPException(status_code=404, detail="Exercício não encontrado.")
-    return ex
+    item, etag = cached
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return item
 
 
 @router.put("/{exercise_id}", response_model=ExerciseOut)
@@ -67,10 +107,15 @@ def update_exercise(
         ex.body_focus = payload.body_focus
     if payload.analysis_kind is not None:
         ex.analysis_kind = payload.analysis_kind
+    if payload.inference_mode is not None:
+        ex.inference_mode = payload.inference_mode
+    if payload.inference_stride is not None:
+        ex.inference_stride = payload.inference_stride
 
     db.add(ex)
     db.commit()
     db.refresh(ex)
+    catalog_cache.invalidate()
     return ex
 
 
@@ -86,4 +131,5 @@ def delete_exercise(
 
     db.delete(ex)
     db.commit()
+    catalog_cache.invalidate()
     return None
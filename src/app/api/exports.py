@@ -0,0 +1,45 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import require_role
+from app.db.session import engine
+from app.services.export_service import BadRequestError, export_sessions_stream
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@router.get("/sessions")
+def export_sessions(
+    format: str = "ndjson",
+    gzip: bool = False,
+    patient_user_id: str | None = None,
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    _=Depends(require_role("PRO")),
+):
+    """
+    Exporta sessões + summaries em streaming (NDJSON ou CSV, opcionalmente .gz).
+    Memória constante: linhas vêm do cursor server-side e saem em chunks.
+    """
+    try:
+        chunks = export_sessions_stream(
+            engine,
+            format,
+            gzip=gzip,
+            patient_user_id=patient_user_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except BadRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"sessions.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
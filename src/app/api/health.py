@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.pool import pool_status
+from app.db.session import engine, get_db
+from app.services.capacity import capacity
+from app.services.loop_monitor import loop_monitor
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -15,4 +18,20 @@ def health():
 @router.get("/db")
 def health_db(db: Session = Depends(get_db)):
     db.execute(text("SELECT 1"))
-    return {"status": "ok", "db": "ok"}
+    return {"status": "ok", "db": "ok", "pool": pool_status(engine.pool)}
+
+
+@router.get("/capacity")
+def health_capacity(response: Response):
+    """Ocupação de inferência deste worker. 503 quando não aceita sessões novas (para o LB)."""
+    occupancy = capacity.occupancy()
+    if not occupancy["accepting"]:
+        response.status_code = 503
+        response.headers["Retry-After"] = str(occupancy["retry_after_s"])
+    return occupancy
+
+
+@router.get("/loop")
+def health_loop():
+    """Atraso recente do event loop deste worker (percentis) e travamentos detectados."""
+    return loop_monitor.snapshot()
@@ -1,23 +1,49 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
+from app.core.config import settings
+from app.core.logging import session_id_ctx
 from app.db.session import SessionLocal  # usa o mesmo SessionLocal do seu db/session.py
 from app.models.assignment import Assignment, ExerciseConfig
 from app.models.exercise import Exercise
 from app.models.session import Session as SessionModel
-from app.models.session import SessionSummary as SessionSummaryModel
 from app.models.user import User
+from app.services.capacity import CapacityExceededError, SessionLease, capacity
+from app.services.decimation import InferenceDecimator
+from app.services.event_bus import (
+    event_bus,
+    live_topic,
+    publish_session_status,
+    session_topic,
+)
 from app.services.exercise_analysis.dispatcher import create_analyzer
+from app.services.infer_metrics import (
+    StageTimer,
+    frames_dropped_total,
+    frames_total,
+    inference_skipped_total,
+)
+from app.services.live_sessions import LiveSession, live_sessions
+from app.services.loop_monitor import tag_task
+from app.services.motion_gate import MotionGate
 from app.services.pose_logic import rom_from_keypoints
 from app.services.pose_runtime import PoseRuntime
+from app.services.qos import QosController
+from app.services.sessions_service import save_final_summary
 
 router = APIRouter(prefix="/infer", tags=["infer"])
 
+# poucos frames por observador: atrasado, ele pula para as métricas mais recentes
+OBSERVER_QUEUE_SIZE = 8
+OBSERVER_HEARTBEAT_S = 15.0
+
 
 def _get_token_from_ws(websocket: WebSocket) -> str | None:
     """
@@ -45,24 +71,25 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
     Persistência:
       - on_connect: valida sessão e marca RUNNING (start automático)
       - on_disconnect: grava SessionSummary final e marca FINISHED
+
+    Admissão: sem capacidade no worker, responde {"type": "busy", "retry_after_s"}
+    e fecha com 1013, sem mexer no status da sessão (o cliente pode tentar de novo).
     """
+    session_id_ctx.set(session_id)
+    tag_task(session_id=session_id)
     await websocket.accept()
 
     last_metrics = {"reps": 0, "rom": 0.0, "cadence": None, "alertas": []}
     had_valid_metrics = False
 
-    # 1) runtime vision opcional
-    try:
-        runtime = PoseRuntime()
-    except Exception as e:
-        await websocket.send_json({"type": "error", "detail": f"Vision indisponível: {e}"})
-        await websocket.close(code=1011)
-        return
-
-    # 2) abre sessão DB (sync) e valida sessão + permissão
+    # 1) abre sessão DB (sync) e valida sessão + permissão
     db: DBSession = SessionLocal()
     user: User | None = None
     sess: SessionModel | None = None
+    lease: SessionLease | None = None
+    runtime: PoseRuntime | None = None
+    live: LiveSession | None = None
+    keep_status = False  # recusado antes de começar: não finaliza a sessão
 
     try:
         # ---- autenticação (recomendado) ----
@@ -129,6 +156,28 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
         analysis_kind = exercise.analysis_kind
         analysis_params = cfg.params or {}
 
+        # 2) admissão antes de alocar o runtime: quem já está rodando mantém a qualidade
+        try:
+            lease = await capacity.acquire(session_id)
+        except CapacityExceededError as e:
+            keep_status = True
+            await websocket.send_json(
+                {"type": "busy", "detail": str(e), "retry_after_s": e.retry_after_s}
+            )
+            await websocket.close(code=1013)
+            return
+
+        qos = QosController()
+
+        # runtime vision opcional
+        try:
+            runtime = PoseRuntime(model_complexity=qos.params["model_complexity"])
+        except Exception as e:
+            keep_status = True
+            await websocket.send_json({"type": "error", "detail": f"Vision indisponível: {e}"})
+            await websocket.close(code=1011)
+            return
+
         # 3) start automático
         if sess.status == "CREATED":
             sess.status = "RUNNING"
@@ -136,10 +185,14 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
             db.add(sess)
             db.commit()
             db.refresh(sess)
+            publish_session_status(sess)
 
         await websocket.send_json(
             {"type": "ready", "session_id": session_id, "status": sess.status}
         )
+        if settings.infer_qos_enabled:
+            # perfil inicial; depois só chega "control" quando o nível muda
+            await websocket.send_json(qos.control_message())
 
         try:
             analyzer = create_analyzer(analysis_kind)
@@ -148,31 +201,91 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
             await websocket.close(code=1008)
             return
 
+        # visível em GET /v1/debug/live-sessions até o finally
+        live = live_sessions.register(
+            LiveSession(session_id, sess.patient_user_id, user.id, analysis_kind)
+        )
+
+        low_deg = float(analysis_params.get("low_deg", 95))
+        high_deg = float(analysis_params.get("high_deg", 170))
+
+        gate = MotionGate(settings.motion_gate_threshold, settings.motion_gate_max_skip)
+        last_keypoints: list[list[float]] | None = None
+        decimator = InferenceDecimator(
+            exercise.inference_mode, exercise.inference_stride, thresholds=(low_deg, high_deg)
+        )
+
         # 4) loop de frames
+        timer = StageTimer()
         while True:
+            timer.reset()
             msg = await websocket.receive()
+            if msg["type"] == "websocket.disconnect":
+                # receive() não levanta no close: sem isso o close cairia como not_binary
+                raise WebSocketDisconnect(msg.get("code", 1000))
+            waited_s = timer.lap("receive")
+            ts_ms = int(time.time() * 1000)
             frame: bytes | None = msg.get("bytes")
 
             if frame is None:
+                frames_dropped_total.inc(reason="not_binary")
+                live.drop("not_binary")
                 await websocket.send_json(
                     {"type": "error", "detail": "Envie frames como binário (JPEG bytes)."}
                 )
                 continue
 
-            bgr = runtime.decode_jpeg(frame)
-            if bgr is None:
-                await websocket.send_json(
-                    {
-                        "type": "metrics",
-                        "session_id": session_id,
-                        "ok": False,
-                        "reason": "decode_failed",
-                    }
-                )
-                continue
-
-            keypoints = runtime.infer_keypoints(bgr)
-            if not keypoints:
+            frames_total.inc()
+            live.frame_in(len(frame), waited_s)
+            t0 = time.perf_counter()
+            keypoints = None
+            # decimação: entre keyframes o ROM vem extrapolado e nem decodifica o JPEG
+            rom = decimator.next_rom(ts_ms)
+            estimated = rom is not None
+            if estimated:
+                inference_skipped_total.inc(reason="decimation")
+            else:
+                bgr = runtime.decode_jpeg(frame)
+                timer.lap("decode")
+                if bgr is None:
+                    frames_dropped_total.inc(reason="decode_failed")
+                    live.drop("decode_failed")
+                    await websocket.send_json(
+                        {
+                            "type": "metrics",
+                            "session_id": session_id,
+                            "ok": False,
+                            "reason": "decode_failed",
+                        }
+                    )
+                    continue
+                live.decoded(bgr.nbytes)
+
+                infer = gate.should_infer(bgr)
+                timer.lap("gate")
+                if infer:
+                    t_infer = time.perf_counter()
+                    keypoints = runtime.infer_keypoints(bgr, timer)
+                    gate.record_inference(time.perf_counter() - t_infer)
+                    last_keypoints = keypoints
+                else:
+                    # paciente parado: reaproveita os keypoints do último frame inferido
+                    inference_skipped_total.inc(reason="motion_gate")
+                    keypoints = last_keypoints
+                rom = rom_from_keypoints(keypoints) if keypoints else None
+                timer.lap("rom")
+                decimator.record_keyframe(ts_ms, rom)
+            elapsed_s = time.perf_counter() - t0
+            lease.record_frame(elapsed_s)
+            live.processed(elapsed_s)
+            if settings.infer_qos_enabled:
+                control = qos.observe(elapsed_s, waited_s, capacity.utilization())
+                if control:
+                    runtime.set_model_complexity(control["model_complexity"])
+                    await websocket.send_json(control)
+            if not estimated and not keypoints:
+                frames_dropped_total.inc(reason="no_pose")
+                live.drop("no_pose")
                 await websocket.send_json(
                     {
                         "type": "metrics",
@@ -183,8 +296,9 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
                 )
                 continue
 
-            rom = rom_from_keypoints(keypoints)
             if rom is None:
+                frames_dropped_total.inc(reason="low_visibility")
+                live.drop("low_visibility")
                 await websocket.send_json(
                     {
                         "type": "metrics",
@@ -195,10 +309,10 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
                 )
                 continue
 
-            metrics = analyzer.run(rom, analysis_params)
-
-            low_deg = float(analysis_params.get("low_deg", 95))
-            high_deg = float(analysis_params.get("high_deg", 170))
+            timer.reset()
+            # timestamp real do frame, mesmo com keypoints reaproveitados ou ROM estimado
+            metrics = analyzer.run(rom, analysis_params, ts_ms)
+            timer.lap("analyzer")
 
             last_metrics = {
                 "reps": metrics["reps"],
@@ -210,59 +324,61 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
             }
             had_valid_metrics = True
 
-            await websocket.send_json(
-                {
-                    "type": "metrics",
-                    "session_id": session_id,
-                    "ok": last_metrics["ok"],
-                    "repeticoes": last_metrics["reps"],
-                    "angulo_joelho": last_metrics["rom"],
-                    "cadencia": last_metrics["cadence"],
-                    "fase": last_metrics.get("fase"),
-                    "alertas": last_metrics["alertas"],
-                    "limites": {"min": low_deg, "max": high_deg},
-                }
-            )
+            payload = {
+                "type": "metrics",
+                "session_id": session_id,
+                "ok": last_metrics["ok"],
+                "repeticoes": last_metrics["reps"],
+                "angulo_joelho": last_metrics["rom"],
+                "cadencia": last_metrics["cadence"],
+                "fase": last_metrics.get("fase"),
+                "alertas": last_metrics["alertas"],
+                "limites": {"min": low_deg, "max": high_deg},
+                "inferencia": {**gate.stats(), **decimator.stats()},
+            }
+            await websocket.send_json(payload)
+            live.frame_out()
+            timer.lap("send")
+            # fan-out para observadores: só enfileira, nunca espera por eles
+            event_bus.publish(payload, live_topic(session_id))
 
     except WebSocketDisconnect:
         # normal: cliente fechou
         pass
+    except asyncio.CancelledError:
+        # encerrada pelo operador (live_sessions.kill): fecha e finaliza como desconexão
+        if live is None or live.killed is None:
+            raise
+        asyncio.current_task().uncancel()
+        try:
+            detail = "Sessão encerrada pelo operador" + (f": {live.killed}" if live.killed else ".")
+            await websocket.send_json({"type": "error", "detail": detail})
+            await websocket.close(code=1008)
+        except Exception:
+            pass
     except Exception as e:
         try:
             await websocket.send_json({"type": "error", "detail": str(e)})
         except Exception:
             pass
     finally:
+        if live is not None:
+            live_sessions.unregister(live)
+        if lease is not None:
+            lease.release()
+        if runtime is not None:
+            runtime.close()
         try:
-            if db and sess:
+            if db and sess and not keep_status:
+                summary = None
                 if had_valid_metrics:
-                    summary = db.execute(
-                        select(SessionSummaryModel).where(
-                            SessionSummaryModel.session_id == session_id
-                        )
-                    ).scalar_one_or_none()
-
-                    if summary:
-                        summary.reps = int(last_metrics.get("reps", 0))
-                        summary.rom = float(last_metrics.get("rom", 0.0))
-                        summary.cadence = last_metrics.get("cadence")
-                        summary.alerts = last_metrics.get("alertas", [])
-                    else:
-                        summary = SessionSummaryModel(
-                            session_id=session_id,
-                            reps=int(last_metrics.get("reps", 0)),
-                            rom=float(last_metrics.get("rom", 0.0)),
-                            cadence=last_metrics.get("cadence"),
-                            alerts=last_metrics.get("alertas", []),
-                        )
-                        db.add(summary)
-
-                if sess.status != "FINISHED":
-                    sess.status = "FINISHED"
-                    sess.finished_at = datetime.utcnow()
-                    db.add(sess)
-
-                db.commit()
+                    summary = {
+                        "reps": int(last_metrics.get("reps", 0)),
+                        "rom": float(last_metrics.get("rom", 0.0)),
+                        "cadence": last_metrics.get("cadence"),
+                        "alerts": last_metrics.get("alertas", []),
+                    }
+                save_final_summary(db, session_id, summary)
         finally:
             if db:
                 db.close()
@@ -272,6 +388,85 @@ async def ws_infer_session(websocket: WebSocket, session_id: str):
                 pass
 
 
+@router.websocket("/ws/session/{session_id}/observe")
+async def ws_observe_session(websocket: WebSocket, session_id: str):
+    """
+    Observador (PRO, somente leitura) das métricas ao vivo de uma sessão.
+
+    Servidor envia: as mesmas métricas do paciente, mais os eventos de status.
+    Cada observador tem fila própria e limitada (descarta as mais antigas), então
+    um observador lento não atrasa o loop de inferência do paciente.
+    """
+    session_id_ctx.set(session_id)
+    tag_task(session_id=session_id)
+    await websocket.accept()
+
+    db: DBSession = SessionLocal()
+    try:
+        token = _get_token_from_ws(websocket)
+        if not token:
+            await websocket.send_json(
+                {"type": "error", "detail": "Token ausente (Authorization Bearer ou ?token=...)"}
+            )
+            await websocket.close(code=1008)
+            return
+
+        from app.api.deps import get_current_user_from_token
+
+        try:
+            user = get_current_user_from_token(db, token)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "detail": e.detail})
+            await websocket.close(code=1008)
+            return
+        if user.role != "PRO":
+            await websocket.send_json({"type": "error", "detail": "Sem permissão"})
+            await websocket.close(code=1008)
+            return
+
+        sess = db.execute(
+            select(SessionModel).where(SessionModel.id == session_id)
+        ).scalar_one_or_none()
+        if not sess:
+            await websocket.send_json({"type": "error", "detail": "Sessão não encontrada."})
+            await websocket.close(code=1008)
+            return
+        status = sess.status
+    finally:
+        db.close()
+
+    sub = event_bus.subscribe(
+        live_topic(session_id), session_topic(session_id), queue_size=OBSERVER_QUEUE_SIZE
+    )
+    try:
+        await websocket.send_json({"type": "ready", "session_id": session_id, "status": status})
+        if status == "FINISHED":
+            return
+
+        while True:
+            event = await sub.get(timeout=OBSERVER_HEARTBEAT_S)
+            if event is None:
+                # também serve para descobrir que o observador caiu
+                await websocket.send_json({"type": "ping"})
+                continue
+            if event["type"] == "metrics":
+                event = {**event, "descartados": sub.dropped}
+            await websocket.send_json(event)
+            if event["type"] == "status" and event["status"] == "FINISHED":
+                return
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        # send num socket que já caiu; não há mais a quem avisar
+        pass
+    finally:
+        sub.close()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
 @router.get("/ws/ping")
 def ws_ping():
     return {"ok": True}
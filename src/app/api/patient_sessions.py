@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session as DBSession
 
 from app.api.deps import get_current_user, require_role
+from app.db.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.session import SessionCreate, SessionOut
@@ -41,13 +42,21 @@ def create_patient_session(
 @router.get("/{patient_id}/sessions", response_model=list[SessionOut])
 def list_patient_sessions(
     patient_id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     db: DBSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     try:
-        return list_sessions_for_patient(db, user, patient_id)
+        page = list_sessions_for_patient(db, user, patient_id, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except BadRequestError as e:
         # permissão
         if str(e) == "Sem permissão":
             raise HTTPException(status_code=403, detail=str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session as DBSession
 
 from app.api.deps import require_role
+from app.db.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError
 from app.db.session import get_db
 from app.schemas.patient import PatientCreate, PatientOut, PatientUpdate
 from app.services.patients_service import (
@@ -31,12 +32,19 @@ def create_patient_endpoint(
 
 @router.get("", response_model=list[PatientOut])
 def list_patients_endpoint(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     db: DBSession = Depends(get_db),
     _=Depends(require_role("PRO")),
 ):
-    return list_patients(db, skip=skip, limit=limit)
+    try:
+        page = list_patients(db, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{patient_id}", response_model=PatientOut)
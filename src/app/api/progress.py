@@ -0,0 +1,30 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session as DBSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.progress import ProgressPointOut
+from app.services.progress_service import BadRequestError, get_progress
+
+router = APIRouter(prefix="/patients", tags=["progress"])
+
+
+@router.get("/{patient_id}/progress", response_model=list[ProgressPointOut])
+def get_patient_progress(
+    patient_id: str,
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    bucket: str = "day",
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    try:
+        return get_progress(db, user, patient_id, date_from, date_to, bucket)
+    except BadRequestError as e:
+        # permissão
+        if str(e) == "Sem permissão":
+            raise HTTPException(status_code=403, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
@@ -6,7 +6,70 @@ load_dotenv()
 
 class Settings(BaseSettings):
     api_name: str = "fisio-api"
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+
+    # Pool de conexões do Postgres (por worker do uvicorn).
+    # Conexões máximas por worker = db_pool_size + db_max_overflow.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # segundos esperando uma conexão livre
+    db_pool_recycle: int = 1800  # segundos; -1 desativa
+    # pre-ping faz um round trip a cada checkout; com recycle curto dá pra desligar
+    db_pool_pre_ping: bool = True
+
+    # logs: "text" (evento chave=valor) ou "json" (um objeto por linha)
+    log_format: str = "text"
+    # fração das requisições < 400 logadas; erros e lentas (>= slow_ms) sempre entram
+    request_log_sample_rate: float = 1.0
+    request_log_slow_ms: float = 1000.0
+
+    # statements acima disso são logados (parâmetros só com os tipos)
+    db_slow_query_ms: float = 200.0
+    # X-DB-Queries / X-DB-Time nas respostas (depuração; expõe tempo de banco)
+    db_debug_headers: bool = False
+
+    # monitor do event loop: mede o atraso e loga a pilha de quem trava o loop
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 100.0
+    loop_lag_threshold_ms: float = 250.0
+
+    # rotas /v1/debug (profiling sob demanda); desligadas por padrão
+    debug_api_enabled: bool = False
+    debug_admins: str = ""  # e-mails PRO autorizados, separados por vírgula; vazio = todo PRO
+    profiling_max_seconds: float = 60.0
+    profiling_interval_ms: float = 10.0
+    # cada worker publica suas sessões ao vivo (GET /v1/debug/live-sessions) neste intervalo
+    live_sessions_publish_s: float = 2.0
+
+    # catálogo de exercícios em memória; o TTL limita a defasagem entre workers
+    exercise_cache_ttl_s: float = 60.0
+
+    # transporte dos eventos ao vivo entre workers: "memory" (um processo) ou "postgres"
+    event_broker: str = "memory"
+    event_broker_channel: str = "fisio_events"
+    event_broker_flush_ms: int = 50
+
+    # admissão no WS de inferência (por worker)
+    infer_max_sessions: int = 8
+    infer_cpu_budget_fraction: float = 0.8  # fração de 1 core reservada à inferência
+    infer_session_cost_ms_per_s: float = 150.0  # estimativa até medir (~15 ms x 10 fps)
+    infer_queue_timeout_s: float = 0.0  # 0 = recusa na hora, sem fila
+    infer_max_queue: int = 4
+    infer_retry_after_s: int = 5
+    # controle adaptativo de fps/resolução/modelo por sessão (mensagens "control")
+    infer_qos_enabled: bool = True
+    # backend de pose: "mediapipe" (produção) ou "synthetic" (carga/CI sem mediapipe)
+    pose_backend: str = "mediapipe"
+    synthetic_pose_fps: float = 0.0  # relógio do movimento: 1/fps por frame; 0 = tempo real
+    synthetic_pose_period_s: float = 3.0  # duração de uma repetição
+    synthetic_pose_noise: float = 0.003  # desvio do ruído nas coordenadas (0..1)
+    synthetic_pose_dropout: float = 0.0  # probabilidade de frame sem pessoa
+    synthetic_pose_cost_ms: float = 15.0  # CPU simulada por frame (model_complexity=1)
+    synthetic_pose_seed: int = 0
+    # motion gating: pula a inferência quando o frame quase não mudou (0 desativa)
+    motion_gate_threshold: float = 2.5  # diferença média 0..255 no thumbnail em cinza
+    motion_gate_max_skip: int = 15  # força inferência depois de N frames pulados
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
 settings = Settings()
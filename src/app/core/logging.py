@@ -1,11 +1,110 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+# request_id da requisição/WS em andamento (preenchido pelo RequestLoggingMiddleware)
+request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
+# sessão de inferência atendida pela task (WS); aparece nos logs e nos travamentos do loop
+session_id_ctx: ContextVar[str | None] = ContextVar("session_id", default=None)
+
+_listener: QueueListener | None = None
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields) -> None:
+    """
+    Loga "evento chave=valor ..." e guarda os campos no record, para o
+    formato json emitir cada um como atributo próprio.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    msg = " ".join([event, *(f"{k}={v}" for k, v in fields.items())])
+    logger.log(level, msg, extra={"event": event, "fields": fields})
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        fields = getattr(record, "fields", None)
+        if fields is not None:
+            data["event"] = record.event
+            data.update(fields)
+        else:
+            data["message"] = record.getMessage()
+        for key in ("request_id", "session_id"):
+            value = getattr(record, key, None)
+            if value and key not in data:
+                data[key] = value
+        exc = getattr(record, "exc_text", None) or (
+            self.formatException(record.exc_info) if record.exc_info else None
+        )
+        if exc:
+            data["exc"] = exc
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler que preserva o traceback em exc_text (o padrão o embute na
+    mensagem) e anota request_id/session_id do contexto de quem logou.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.request_id = request_id_ctx.get()
+        record.session_id = session_id_ctx.get()
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
 
 
 def setup_logging() -> None:
+    """
+    Os handlers chamados no event loop só enfileiram o record; a escrita no
+    stdout fica numa thread do QueueListener.
+    """
+    global _listener
+    stop_logging()
+
+    handler = logging.StreamHandler(sys.stdout)
+    if settings.log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[_QueueHandler(log_queue)],
         force=True,
     )
+
+
+def stop_logging() -> None:
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import Session as DBSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class Page:
+    items: list[Any] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(ts), row_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Cursor inválido.") from e
+
+
+def clamp_page_size(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_page(
+    db: DBSession,
+    q: Select,
+    created_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int | None,
+) -> Page:
+    """
+    Paginação por keyset ordenada por (created_at DESC, id DESC).
+
+    O cursor guarda a chave do último item da página, então o custo de cada
+    página não depende de quantas linhas vieram antes (ao contrário de OFFSET).
+    Precisa de um índice composto terminando em (created_at, id).
+    """
+    size = clamp_page_size(limit)
+    if cursor:
+        ts, last_id = decode_cursor(cursor)
+        # cursor de outra listagem (id int x uuid) não pode chegar ao banco como 500
+        id_type = id_col.type.python_type
+        if type(last_id) is not id_type:
+            raise InvalidCursorError("Cursor inválido.")
+        q = q.where(tuple_(created_col, id_col) < tuple_(ts, last_id))
+
+    q = q.order_by(created_col.desc(), id_col.desc()).limit(size + 1)
+    rows = list(db.execute(q).scalars().all())
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return Page(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolWaitStats:
+    """
+    Acumula quanto tempo os checkouts esperam por uma conexão do pool.
+    Thread-safe: o pool é usado pelas threads do threadpool do FastAPI.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / total, 3) if total else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de espera de cada checkout."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.wait_stats.record((time.perf_counter() - start) * 1000)
+        return conn
+
+    def recreate(self) -> InstrumentedQueuePool:
+        new_pool = super().recreate()
+        new_pool.wait_stats = self.wait_stats
+        return new_pool
+
+
+def pool_status(pool) -> dict:
+    """Estado atual do pool do engine (por worker)."""
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+
+    out = {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    stats = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        out["checkout_wait"] = stats.snapshot()
+    return out
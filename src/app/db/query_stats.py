@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import log_event, request_id_ctx
+from app.core.metrics import registry
+
+logger = logging.getLogger("app.db")
+
+MAX_LOGGED_STATEMENT = 1000
+
+db_query_seconds = registry.histogram(
+    "fisio_db_query_seconds", "Tempo de cada statement SQL (cursor.execute)"
+)
+
+
+class QueryStats:
+    """Queries e tempo de banco de uma requisição."""
+
+    __slots__ = ("count", "time_ms", "statements")
+
+    def __init__(self, keep_statements: bool = False) -> None:
+        self.count = 0
+        self.time_ms = 0.0
+        self.statements: list[str] | None = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.time_ms += elapsed_ms
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+# preenchido pelo RequestLoggingMiddleware; o threadpool do FastAPI copia o
+# contexto, então os endpoints síncronos somam no mesmo objeto
+query_stats_ctx: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# capturas abertas por capture_queries() (testes); valem para qualquer thread
+_captures: list[QueryStats] = []
+
+
+def redact_params(params, executemany: bool = False):
+    """Só os tipos dos parâmetros: valores (senhas, dados de paciente) nunca vão para o log."""
+    if params is None:
+        return None
+    if executemany:
+        return f"<{len(params)} linhas>"
+    if isinstance(params, dict):
+        return {k: type(v).__name__ for k, v in params.items()}
+    if isinstance(params, list | tuple):
+        return [type(v).__name__ for v in params]
+    return type(params).__name__
+
+
+def _compact(statement: str) -> str:
+    s = re.sub(r"\s+", " ", statement).strip()
+    return s if len(s) <= MAX_LOGGED_STATEMENT else s[:MAX_LOGGED_STATEMENT] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed_s = time.perf_counter() - starts.pop()
+    elapsed_ms = elapsed_s * 1000
+    db_query_seconds.observe(elapsed_s)
+
+    stats = query_stats_ctx.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    for captured in _captures:
+        captured.record(statement, elapsed_ms)
+
+    if elapsed_ms >= settings.db_slow_query_ms:
+        log_event(
+            logger,
+            logging.WARNING,
+            "slow_query",
+            request_id=request_id_ctx.get(),
+            duration_ms=round(elapsed_ms, 2),
+            statement=_compact(statement),
+            params=redact_params(parameters, executemany),
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # statement que falhou não passa pelo after_cursor_execute
+    conn = exception_context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture_queries():
+    """Conta (e guarda) todo statement executado dentro do bloco, em qualquer thread."""
+    captured = QueryStats(keep_statements=True)
+    _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _captures.remove(captured)
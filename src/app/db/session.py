@@ -2,15 +2,36 @@ import os
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.query_stats import install_query_instrumentation
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL não definido no .env")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def _engine_kwargs(url: str) -> dict:
+    # SQLite (testes locais) fica com o pool padrão do dialeto
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL))
+install_query_instrumentation(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
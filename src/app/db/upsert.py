@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Row, Table, and_, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session as DBSession
+
+# dialetos com INSERT ... ON CONFLICT ... RETURNING
+_ON_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_returning(
+    db: DBSession,
+    table: Table,
+    values: dict[str, Any],
+    index_elements: list[str],
+    update_cols: list[str],
+) -> Row:
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE SET update_cols ... RETURNING *
+
+    Em Postgres/SQLite é um único statement (sem corrida entre SELECT e INSERT).
+    Outros dialetos caem num SELECT FOR UPDATE + INSERT/UPDATE na mesma transação.
+    Não faz commit: quem chama decide o limite da transação.
+    """
+    if not update_cols:
+        raise ValueError("update_cols vazio")
+
+    dialect_insert = _ON_CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={c: stmt.excluded[c] for c in update_cols},
+        ).returning(*table.c)
+        return db.execute(stmt).one()
+
+    key = and_(*(table.c[k] == values[k] for k in index_elements))
+    exists = db.execute(select(table.c[index_elements[0]]).where(key).with_for_update()).first()
+    if exists:
+        db.execute(update(table).where(key).values({c: values[c] for c in update_cols}))
+    else:
+        db.execute(insert(table).values(**values))
+    return db.execute(select(table).where(key)).one()
+
+
+def update_returning(db: DBSession, table: Table, where, values: dict[str, Any]) -> Row | None:
+    """UPDATE ... RETURNING * (ou UPDATE + SELECT se o dialeto não suportar RETURNING)."""
+    if db.get_bind().dialect.update_returning:
+        stmt = update(table).where(where).values(**values).returning(*table.c)
+        return db.execute(stmt).one_or_none()
+
+    db.execute(update(table).where(where).values(**values))
+    return db.execute(select(table).where(where)).one_or_none()
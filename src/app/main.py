@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,12 +8,27 @@ from app.api.router import api_router
 from app.core.exception_handlers import register_exception_handlers
 from app.core.logging import setup_logging
 from app.middleware.request_logging import RequestLoggingMiddleware
+from app.services.event_bus import start_event_broker, stop_event_broker
+from app.services.live_sessions import start_live_sessions, stop_live_sessions
+from app.services.loop_monitor import start_loop_monitor, stop_loop_monitor
 
 load_dotenv()
 
 setup_logging()
 
-app = FastAPI(title="Fisio API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_event_broker()
+    start_loop_monitor()
+    start_live_sessions()
+    yield
+    await stop_live_sessions()
+    await stop_loop_monitor()
+    stop_event_broker()
+
+
+app = FastAPI(title="Fisio API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(RequestLoggingMiddleware)
 
@@ -35,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor", "ETag", "X-DB-Queries", "X-DB-Time"],
 )
 
 register_exception_handlers(app)
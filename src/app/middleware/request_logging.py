@@ -1,49 +1,153 @@
 import logging
+import random
 import time
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import log_event, request_id_ctx
+from app.db.query_stats import QueryStats, query_stats_ctx
 
 logger = logging.getLogger("app.request")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class RequestLoggingMiddleware:
+    """
+    Middleware ASGI puro (sem o BaseHTTPMiddleware): gera o request_id, devolve
+    X-Request-ID e loga uma linha por requisição HTTP ou conexão WebSocket,
+    com quantas queries ela fez e o tempo gasto no banco.
+
+    Respostas < 400 rápidas entram por amostragem (`sample_rate`); erros,
+    exceções, requisições acima de `slow_ms` e WebSockets são sempre logados.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float | None = None,
+        slow_ms: float | None = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = settings.request_log_sample_rate if sample_rate is None else sample_rate
+        self.slow_ms = settings.request_log_slow_ms if slow_ms is None else slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _start(self, scope: Scope) -> tuple[str, QueryStats]:
         request_id = str(uuid.uuid4())
-        start = time.perf_counter()
+        # request.state lê scope["state"]: os exception handlers continuam achando o id
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_ctx.set(request_id)
+        stats = QueryStats()
+        query_stats_ctx.set(stats)
+        return request_id, stats
 
-        request.state.request_id = request_id
+    def _should_log(self, status: int, duration_ms: float) -> bool:
+        if status >= 400 or duration_ms >= self.slow_ms:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
 
-        logger.info(
-            "request_started request_id=%s method=%s path=%s",
-            request_id,
-            request.method,
-            request.url.path,
-        )
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_id, stats = self._start(scope)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                if settings.db_debug_headers:
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append("X-DB-Time", f"{stats.time_ms:.2f}")
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception:
             duration_ms = round((time.perf_counter() - start) * 1000, 2)
             logger.exception(
                 "request_failed request_id=%s method=%s path=%s duration_ms=%s",
                 request_id,
-                request.method,
-                request.url.path,
+                scope["method"],
+                scope["path"],
                 duration_ms,
             )
             raise
 
         duration_ms = round((time.perf_counter() - start) * 1000, 2)
-        response.headers["X-Request-ID"] = request_id
-
-        logger.info(
-            "request_finished request_id=%s method=%s path=%s status_code=%s duration_ms=%s",
-            request_id,
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms,
+        if self._should_log(status, duration_ms):
+            log_event(
+                logger,
+                logging.INFO,
+                "request_finished",
+                request_id=request_id,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status,
+                duration_ms=duration_ms,
+                db_queries=stats.count,
+                db_ms=round(stats.time_ms, 2),
+            )
+
+    async def _websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_id, stats = self._start(scope)
+        start = time.perf_counter()
+        accepted = False
+        close_code: int | None = None
+        closed_by = None
+
+        async def receive_wrapper() -> Message:
+            nonlocal close_code, closed_by
+            message = await receive()
+            if message["type"] == "websocket.disconnect" and closed_by is None:
+                close_code = message.get("code", 1000)
+                closed_by = "client"
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal accepted, close_code, closed_by
+            if message["type"] == "websocket.accept":
+                accepted = True
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            elif message["type"] == "websocket.close" and closed_by is None:
+                close_code = message.get("code", 1000)
+                closed_by = "server"
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            logger.exception(
+                "websocket_failed request_id=%s path=%s duration_ms=%s",
+                request_id,
+                scope["path"],
+                duration_ms,
+            )
+            raise
+
+        log_event(
+            logger,
+            logging.INFO,
+            "websocket_closed",
+            request_id=request_id,
+            path=scope["path"],
+            accepted=accepted,
+            close_code=close_code,
+            closed_by=closed_by,
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            db_queries=stats.count,
+            db_ms=round(stats.time_ms, 2),
         )
-        return response
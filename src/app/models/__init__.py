@@ -1,5 +1,6 @@
 import app.models  # noqa: F401
 from app.models.assignment import Assignment  # noqa: F401
 from app.models.exercise import Exercise  # noqa: F401
+from app.models.progress import PatientDailyProgress  # noqa: F401
 from app.models.session import Session, SessionSummary  # noqa: F401
 from app.models.user import User  # noqa: F401
@@ -1,16 +1,25 @@
+from __future__ import annotations
+
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.exercise import Exercise
+
 
 class ExerciseConfig(Base):
     __tablename__ = "exercise_configs"
+    __table_args__ = (
+        Index("ix_exercise_configs_patient_exercise", "patient_user_id", "exercise_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"))
+    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"), index=True)
     patient_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"))
 
     # Deixa flexível em JSON pra amputação / futuro:
@@ -21,13 +30,21 @@ class ExerciseConfig(Base):
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        Index("ix_assignments_patient_created", "patient_user_id", "created_at", "id"),
+        Index("ix_assignments_created", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     patient_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"))
-    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"))
-    config_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercise_configs.id"))
+    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"), index=True)
+    config_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercise_configs.id"), index=True)
 
     schedule: Mapped[str] = mapped_column(String(30), default="DAILY")
     active: Mapped[bool] = mapped_column(Boolean, default=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # lazy="raise": carregar só com eager loading explícito (evita N+1 silencioso)
+    exercise: Mapped[Exercise] = relationship(lazy="raise")
+    config: Mapped[ExerciseConfig] = relationship(lazy="raise")
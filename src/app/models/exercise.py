@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,11 +8,15 @@ from app.db.base import Base
 
 class Exercise(Base):
     __tablename__ = "exercises"
+    __table_args__ = (Index("ix_exercises_created", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    created_by_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"))
+    created_by_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), index=True)
     title: Mapped[str] = mapped_column(String(120))
     description: Mapped[str] = mapped_column(String(1000), default="")
     body_focus: Mapped[str] = mapped_column(String(30), default="TRUNK")  # TRUNK/UPPER/LOWER
     analysis_kind: Mapped[str] = mapped_column(String(40), default="V1_LITE_THRESHOLDS")
+    # decimação da inferência no WS: FULL (todo frame), FIXED (1 a cada stride), ADAPTIVE
+    inference_mode: Mapped[str] = mapped_column(String(20), default="FULL", server_default="FULL")
+    inference_stride: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PatientDailyProgress(Base):
+    """
+    Rollup diário por paciente (só sessões FINISHED com summary).
+    Recalculado para o dia afetado sempre que uma sessão é finalizada.
+    """
+
+    __tablename__ = "patient_daily_progress"
+
+    patient_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    sessions: Mapped[int] = mapped_column(Integer, default=0)
+    reps: Mapped[int] = mapped_column(Integer, default=0)
+    rom_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    rom_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cadence_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    cadence_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
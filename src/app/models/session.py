@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,17 +9,22 @@ from app.db.base import Base
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # listagem paginada por paciente (keyset em created_at, id)
+        Index("ix_sessions_patient_created", "patient_user_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     patient_user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"))
-    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"))
-    assignment_id: Mapped[int] = mapped_column(Integer, ForeignKey("assignments.id"))
+    exercise_id: Mapped[int] = mapped_column(Integer, ForeignKey("exercises.id"), index=True)
+    assignment_id: Mapped[int] = mapped_column(Integer, ForeignKey("assignments.id"), index=True)
 
     status: Mapped[str] = mapped_column(String(20), default="CREATED")  # CREATED/RUNNING/FINISHED
     config_snapshot: Mapped[dict] = mapped_column(JSON, default=dict)
 
     started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class SessionSummary(Base):
@@ -3,6 +3,9 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.exercise import ExerciseOut
+from app.schemas.session import SessionOut
+
 Schedule = Literal["DAILY", "WEEKLY", "CUSTOM"]
 
 
@@ -48,5 +51,12 @@ class AssignmentOut(BaseModel):
     created_at: datetime
 
 
+class AssignmentExpandedOut(AssignmentOut):
+    # preenchidos só quando pedidos via ?expand=exercise,config,last_session
+    exercise: ExerciseOut | None = None
+    config: ExerciseConfigOut | None = None
+    last_session: SessionOut | None = None
+
+
 class ConfigParamsUpdate(BaseModel):
     params: dict[str, Any]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class ProfileRequest(BaseModel):
+    # alvo: uma sessão de inferência ao vivo OU uma rota (template, ex.: /v1/sessions/{session_id})
+    session_id: str | None = None
+    route: str | None = None
+    method: str | None = None  # só com route; vazio = todos os métodos da rota
+    seconds: float = Field(default=10.0, gt=0)
+    interval_ms: float | None = Field(default=None, ge=1, le=1000)
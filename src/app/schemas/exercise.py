@@ -4,6 +4,7 @@ from typing import Literal
 from pydantic import BaseModel, ConfigDict, Field
 
 BodyFocus = Literal["TRUNK", "UPPER", "LOWER"]
+InferenceMode = Literal["FULL", "FIXED", "ADAPTIVE"]
 
 
 class ExerciseCreate(BaseModel):
@@ -11,6 +12,8 @@ class ExerciseCreate(BaseModel):
     description: str | None = Field(default="", max_length=1000)
     body_focus: BodyFocus = "TRUNK"
     analysis_kind: str = Field(default="V1_LITE_THRESHOLDS", max_length=40)
+    inference_mode: InferenceMode = "FULL"
+    inference_stride: int = Field(default=1, ge=1, le=10)
 
 
 class ExerciseUpdate(BaseModel):
@@ -18,6 +21,8 @@ class ExerciseUpdate(BaseModel):
     description: str | None = Field(None, max_length=1000)
     body_focus: BodyFocus | None = None
     analysis_kind: str | None = Field(None, max_length=40)
+    inference_mode: InferenceMode | None = None
+    inference_stride: int | None = Field(None, ge=1, le=10)
 
 
 class ExerciseOut(BaseModel):
@@ -29,4 +34,6 @@ class ExerciseOut(BaseModel):
     description: str
     body_focus: str
     analysis_kind: str
+    inference_mode: str
+    inference_stride: int
     created_at: datetime
@@ -0,0 +1,13 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class ProgressPointOut(BaseModel):
+    period_start: date
+    sessions: int
+    reps: int
+    avg_rom: float
+    max_rom: float | None = None
+    avg_cadence: float | None = None  # reps/s
+    cadence_drift: float | None = None  # variação vs. período anterior
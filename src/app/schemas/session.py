@@ -21,6 +21,7 @@ class SessionOut(BaseModel):
     config_snapshot: dict
     started_at: datetime
     finished_at: datetime | None = None
+    created_at: datetime | None = None
 
 
 class SessionSummaryIn(BaseModel):
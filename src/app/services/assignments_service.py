@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.orm import aliased, joinedload, noload
 
+from app.db.pagination import Page, keyset_page
 from app.models.assignment import Assignment, ExerciseConfig
 from app.models.exercise import Exercise
+from app.models.session import Session as SessionModel
 from app.models.user import User
 
 
@@ -16,6 +19,9 @@ class BadRequestError(Exception):
     pass
 
 
+EXPANDABLE = ("exercise", "config", "last_session")
+
+
 def _get_exercise(db: DBSession, exercise_id: int) -> Exercise:
     ex = db.execute(select(Exercise).where(Exercise.id == exercise_id)).scalar_one_or_none()
     if not ex:
@@ -102,15 +108,66 @@ def create_assignment(
     return a
 
 
-def list_assignments(db: DBSession, user: User, patient_user_id: str | None) -> list[Assignment]:
-    q = select(Assignment)
+def parse_expand(expand: str | None) -> set[str]:
+    fields = {f.strip() for f in (expand or "").split(",") if f.strip()}
+    unknown = fields - set(EXPANDABLE)
+    if unknown:
+        raise BadRequestError(f"expand inválido: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def _attach_last_sessions(db: DBSession, assignments: list[Assignment]) -> None:
+    # uma query só: última sessão de cada assignment via row_number()
+    if not assignments:
+        return
+    rn = (
+        func.row_number()
+        .over(
+            partition_by=SessionModel.assignment_id,
+            order_by=(SessionModel.created_at.desc(), SessionModel.id.desc()),
+        )
+        .label("rn")
+    )
+    sub = (
+        select(SessionModel, rn)
+        .where(SessionModel.assignment_id.in_([a.id for a in assignments]))
+        .subquery()
+    )
+    latest = aliased(SessionModel, sub)
+    rows = db.execute(select(latest).where(sub.c.rn == 1)).scalars().all()
+
+    by_assignment = {s.assignment_id: s for s in rows}
+    for a in assignments:
+        a.last_session = by_assignment.get(a.id)
+
+
+def list_assignments(
+    db: DBSession,
+    user: User,
+    patient_user_id: str | None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    expand: set[str] | None = None,
+) -> Page:
+    """
+    expand carrega os relacionamentos em número constante de queries:
+    exercise/config via JOIN na própria listagem, last_session numa query extra.
+    """
+    expand = expand or set()
+    q = select(Assignment).options(
+        joinedload(Assignment.exercise) if "exercise" in expand else noload(Assignment.exercise),
+        joinedload(Assignment.config) if "config" in expand else noload(Assignment.config),
+    )
 
     if user.role == "PATIENT":
         q = q.where(Assignment.patient_user_id == user.id)
     elif patient_user_id:
         q = q.where(Assignment.patient_user_id == patient_user_id)
 
-    return db.execute(q).scalars().all()
+    page = keyset_page(db, q, Assignment.created_at, Assignment.id, cursor, limit)
+    if "last_session" in expand:
+        _attach_last_sessions(db, page.items)
+    return page
 
 
 def get_assignment(db: DBSession, user: User, assignment_id: int) -> Assignment:
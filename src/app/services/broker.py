@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+
+logger = logging.getLogger("app.broker")
+
+Topics = tuple[str, ...]
+DeliverFn = Callable[[Topics, dict], None]
+
+BACKENDS = ("memory", "postgres")
+
+# limite do payload do NOTIFY é 8000 bytes; deixa folga para o envelope
+MAX_NOTIFY_PAYLOAD = 7500
+# eventos aguardando flush; com o banco fora, descarta os mais antigos
+MAX_PENDING = 10_000
+# tópicos de métricas por frame: dentro de uma janela de flush só vale a última
+COALESCE_PREFIX = "live:"
+
+
+class Broker(ABC):
+    """
+    Transporte dos eventos entre processos. O EventBus de cada worker chama
+    publish(); o broker entrega em todos os workers via deliver(topics, event).
+    """
+
+    @abstractmethod
+    def start(self, deliver: DeliverFn) -> None: ...
+
+    @abstractmethod
+    def publish(self, topics: Topics, event: dict) -> None: ...
+
+    def stop(self) -> None:
+        pass
+
+
+class InMemoryBroker(Broker):
+    """Um processo só (dev, testes, um worker): entrega direto, sem fila."""
+
+    def __init__(self) -> None:
+        self._deliver: DeliverFn | None = None
+
+    def start(self, deliver: DeliverFn) -> None:
+        self._deliver = deliver
+
+    def publish(self, topics: Topics, event: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(topics, event)
+
+
+def coalesce(batch: list[tuple[Topics, dict]]) -> list[tuple[Topics, dict]]:
+    """Mantém todos os eventos de status/summary, mas só a última métrica de cada live:*."""
+    last: dict[Topics, int] = {}
+    for i, (topics, _) in enumerate(batch):
+        if all(t.startswith(COALESCE_PREFIX) for t in topics):
+            last[topics] = i
+    return [item for i, item in enumerate(batch) if last.get(item[0], i) == i]
+
+
+def pack_payloads(batch: list[tuple[Topics, dict]], limit: int = MAX_NOTIFY_PAYLOAD) -> list[str]:
+    """Agrupa o lote em arrays JSON [[topics, event], ...] de até `limit` bytes."""
+    payloads: list[str] = []
+    parts: list[str] = []
+    size = 2
+    for topics, event in batch:
+        item = json.dumps([list(topics), event], ensure_ascii=False, separators=(",", ":"))
+        n = len(item.encode("utf-8")) + 1
+        if n + 2 > limit:
+            logger.warning("evento maior que o payload do NOTIFY, descartado: %s", topics)
+            continue
+        if parts and size + n > limit:
+            payloads.append("[" + ",".join(parts) + "]")
+            parts, size = [], 2
+        parts.append(item)
+        size += n
+    if parts:
+        payloads.append("[" + ",".join(parts) + "]")
+    return payloads
+
+
+class PostgresBroker(Broker):
+    """
+    LISTEN/NOTIFY no próprio Postgres da aplicação, sem infraestrutura nova.
+
+    - publish() só enfileira; uma thread faz flush a cada `flush_interval_s`,
+      coalescendo métricas por frame e juntando o lote em poucos NOTIFY;
+    - outra thread fica em LISTEN numa conexão dedicada e entrega localmente
+      tudo o que chega, inclusive o que este mesmo worker publicou.
+    """
+
+    def __init__(self, conninfo: str, channel: str, flush_interval_s: float = 0.05) -> None:
+        self.conninfo = conninfo
+        self.channel = channel
+        self.flush_interval_s = flush_interval_s
+        self._deliver: DeliverFn | None = None
+        self._pending: deque[tuple[Topics, dict]] = deque(maxlen=MAX_PENDING)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self, deliver: DeliverFn) -> None:
+        self._deliver = deliver
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._listen_loop, name="broker-listen", daemon=True),
+            threading.Thread(target=self._flush_loop, name="broker-flush", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def wait_ready(self, timeout: float = 5.0) -> bool:
+        """True quando o LISTEN já está ativo (nada publicado antes disso se perde)."""
+        return self._listening.wait(timeout)
+
+    def publish(self, topics: Topics, event: dict) -> None:
+        with self._lock:
+            self._pending.append((topics, event))
+
+    def stop(self) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+
+    def _connect(self, autocommit: bool):
+        import psycopg
+
+        return psycopg.connect(self.conninfo, autocommit=autocommit)
+
+    def _take_batch(self) -> list[tuple[Topics, dict]]:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        return coalesce(batch)
+
+    def _flush(self, conn):
+        batch = self._take_batch()
+        if not batch:
+            return conn
+        try:
+            if conn is None or conn.closed:
+                conn = self._connect(autocommit=False)
+            # uma transação por lote: as notificações saem juntas no commit
+            with conn.transaction():
+                for payload in pack_payloads(batch):
+                    conn.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+        except Exception:
+            logger.exception("falha ao publicar %d eventos no Postgres", len(batch))
+            if conn is not None:
+                conn.close()
+            conn = None
+        return conn
+
+    def _flush_loop(self) -> None:
+        conn = None
+        while not self._stop.wait(self.flush_interval_s):
+            conn = self._flush(conn)
+        # último lote antes de desligar
+        conn = self._flush(conn)
+        if conn is not None:
+            conn.close()
+
+    def _listen_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self._connect(autocommit=True) as conn:
+                    conn.execute(f'LISTEN "{self.channel}"')
+                    self._listening.set()
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=0.5):
+                            self._dispatch(notify.payload)
+            except Exception:
+                self._listening.clear()
+                logger.exception("conexão de LISTEN caiu; reconectando")
+                self._stop.wait(1.0)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            items = json.loads(payload)
+        except ValueError:
+            logger.warning("payload de NOTIFY inválido ignorado")
+            return
+        for topics, event in items:
+            self._deliver(tuple(topics), event)
+
+
+def create_broker(backend: str, database_url: str, channel: str, flush_interval_s: float) -> Broker:
+    if backend == "memory":
+        return InMemoryBroker()
+    if backend == "postgres":
+        from sqlalchemy.engine import make_url
+
+        # URL do SQLAlchemy (postgresql+psycopg://) -> conninfo do libpq
+        url = make_url(database_url).set(drivername="postgresql")
+        return PostgresBroker(url.render_as_string(hide_password=False), channel, flush_interval_s)
+    raise ValueError(f"event_broker inválido: {backend} (use {', '.join(BACKENDS)})")
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import threading
+import time
+from collections import deque
+
+from app.core.config import settings
+
+# peso da amostra nova nas médias móveis de custo e fps
+EWMA_ALPHA = 0.2
+# frames até confiar na medição em vez da estimativa padrão
+WARMUP_FRAMES = 5
+QUEUE_POLL_S = 0.1
+
+
+class CapacityExceededError(Exception):
+    def __init__(self, reason: str, retry_after_s: int) -> None:
+        super().__init__(reason)
+        self.retry_after_s = retry_after_s
+
+
+class SessionLease:
+    """Vaga de uma sessão de inferência; mede o custo real por frame enquanto roda."""
+
+    def __init__(self, manager: CapacityManager, session_id: str) -> None:
+        self.manager = manager
+        self.session_id = session_id
+        self.frames = 0
+        self.frame_cost_ms: float | None = None
+        self.fps: float | None = None
+        self._last_frame_at: float | None = None
+
+    def record_frame(self, elapsed_s: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        cost = elapsed_s * 1000
+        self.frame_cost_ms = (
+            cost
+            if self.frame_cost_ms is None
+            else (1 - EWMA_ALPHA) * self.frame_cost_ms + EWMA_ALPHA * cost
+        )
+        if self._last_frame_at is not None and now > self._last_frame_at:
+            fps = 1 / (now - self._last_frame_at)
+            self.fps = fps if self.fps is None else (1 - EWMA_ALPHA) * self.fps + EWMA_ALPHA * fps
+        self._last_frame_at = now
+        self.frames += 1
+
+    @property
+    def load_ms_per_s(self) -> float:
+        """CPU estimada (ms por segundo) que esta sessão consome."""
+        if self.frames < WARMUP_FRAMES or self.fps is None:
+            return self.manager.default_session_cost_ms_per_s
+        return self.frame_cost_ms * self.fps
+
+    def release(self) -> None:
+        self.manager.release(self)
+
+
+class CapacityManager:
+    """
+    Controle de admissão por worker para o WS de inferência.
+
+    A inferência roda no event loop do worker, então todas as sessões dividem
+    ~1000 ms de CPU por segundo. Uma sessão nova só entra se couber no limite de
+    sessões e no orçamento de CPU (somando o custo medido das que já estão
+    rodando); senão espera na fila até `queue_timeout_s` ou é recusada com
+    retry_after. Quem já está rodando mantém a qualidade.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        cpu_budget_ms_per_s: float,
+        default_session_cost_ms_per_s: float,
+        queue_timeout_s: float = 0.0,
+        max_queue: int = 0,
+        retry_after_s: int = 5,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.cpu_budget_ms_per_s = cpu_budget_ms_per_s
+        self.default_session_cost_ms_per_s = default_session_cost_ms_per_s
+        self.queue_timeout_s = queue_timeout_s
+        self.max_queue = max_queue
+        self.retry_after_s = retry_after_s
+        self._lock = threading.Lock()
+        self._active: set[SessionLease] = set()
+        self._queue: deque[int] = deque()
+        self._tickets = itertools.count()
+        self.rejected = 0
+
+    def _load(self) -> float:
+        return sum(lease.load_ms_per_s for lease in self._active)
+
+    def _refusal_reason(self) -> str | None:
+        if len(self._active) >= self.max_sessions:
+            return "limite de sessões simultâneas atingido"
+        if self._load() + self.default_session_cost_ms_per_s > self.cpu_budget_ms_per_s:
+            return "orçamento de CPU esgotado"
+        return None
+
+    def _retry_after(self) -> int:
+        # com fila, quem chega agora espera pelo menos os que já estão nela
+        return self.retry_after_s * (1 + len(self._queue))
+
+    def try_acquire(self, session_id: str) -> SessionLease:
+        with self._lock:
+            reason = self._refusal_reason()
+            if reason:
+                self.rejected += 1
+                raise CapacityExceededError(reason, self._retry_after())
+            lease = SessionLease(self, session_id)
+            self._active.add(lease)
+            return lease
+
+    async def acquire(self, session_id: str) -> SessionLease:
+        """Como try_acquire, mas aguarda na fila (FIFO) se ela estiver habilitada."""
+        with self._lock:
+            reason = self._refusal_reason()
+            if reason is None and not self._queue:
+                lease = SessionLease(self, session_id)
+                self._active.add(lease)
+                return lease
+            if self.queue_timeout_s <= 0 or len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                raise CapacityExceededError(reason or "fila cheia", self._retry_after())
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+
+        deadline = time.monotonic() + self.queue_timeout_s
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(QUEUE_POLL_S)
+                with self._lock:
+                    if self._queue[0] == ticket and self._refusal_reason() is None:
+                        lease = SessionLease(self, session_id)
+                        self._active.add(lease)
+                        return lease
+            with self._lock:
+                self.rejected += 1
+                raise CapacityExceededError("tempo na fila esgotado", self._retry_after())
+        finally:
+            with self._lock:
+                self._queue.remove(ticket)
+
+    def release(self, lease: SessionLease) -> None:
+        with self._lock:
+            self._active.discard(lease)
+
+    def has_session(self, session_id: str) -> bool:
+        with self._lock:
+            return any(lease.session_id == session_id for lease in self._active)
+
+    def total_fps(self) -> float:
+        with self._lock:
+            return sum(lease.fps or 0.0 for lease in self._active)
+
+    def utilization(self) -> float:
+        with self._lock:
+            return self._load() / self.cpu_budget_ms_per_s
+
+    def occupancy(self) -> dict:
+        with self._lock:
+            load = self._load()
+            return {
+                "active_sessions": len(self._active),
+                "max_sessions": self.max_sessions,
+                "queued": len(self._queue),
+                "load_ms_per_s": round(load, 1),
+                "cpu_budget_ms_per_s": self.cpu_budget_ms_per_s,
+                "utilization": round(load / self.cpu_budget_ms_per_s, 3),
+                "accepting": self._refusal_reason() is None,
+                "rejected_total": self.rejected,
+                "retry_after_s": self._retry_after(),
+            }
+
+
+def _default_budget() -> float:
+    # a inferência roda no event loop (1 thread), então o teto é 1 core por worker
+    return math.floor(1000 * settings.infer_cpu_budget_fraction)
+
+
+capacity = CapacityManager(
+    max_sessions=settings.infer_max_sessions,
+    cpu_budget_ms_per_s=_default_budget(),
+    default_session_cost_ms_per_s=settings.infer_session_cost_ms_per_s,
+    queue_timeout_s=settings.infer_queue_timeout_s,
+    max_queue=settings.infer_max_queue,
+    retry_after_s=settings.infer_retry_after_s,
+)
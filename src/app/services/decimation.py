@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+MODES = ("FULL", "FIXED", "ADAPTIVE")
+
+# margem (graus) em volta de cada limiar em que nunca se extrapola
+GUARD_DEG = 6.0
+# no ADAPTIVE, roda inferência quando o ângulo previsto andou isso desde o keyframe
+ADAPTIVE_STEP_DEG = 8.0
+# sem keyframe há mais tempo que isso, a extrapolação não é confiável
+MAX_EXTRAPOLATION_MS = 500
+
+
+class InferenceDecimator:
+    """
+    Decide em quais frames rodar o BlazePose e estima o ROM nos demais.
+
+    - FULL: inferência em todo frame (comportamento antigo);
+    - FIXED: um keyframe a cada `stride` frames;
+    - ADAPTIVE: keyframe quando o ângulo previsto mudou ADAPTIVE_STEP_DEG desde o
+      último (movimento lento => menos inferência), no máximo `stride` frames depois.
+
+    Entre keyframes o ROM é extrapolado linearmente dos dois últimos keyframes,
+    com os timestamps reais. Para não mudar a contagem de reps, qualquer frame
+    cuja previsão chegue perto de um limiar (low/high) vira keyframe: as
+    transições do analisador sempre acontecem sobre ângulos medidos.
+    """
+
+    def __init__(self, mode: str, stride: int, thresholds: tuple[float, ...] = ()) -> None:
+        if mode not in MODES:
+            raise ValueError(f"inference_mode inválido: {mode}")
+        self.mode = mode
+        self.stride = max(1, stride)
+        self.thresholds = thresholds
+        self.frames = 0
+        self.keyframes = 0
+        self.estimated = 0
+        self._history: list[tuple[int, float]] = []  # últimos (ts_ms, rom) medidos
+        self._since_keyframe = 0
+
+    def _velocity(self) -> float | None:
+        """Graus por ms entre os dois últimos keyframes."""
+        if len(self._history) < 2:
+            return None
+        (t1, r1), (t2, r2) = self._history
+        if t2 <= t1:
+            return None
+        return (r2 - r1) / (t2 - t1)
+
+    def estimate(self, ts_ms: int) -> float | None:
+        v = self._velocity()
+        if v is None:
+            return None
+        t_last, r_last = self._history[-1]
+        if ts_ms - t_last > MAX_EXTRAPOLATION_MS:
+            return None
+        return max(0.0, min(180.0, r_last + v * (ts_ms - t_last)))
+
+    def _near_threshold(self, predicted: float) -> bool:
+        """Previsão cruzou um limiar, ou está a GUARD_DEG dele e indo na direção dele."""
+        r_last = self._history[-1][1]
+        for thr in self.thresholds:
+            if (r_last - thr) * (predicted - thr) <= 0:
+                return True
+            approaching = (thr - r_last) * (predicted - r_last) > 0
+            if approaching and abs(predicted - thr) <= GUARD_DEG:
+                return True
+        return False
+
+    def next_rom(self, ts_ms: int) -> float | None:
+        """
+        ROM estimado para este frame, ou None quando ele deve ser inferido
+        (nesse caso o chamador roda o pose e chama record_keyframe).
+        """
+        self.frames += 1
+        if self.mode == "FULL":
+            return None
+
+        predicted = self.estimate(ts_ms)
+        if predicted is None or self._since_keyframe + 1 >= self.stride:
+            return None
+        if self._near_threshold(predicted):
+            return None
+        if self.mode == "ADAPTIVE" and abs(predicted - self._history[-1][1]) >= ADAPTIVE_STEP_DEG:
+            return None
+
+        self._since_keyframe += 1
+        self.estimated += 1
+        return predicted
+
+    def record_keyframe(self, ts_ms: int, rom: float | None) -> None:
+        """rom=None (sem pessoa/visibilidade) zera o histórico: volta a inferir até ter 2 pontos."""
+        self.keyframes += 1
+        self._since_keyframe = 0
+        if rom is None:
+            self._history = []
+            return
+        self._history = [*self._history[-1:], (ts_ms, rom)]
+
+    def stats(self) -> dict:
+        return {
+            "modo": self.mode,
+            "keyframes": self.keyframes,
+            # contado à parte: frame que falha no decode não vira keyframe nem estimativa
+            "estimados": self.estimated,
+        }
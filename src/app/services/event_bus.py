@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.services.broker import Broker, InMemoryBroker, create_broker
+
+# eventos guardados por assinante; acima disso o mais antigo é descartado
+DEFAULT_QUEUE_SIZE = 100
+
+event_dropped_total = registry.counter(
+    "fisio_event_dropped_total", "Eventos descartados por fila cheia de assinante (SSE/observador)"
+)
+
+
+def session_topic(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def patient_topic(patient_id: str) -> str:
+    return f"patient:{patient_id}"
+
+
+def live_topic(session_id: str) -> str:
+    """Métricas por frame do WS de inferência (alto volume, só para observadores)."""
+    return f"live:{session_id}"
+
+
+class Subscription:
+    """
+    Fila limitada de um assinante. publish() pode vir de qualquer thread (endpoints
+    sync rodam no threadpool); get() roda no event loop de quem consome.
+    Fila cheia descarta o evento mais antigo: quem publica nunca espera.
+    """
+
+    def __init__(self, bus: EventBus, topics: tuple[str, ...], queue_size: int) -> None:
+        self.bus = bus
+        self.topics = topics
+        self.dropped = 0
+        self._events: deque[dict] = deque(maxlen=queue_size)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def _push(self, event: dict) -> None:
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+                event_dropped_total.inc()
+            self._events.append(event)
+            loop, wakeup = self._loop, self._wakeup
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # loop já encerrado: o consumidor foi embora
+                pass
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Próximo evento, ou None se nada chegar dentro do timeout."""
+        if self._loop is None:
+            with self._lock:
+                self._loop = asyncio.get_running_loop()
+                self._wakeup = asyncio.Event()
+
+        while True:
+            with self._lock:
+                if self._events:
+                    return self._events.popleft()
+                self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                return None
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+
+class EventBus:
+    """
+    Pub/sub dos eventos de sessão (status, summary, métricas).
+
+    As assinaturas são locais ao processo; o transporte entre workers fica com o
+    broker (InMemoryBroker por padrão, PostgresBroker com vários workers).
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, broker: Broker | None = None) -> None:
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subs: dict[str, set[Subscription]] = {}
+        self.broker: Broker = InMemoryBroker()
+        self.use_broker(broker or InMemoryBroker())
+
+    def use_broker(self, broker: Broker) -> None:
+        self.broker.stop()
+        self.broker = broker
+        broker.start(self.deliver)
+
+    def subscribe(self, *topics: str, queue_size: int | None = None) -> Subscription:
+        sub = Subscription(self, topics, queue_size or self.queue_size)
+        with self._lock:
+            for t in topics:
+                self._subs.setdefault(t, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            for t in sub.topics:
+                subs = self._subs.get(t)
+                if subs is None:
+                    continue
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[t]
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subs.get(topic, ()))
+
+    def queue_depth(self, topic: str) -> int:
+        """Maior fila pendente entre os assinantes de `topic` neste processo."""
+        with self._lock:
+            subs = list(self._subs.get(topic, ()))
+        return max((sub.pending for sub in subs), default=0)
+
+    def publish(self, event: dict, *topics: str) -> None:
+        self.broker.publish(topics, event)
+
+    def deliver(self, topics: tuple[str, ...], event: dict) -> None:
+        """Chamado pelo broker: entrega aos assinantes deste processo."""
+        with self._lock:
+            targets = set()
+            for t in topics:
+                targets.update(self._subs.get(t, ()))
+        for sub in targets:
+            sub._push(event)
+
+
+event_bus = EventBus()
+
+
+def start_event_broker() -> None:
+    """Chamado no startup do app: troca o transporte conforme EVENT_BROKER."""
+    if settings.event_broker == "memory":
+        return
+    from app.db.session import DATABASE_URL
+
+    event_bus.use_broker(
+        create_broker(
+            settings.event_broker,
+            DATABASE_URL,
+            settings.event_broker_channel,
+            settings.event_broker_flush_ms / 1000,
+        )
+    )
+
+
+def stop_event_broker() -> None:
+    event_bus.use_broker(InMemoryBroker())
+
+
+def _iso(v: datetime | None) -> str | None:
+    return v.isoformat() if v else None
+
+
+def session_status_event(sess) -> dict:
+    """sess pode ser o model ou a Row devolvida por update_returning."""
+    return {
+        "type": "status",
+        "session_id": sess.id,
+        "patient_user_id": sess.patient_user_id,
+        "status": sess.status,
+        "started_at": _iso(sess.started_at),
+        "finished_at": _iso(sess.finished_at),
+    }
+
+
+def session_summary_event(patient_user_id: str, summary) -> dict:
+    return {
+        "type": "summary",
+        "session_id": summary.session_id,
+        "patient_user_id": patient_user_id,
+        "reps": summary.reps,
+        "rom": float(summary.rom) if summary.rom is not None else None,
+        "cadence": summary.cadence,
+        "alerts": summary.alerts,
+    }
+
+
+def publish_session_status(sess) -> None:
+    event_bus.publish(
+        session_status_event(sess), session_topic(sess.id), patient_topic(sess.patient_user_id)
+    )
+
+
+def publish_session_summary(patient_user_id: str, summary) -> None:
+    event_bus.publish(
+        session_summary_event(patient_user_id, summary),
+        session_topic(summary.session_id),
+        patient_topic(patient_user_id),
+    )
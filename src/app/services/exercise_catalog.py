@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.db.pagination import (
+    InvalidCursorError,
+    Page,
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+)
+from app.models.exercise import Exercise
+from app.schemas.exercise import ExerciseOut
+
+
+def _etag(payload: str) -> str:
+    return '"' + hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+@dataclass
+class _Snapshot:
+    version: int
+    loaded_at: float
+    etag: str
+    # ordenado por (created_at DESC, id DESC), mesma ordem da listagem paginada
+    keys: list[tuple[datetime, int]]
+    items: list[dict]
+    by_id: dict[int, tuple[dict, str]]
+
+
+class ExerciseCatalogCache:
+    """
+    Cache em memória (por worker) do catálogo de exercícios.
+
+    - create/update/delete chamam invalidate() depois do commit;
+    - o TTL limita quanto tempo outro worker pode servir um catálogo antigo;
+    - cada resposta leva um ETag derivado do conteúdo, para 304 em If-None-Match.
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: _Snapshot | None = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def _load(self, db: DBSession) -> _Snapshot:
+        with self._lock:
+            version = self._version
+
+        rows = (
+            db.execute(select(Exercise).order_by(Exercise.created_at.desc(), Exercise.id.desc()))
+            .scalars()
+            .all()
+        )
+        items = [ExerciseOut.model_validate(ex).model_dump(mode="json") for ex in rows]
+        by_id = {}
+        for item in items:
+            by_id[item["id"]] = (item, _etag(json.dumps(item, sort_keys=True)))
+
+        snap = _Snapshot(
+            version=version,
+            loaded_at=time.monotonic(),
+            etag=_etag(json.dumps(items, sort_keys=True)),
+            keys=[(ex.created_at, ex.id) for ex in rows],
+            items=items,
+            by_id=by_id,
+        )
+        with self._lock:
+            # se houve invalidate durante a carga, não guarda um snapshot velho
+            if self._version == version:
+                self._snapshot = snap
+        return snap
+
+    def snapshot(self, db: DBSession) -> _Snapshot:
+        snap = self._snapshot
+        if snap is None or time.monotonic() - snap.loaded_at > self.ttl_s:
+            snap = self._load(db)
+        return snap
+
+    def list_page(self, db: DBSession, cursor: str | None, limit: int | None) -> tuple[Page, str]:
+        """Mesma semântica de keyset_page, mas servida do snapshot em memória."""
+        snap = self.snapshot(db)
+        size = clamp_page_size(limit)
+
+        start = 0
+        if cursor:
+            key = decode_cursor(cursor)
+            if not isinstance(key[1], int) or key[0].tzinfo is not None:
+                raise InvalidCursorError("Cursor inválido.")
+            while start < len(snap.keys) and snap.keys[start] >= key:
+                start += 1
+
+        items = snap.items[start : start + size]
+        next_cursor = None
+        if start + size < len(snap.items):
+            next_cursor = encode_cursor(*snap.keys[start + size - 1])
+
+        etag = _etag(f"{snap.etag}|{cursor}|{size}")
+        return Page(items=items, next_cursor=next_cursor), etag
+
+    def get(self, db: DBSession, exercise_id: int) -> tuple[dict, str] | None:
+        return self.snapshot(db).by_id.get(exercise_id)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag in candidates
+
+
+catalog_cache = ExerciseCatalogCache(ttl_s=settings.exercise_cache_ttl_s)
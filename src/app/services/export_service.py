@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.models.session import Session as SessionModel
+from app.models.session import SessionSummary as SessionSummaryModel
+
+FORMATS = ("ndjson", "csv")
+
+# linhas buscadas por round trip do cursor server-side
+YIELD_PER = 1000
+# linhas serializadas por chunk enviado ao cliente
+ROWS_PER_CHUNK = 500
+
+EXPORT_COLUMNS = (
+    "session_id",
+    "patient_user_id",
+    "exercise_id",
+    "assignment_id",
+    "status",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "reps",
+    "rom",
+    "cadence",
+    "alerts",
+)
+
+
+class BadRequestError(Exception):
+    pass
+
+
+def _export_query(patient_user_id: str | None, date_from: date | None, date_to: date | None):
+    q = select(
+        SessionModel.id.label("session_id"),
+        SessionModel.patient_user_id,
+        SessionModel.exercise_id,
+        SessionModel.assignment_id,
+        SessionModel.status,
+        SessionModel.created_at,
+        SessionModel.started_at,
+        SessionModel.finished_at,
+        SessionSummaryModel.reps,
+        SessionSummaryModel.rom,
+        SessionSummaryModel.cadence,
+        SessionSummaryModel.alerts,
+    ).outerjoin(SessionSummaryModel, SessionSummaryModel.session_id == SessionModel.id)
+
+    if patient_user_id:
+        q = q.where(SessionModel.patient_user_id == patient_user_id)
+    if date_from:
+        q = q.where(SessionModel.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        end = datetime.combine(date_to, time.min) + timedelta(days=1)
+        q = q.where(SessionModel.created_at < end)
+    return q.order_by(SessionModel.created_at, SessionModel.id)
+
+
+def iter_session_rows(
+    engine: Engine,
+    patient_user_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Iterator[dict]:
+    """
+    Itera sessões + summaries com cursor server-side (yield_per), sem carregar
+    o resultado inteiro em memória. Abre a própria conexão porque roda dentro
+    do StreamingResponse, depois que o get_db da requisição já foi fechado.
+    """
+    q = _export_query(patient_user_id, date_from, date_to)
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=YIELD_PER).execute(q)
+        for row in result.mappings():
+            yield dict(row)
+
+
+def _json_default(v):
+    if isinstance(v, datetime | date):
+        return v.isoformat()
+    raise TypeError(f"tipo não serializável: {type(v).__name__}")
+
+
+def _batched(rows: Iterable[dict], n: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    for batch in _batched(rows, ROWS_PER_CHUNK):
+        lines = [json.dumps(r, default=_json_default, ensure_ascii=False) for r in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _csv_value(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, list | dict):
+        return json.dumps(v, ensure_ascii=False)
+    return v
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _batched(rows, ROWS_PER_CHUNK):
+        writer.writerows([_csv_value(r[c]) for c in EXPORT_COLUMNS] for r in batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate(0)
+    # export vazio: só o cabeçalho
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Comprime em streaming (formato .gz), sem bufferizar o arquivo inteiro."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_sessions_stream(
+    engine: Engine,
+    fmt: str,
+    gzip: bool = False,
+    patient_user_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Iterator[bytes]:
+    if fmt not in FORMATS:
+        raise BadRequestError(f"format inválido: {fmt}")
+
+    rows = iter_session_rows(engine, patient_user_id, date_from, date_to)
+    chunks = iter_ndjson(rows) if fmt == "ndjson" else iter_csv(rows)
+    return gzip_chunks(chunks) if gzip else chunks
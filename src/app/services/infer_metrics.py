@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+
+from app.core.metrics import registry
+from app.services.capacity import capacity
+
+# etapas do loop do WS de inferência, na ordem em que acontecem
+STAGES = ("receive", "decode", "gate", "cvt_color", "pose", "rom", "analyzer", "send")
+
+stage_seconds = registry.histogram(
+    "fisio_infer_stage_seconds",
+    "Tempo de cada etapa do loop de inferência (receive é espera pelo cliente)",
+    ("stage",),
+)
+frames_total = registry.counter("fisio_infer_frames_total", "Frames recebidos no WS de inferência")
+frames_dropped_total = registry.counter(
+    "fisio_infer_frames_dropped_total", "Frames sem métrica válida, por motivo", ("reason",)
+)
+inference_skipped_total = registry.counter(
+    "fisio_infer_skipped_total", "Frames atendidos sem rodar o pose, por motivo", ("reason",)
+)
+
+registry.gauge(
+    "fisio_infer_active_sessions",
+    "Sessões de inferência ativas neste worker",
+    lambda: capacity.occupancy()["active_sessions"],
+)
+registry.gauge(
+    "fisio_infer_queued_sessions",
+    "Sessões aguardando admissão",
+    lambda: capacity.occupancy()["queued"],
+)
+registry.gauge(
+    "fisio_infer_fps", "Frames/s somados das sessões ativas (média móvel)", capacity.total_fps
+)
+registry.gauge(
+    "fisio_infer_cpu_utilization",
+    "Carga estimada de inferência / orçamento de CPU do worker",
+    capacity.utilization,
+)
+registry.gauge(
+    "fisio_infer_rejected_sessions_total",
+    "Sessões recusadas pela admissão",
+    lambda: capacity.rejected,
+    kind="counter",
+)
+
+
+class StageTimer:
+    """Cronômetro de voltas: lap(stage) mede desde a volta anterior (~1 µs por chamada)."""
+
+    __slots__ = ("_t",)
+
+    def __init__(self) -> None:
+        self._t = time.perf_counter()
+
+    def reset(self) -> None:
+        self._t = time.perf_counter()
+
+    def lap(self, stage: str) -> float:
+        now = time.perf_counter()
+        dt = now - self._t
+        self._t = now
+        stage_seconds.observe(dt, stage=stage)
+        return dt
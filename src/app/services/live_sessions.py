@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.logging import log_event
+from app.services.event_bus import event_bus, live_topic
+
+logger = logging.getLogger("app.live")
+
+# tópicos do broker: snapshot de cada worker e pedidos de encerramento
+WORKERS_TOPIC = "ops:workers"
+CONTROL_TOPIC = "ops:control"
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# janela das latências (p95) e dos instantes usados no fps
+LATENCY_WINDOW = 200
+RATE_WINDOW_S = 5.0
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # nearest-rank, como o loop_monitor
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+class _Rate:
+    """Eventos por segundo nos últimos RATE_WINDOW_S."""
+
+    def __init__(self) -> None:
+        self._times: deque[float] = deque()
+
+    def hit(self, now: float) -> None:
+        self._times.append(now)
+        while self._times and now - self._times[0] > RATE_WINDOW_S:
+            self._times.popleft()
+
+    def per_s(self, now: float) -> float:
+        while self._times and now - self._times[0] > RATE_WINDOW_S:
+            self._times.popleft()
+        if len(self._times) < 2:
+            return 0.0
+        # o intervalo até agora conta: sessão parada tende a 0
+        return (len(self._times) - 1) / max(now - self._times[0], 1e-6)
+
+
+class LiveSession:
+    """
+    Estado de uma sessão do WS de inferência enquanto ela roda neste worker.
+    Atualizado pelo loop de frames (só no event loop, sem lock) e lido pelo snapshot.
+    """
+
+    def __init__(
+        self, session_id: str, patient_user_id: str, user_id: str, analysis_kind: str
+    ) -> None:
+        self.session_id = session_id
+        self.patient_user_id = patient_user_id
+        self.user_id = user_id
+        self.analysis_kind = analysis_kind
+        self.connected_at = datetime.utcnow()
+        self._started = time.monotonic()
+        self.task = asyncio.current_task()
+        self._loop = asyncio.get_running_loop()
+        self.frames_in = 0
+        self.frames_out = 0
+        self.dropped: dict[str, int] = {}
+        self._rate_in = _Rate()
+        self._rate_out = _Rate()
+        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._latency_sum_ms = 0.0
+        self._latency_n = 0
+        self._recv_wait_ms: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._frame_bytes = 0
+        self._decoded_bytes = 0
+        self.killed: str | None = None
+
+    def frame_in(self, frame_bytes: int, recv_wait_s: float) -> None:
+        self.frames_in += 1
+        self._rate_in.hit(time.monotonic())
+        self._frame_bytes = frame_bytes
+        self._recv_wait_ms.append(recv_wait_s * 1000)
+
+    def decoded(self, nbytes: int) -> None:
+        self._decoded_bytes = nbytes
+
+    def processed(self, elapsed_s: float) -> None:
+        ms = elapsed_s * 1000
+        self._latencies_ms.append(ms)
+        self._latency_sum_ms += ms
+        self._latency_n += 1
+
+    def frame_out(self) -> None:
+        self.frames_out += 1
+        self._rate_out.hit(time.monotonic())
+
+    def drop(self, reason: str) -> None:
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+
+    def kill(self, reason: str) -> None:
+        """Cancela a task do WS; o handler fecha o socket e finaliza a sessão."""
+        self.killed = reason
+        if self.task is not None:
+            # pode vir de outra thread (endpoint sync, testes): cancela no loop da sessão
+            self._loop.call_soon_threadsafe(self.task.cancel)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        latencies = list(self._latencies_ms)
+        topic = live_topic(self.session_id)
+        return {
+            "session_id": self.session_id,
+            "patient_user_id": self.patient_user_id,
+            "user_id": self.user_id,
+            "analysis_kind": self.analysis_kind,
+            "worker": WORKER_ID,
+            "connected_at": self.connected_at.isoformat(),
+            "age_s": round(now - self._started, 1),
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "fps_in": round(self._rate_in.per_s(now), 2),
+            "fps_out": round(self._rate_out.per_s(now), 2),
+            "latency_ms_avg": (
+                round(self._latency_sum_ms / self._latency_n, 2) if self._latency_n else None
+            ),
+            "latency_ms_p95": round(_percentile(latencies, 0.95), 2) if latencies else None,
+            "dropped": dict(self.dropped),
+            "dropped_total": sum(self.dropped.values()),
+            # o WS processa um frame por vez: o que sobra fica no socket, e receive
+            # voltando na hora (espera ~0) indica cliente à frente do servidor
+            "recv_wait_ms_avg": (
+                round(sum(self._recv_wait_ms) / len(self._recv_wait_ms), 2)
+                if self._recv_wait_ms
+                else None
+            ),
+            "observers": event_bus.subscriber_count(topic),
+            "observer_queue_depth": event_bus.queue_depth(topic),
+            # estimativa: buffers do último frame (JPEG + BGR decodificado); o modelo de pose não entra
+            "memory_bytes": self._frame_bytes + self._decoded_bytes,
+            "killed": self.killed,
+        }
+
+
+class LiveSessionRegistry:
+    """
+    Sessões de inferência ativas deste worker, mais o último snapshot de cada
+    outro worker (publicado pelo event broker a cada `publish_interval_s`).
+
+    Cada worker publica um evento por sessão e, por último, a lista de ids ativos:
+    um evento com todas as sessões passaria do limite do NOTIFY (~550 B cada)
+    e o broker o descartaria. Quem recebe junta as sessões pela lista.
+    """
+
+    def __init__(self, publish_interval_s: float) -> None:
+        self.publish_interval_s = publish_interval_s
+        self._lock = threading.Lock()
+        self._sessions: dict[str, LiveSession] = {}
+        # worker -> (recebido em, ids ativos); worker -> session_id -> snapshot
+        self._workers: dict[str, tuple[float, list[str]]] = {}
+        self._remote: dict[str, dict[str, dict]] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, live: LiveSession) -> LiveSession:
+        with self._lock:
+            self._sessions[live.session_id] = live
+        return live
+
+    def unregister(self, live: LiveSession) -> None:
+        with self._lock:
+            if self._sessions.get(live.session_id) is live:
+                del self._sessions[live.session_id]
+
+    def get(self, session_id: str) -> LiveSession | None:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def local_snapshot(self) -> list[dict]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [s.snapshot() for s in sessions]
+
+    def snapshot(self) -> dict:
+        """Este worker (ao vivo) + os outros (último snapshot recebido, se recente)."""
+        now = time.monotonic()
+        stale_s = 3 * self.publish_interval_s
+        local = self.local_snapshot()
+        workers = [{"worker": WORKER_ID, "sessions": len(local), "age_s": 0.0}]
+        sessions = list(local)
+        remote = []
+        with self._lock:
+            for w, (at, ids) in self._workers.items():
+                if w == WORKER_ID or now - at > stale_s:
+                    continue
+                snaps = self._remote.get(w, {})
+                remote.append((w, at, [snaps[sid] for sid in ids if sid in snaps]))
+        for worker, at, items in remote:
+            workers.append({"worker": worker, "sessions": len(items), "age_s": round(now - at, 1)})
+            sessions.extend(items)
+        sessions.sort(key=lambda s: s["latency_ms_p95"] or 0.0, reverse=True)
+        return {"workers": workers, "sessions": sessions}
+
+    def _kill_local(self, session_id: str, reason: str) -> bool:
+        live = self.get(session_id)
+        if live is None:
+            return False
+        log_event(
+            logger, logging.WARNING, "live_session_killed", session_id=session_id, reason=reason
+        )
+        live.kill(reason)
+        return True
+
+    def kill(self, session_id: str, reason: str) -> bool:
+        """Encerra a sessão se ela roda aqui (True); senão pede aos outros workers."""
+        if self._kill_local(session_id, reason):
+            return True
+        event_bus.publish(
+            {"type": "kill", "session_id": session_id, "reason": reason, "from": WORKER_ID},
+            CONTROL_TOPIC,
+        )
+        return False
+
+    def _handle(self, event: dict) -> None:
+        worker = event.get("worker")
+        if event.get("type") == "session" and worker != WORKER_ID:
+            with self._lock:
+                snap = event["session"]
+                self._remote.setdefault(worker, {})[snap["session_id"]] = snap
+        elif event.get("type") == "worker" and worker != WORKER_ID:
+            ids = event.get("session_ids", [])
+            with self._lock:
+                self._workers[worker] = (time.monotonic(), ids)
+                # sessões que terminaram naquele worker
+                snaps = self._remote.get(worker, {})
+                self._remote[worker] = {sid: snaps[sid] for sid in ids if sid in snaps}
+        elif event.get("type") == "kill" and event.get("from") != WORKER_ID:
+            self._kill_local(event["session_id"], event.get("reason") or "")
+
+    def publish(self) -> None:
+        local = self.local_snapshot()
+        for snap in local:
+            event_bus.publish(
+                {"type": "session", "worker": WORKER_ID, "session": snap}, WORKERS_TOPIC
+            )
+        # por último: chega depois das sessões (o broker mantém a ordem)
+        event_bus.publish(
+            {
+                "type": "worker",
+                "worker": WORKER_ID,
+                "session_ids": [s["session_id"] for s in local],
+            },
+            WORKERS_TOPIC,
+        )
+
+    async def _run(self) -> None:
+        sub = event_bus.subscribe(WORKERS_TOPIC, CONTROL_TOPIC)
+        try:
+            next_publish = 0.0
+            while True:
+                now = time.monotonic()
+                if now >= next_publish:
+                    self.publish()
+                    next_publish = now + self.publish_interval_s
+                event = await sub.get(timeout=max(0.0, next_publish - time.monotonic()))
+                if event is not None:
+                    self._handle(event)
+        finally:
+            sub.close()
+
+    def start(self) -> None:
+        """Chamado de dentro do event loop (lifespan)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="live-sessions")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+live_sessions = LiveSessionRegistry(publish_interval_s=settings.live_sessions_publish_s)
+
+
+def start_live_sessions() -> None:
+    live_sessions.start()
+
+
+async def stop_live_sessions() -> None:
+    await live_sessions.stop()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+
+from app.core.config import settings
+from app.core.logging import log_event, request_id_ctx, session_id_ctx
+from app.core.metrics import registry
+
+logger = logging.getLogger("app.loop")
+
+# amostras recentes usadas nos percentis (100 ms de intervalo => ~1 min)
+WINDOW = 600
+QUANTILES = (0.5, 0.95, 0.99)
+MAX_STACK_FRAMES = 30
+
+loop_lag_seconds = registry.histogram(
+    "fisio_event_loop_lag_seconds", "Atraso do event loop em acordar uma task agendada"
+)
+loop_stalls_total = registry.counter(
+    "fisio_event_loop_stalls_total", "Travamentos do event loop acima do limite"
+)
+
+
+# rótulos por task (ex.: session_id), lidos pelo watchdog de outra thread
+_task_labels: weakref.WeakKeyDictionary[asyncio.Task, dict] = weakref.WeakKeyDictionary()
+_labels_lock = threading.Lock()
+
+
+def tag_task(**labels: str) -> None:
+    """Rotula a task atual; aparece no log quando ela travar o loop."""
+    task = asyncio.current_task()
+    if task is None:
+        return
+    with _labels_lock:
+        _task_labels.setdefault(task, {}).update(labels)
+
+
+def task_labels(task: asyncio.Task) -> dict:
+    """Rótulos de `task` (seguro a partir de outra thread)."""
+    with _labels_lock:
+        return dict(_task_labels.get(task, {}))
+
+
+def _task_context(task: asyncio.Task | None) -> dict:
+    if task is None:
+        return {}
+    out = {"task": task.get_name(), **task_labels(task)}
+    # Task.get_context() só existe a partir do 3.12 (o Context é imutável: leitura segura)
+    if hasattr(task, "get_context"):
+        ctx = task.get_context()
+        out.setdefault("request_id", ctx.get(request_id_ctx))
+        out.setdefault("session_id", ctx.get(session_id_ctx))
+    return out
+
+
+class LoopMonitor:
+    """
+    Mede continuamente o atraso de agendamento do event loop e denuncia quem o trava.
+
+    Uma task dorme `interval_s` e mede quanto acordou atrasada (o lag). Um
+    watchdog numa thread separada confere o último batimento dessa task: se o
+    loop passou de `threshold_s` sem rodar, captura a pilha da thread do loop
+    naquele instante (o código síncrono que está bloqueando) e loga junto com a
+    sessão da task em execução. Um travamento gera um log só.
+    """
+
+    def __init__(self, interval_s: float, threshold_s: float, window: int = WINDOW) -> None:
+        self.interval_s = interval_s
+        self.threshold_s = threshold_s
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._heartbeat = time.perf_counter()
+        self._reported = False
+        self.stalls = 0
+
+    def start(self) -> None:
+        """Chamado de dentro do event loop (lifespan)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._run(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval_s)
+            now = time.perf_counter()
+            self.record(max(0.0, now - start - self.interval_s))
+            self._heartbeat = now
+            self._reported = False
+
+    def record(self, lag_s: float) -> None:
+        loop_lag_seconds.observe(lag_s)
+        with self._lock:
+            self._samples.append(lag_s)
+
+    def _watch(self) -> None:
+        poll_s = max(0.01, min(self.interval_s, self.threshold_s / 2))
+        while not self._stop.wait(poll_s):
+            stalled_s = time.perf_counter() - self._heartbeat - self.interval_s
+            if stalled_s >= self.threshold_s and not self._reported:
+                self._reported = True
+                self.report_stall(stalled_s)
+
+    def report_stall(self, stalled_s: float) -> None:
+        self.stalls += 1
+        loop_stalls_total.inc()
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=MAX_STACK_FRAMES)) if frame else ""
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        log_event(
+            logger,
+            logging.WARNING,
+            "event_loop_stall",
+            stalled_ms=round(stalled_s * 1000, 1),
+            **_task_context(task),
+            stack="\n" + stack.rstrip(),
+        )
+
+    def percentiles(self) -> dict[float, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {q: 0.0 for q in QUANTILES}
+        # nearest-rank
+        return {
+            q: samples[min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))]
+            for q in QUANTILES
+        }
+
+    def snapshot(self) -> dict:
+        p = self.percentiles()
+        with self._lock:
+            lag_max = max(self._samples, default=0.0)
+            n = len(self._samples)
+        return {
+            "running": self._task is not None,
+            "samples": n,
+            "lag_ms_p50": round(p[0.5] * 1000, 2),
+            "lag_ms_p95": round(p[0.95] * 1000, 2),
+            "lag_ms_p99": round(p[0.99] * 1000, 2),
+            "lag_ms_max": round(lag_max * 1000, 2),
+            "threshold_ms": self.threshold_s * 1000,
+            "stalls_total": self.stalls,
+        }
+
+
+loop_monitor = LoopMonitor(
+    interval_s=settings.loop_monitor_interval_ms / 1000,
+    threshold_s=settings.loop_lag_threshold_ms / 1000,
+)
+
+registry.gauge(
+    "fisio_event_loop_lag_recent_seconds",
+    "Percentis do atraso do event loop na janela recente",
+    lambda: {(str(q),): v for q, v in loop_monitor.percentiles().items()},
+    ("quantile",),
+)
+
+
+def start_loop_monitor() -> None:
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+
+
+async def stop_loop_monitor() -> None:
+    await loop_monitor.stop()
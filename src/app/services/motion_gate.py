@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+# thumbnail em cinza usado na comparação (largura, altura)
+THUMB_SIZE = (32, 24)
+EWMA_ALPHA = 0.2
+
+
+class MotionGate:
+    """
+    Decide, antes do infer_keypoints, se o frame mudou o bastante para valer a
+    inferência. Compara um thumbnail 32x24 em cinza com o do último frame
+    inferido (não com o anterior, para uma deriva lenta não passar despercebida).
+
+    - threshold: diferença média absoluta (0..255) abaixo da qual o frame é pulado;
+      0 desativa o gate;
+    - max_skip: força uma inferência depois de tantos frames pulados seguidos.
+    """
+
+    def __init__(self, threshold: float, max_skip: int) -> None:
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.frames = 0
+        self.skipped = 0
+        self.infer_ms: float | None = None
+        self._ref: np.ndarray | None = None
+        self._streak = 0
+
+    @staticmethod
+    def thumbnail(bgr: np.ndarray) -> np.ndarray:
+        small = cv2.resize(bgr, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    def should_infer(self, bgr: np.ndarray) -> bool:
+        self.frames += 1
+        if self.threshold <= 0:
+            return True
+
+        thumb = self.thumbnail(bgr)
+        if (
+            self._ref is not None
+            and self._streak < self.max_skip
+            and float(np.abs(thumb - self._ref).mean()) < self.threshold
+        ):
+            self._streak += 1
+            self.skipped += 1
+            return False
+
+        self._ref = thumb
+        self._streak = 0
+        return True
+
+    def record_inference(self, elapsed_s: float) -> None:
+        ms = elapsed_s * 1000
+        self.infer_ms = (
+            ms if self.infer_ms is None else (1 - EWMA_ALPHA) * self.infer_ms + EWMA_ALPHA * ms
+        )
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "puladas": self.skipped,
+            "taxa_pulo": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "economia_ms": round(self.skipped * (self.infer_ms or 0.0), 1),
+        }
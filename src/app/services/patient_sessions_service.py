@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
+from app.db.pagination import Page, keyset_page
 from app.models.assignment import Assignment
 from app.models.exercise import Exercise
 from app.models.session import Session as SessionModel
@@ -55,14 +56,16 @@ def create_session_for_patient(
     return s
 
 
-def list_sessions_for_patient(db: DBSession, user: User, patient_id: str) -> list[SessionModel]:
+def list_sessions_for_patient(
+    db: DBSession,
+    user: User,
+    patient_id: str,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page:
     # PRO vê qualquer; PATIENT só vê o próprio
     if user.role == "PATIENT" and user.id != patient_id:
         raise BadRequestError("Sem permissão")
 
-    sessions = (
-        db.execute(select(SessionModel).where(SessionModel.patient_user_id == patient_id))
-        .scalars()
-        .all()
-    )
-    return sessions
+    q = select(SessionModel).where(SessionModel.patient_user_id == patient_id)
+    return keyset_page(db, q, SessionModel.created_at, SessionModel.id, cursor, limit)
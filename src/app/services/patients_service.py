@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session as DBSession
 
 from app.core.security import hash_password
+from app.db.pagination import Page, keyset_page
 from app.models.user import User
 
 
@@ -32,15 +33,9 @@ def create_patient(db: DBSession, name: str, email: str, password: str) -> User:
     return patient
 
 
-def list_patients(db: DBSession, skip: int = 0, limit: int = 50) -> list[User]:
-    q = (
-        select(User)
-        .where(User.role == "PATIENT")
-        .order_by(User.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return db.execute(q).scalars().all()
+def list_patients(db: DBSession, cursor: str | None = None, limit: int | None = None) -> Page:
+    q = select(User).where(User.role == "PATIENT")
+    return keyset_page(db, q, User.created_at, User.id, cursor, limit)
 
 
 def get_patient(db: DBSession, patient_id: str) -> User:
@@ -0,0 +1,211 @@
+# NOTE: Mediapipe é dependência opcional e pode não existir no ambiente.
+# Por isso, carregamos runtime sob demanda para não impedir a API de subir.
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.pose_logic import ANKLE_R, HIP_R, KNEE_R
+
+try:
+    import mediapipe as mp
+except ModuleNotFoundError:  # mediapipe não instalado
+    mp = None
+
+N_LANDMARKS = 33  # BlazePose
+BACKENDS = ("mediapipe", "synthetic")
+
+# custo relativo dos modelos (lite/full/heavy), usado pelo backend sintético
+COMPLEXITY_COST = (0.5, 1.0, 2.5)
+
+
+class PoseBackend(ABC):
+    """Interface atrás do PoseRuntime: RGB -> keypoints [[x, y, vis], ...] (0..1) ou None."""
+
+    name = ""
+
+    @abstractmethod
+    def process(self, rgb: np.ndarray) -> list[list[float]] | None: ...
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MediaPipeBackend(PoseBackend):
+    name = "mediapipe"
+
+    def __init__(self, model_complexity: int = 1) -> None:
+        if mp is None:
+            raise RuntimeError(
+                "Dependência opcional ausente: 'mediapipe'. " "Instale com: pip install mediapipe"
+            )
+        self._mp_pose = mp.solutions.pose
+        self.model_complexity = model_complexity
+        self._pose = self._build(model_complexity)
+
+    def _build(self, model_complexity: int):
+        return self._mp_pose.Pose(
+            static_image_mode=False,
+            model_complexity=model_complexity,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+        )
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        """Perde o tracking atual."""
+        if model_complexity == self.model_complexity:
+            return
+        self._pose.close()
+        self._pose = self._build(model_complexity)
+        self.model_complexity = model_complexity
+
+    def process(self, rgb: np.ndarray) -> list[list[float]] | None:
+        res = self._pose.process(rgb)
+        if not res.pose_landmarks:
+            return None
+        return [
+            [float(lm.x), float(lm.y), float(lm.visibility)] for lm in res.pose_landmarks.landmark
+        ]
+
+    def close(self) -> None:
+        self._pose.close()
+
+
+def knee_angle_at(t_s: float, min_deg: float, max_deg: float, period_s: float) -> float:
+    """
+    Extensão de joelho sentado: começa flexionado (min_deg), estende até max_deg e
+    volta, num ciclo cosseno de `period_s`, com uma pausa curta em cada extremo.
+    """
+    phase = (t_s % period_s) / period_s
+    # 10% parado em cada extremo, 40% subindo, 40% descendo
+    if phase < 0.1:
+        x = 0.0
+    elif phase < 0.5:
+        x = (1 - math.cos(math.pi * (phase - 0.1) / 0.4)) / 2
+    elif phase < 0.6:
+        x = 1.0
+    else:
+        x = (1 + math.cos(math.pi * (phase - 0.6) / 0.4)) / 2
+    return min_deg + (max_deg - min_deg) * x
+
+
+class SyntheticPoseBackend(PoseBackend):
+    """
+    Pose determinística de uma extensão de joelho, sem olhar para o frame.
+
+    Com `fps` o relógio anda 1/fps por chamada, então a mesma semente gera
+    sempre a mesma sequência (testes, benchmark offline); com fps=None segue o
+    tempo real, que é o que o WS precisa quando o motion gate ou a decimação
+    pulam chamadas. Ruído gaussiano nas coordenadas,
+    quedas (sem pessoa) com probabilidade `dropout` e um custo de CPU simulado
+    de `cost_ms` por frame (escala com o model_complexity, como o BlazePose).
+    """
+
+    name = "synthetic"
+
+    # corpo sentado, lado direito visto de perfil (coordenadas normalizadas)
+    THIGH = 0.15
+    SHANK = 0.17
+    HIP = (0.42, 0.55)
+
+    def __init__(
+        self,
+        model_complexity: int = 1,
+        fps: float | None = 10.0,
+        period_s: float = 3.0,
+        min_deg: float = 85.0,
+        max_deg: float = 178.0,
+        noise: float = 0.0,
+        dropout: float = 0.0,
+        cost_ms: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.model_complexity = model_complexity
+        self.fps = fps
+        self.period_s = period_s
+        self.min_deg = min_deg
+        self.max_deg = max_deg
+        self.noise = noise
+        self.dropout = dropout
+        self.cost_ms = cost_ms
+        self.frame = 0
+        self._t0 = time.monotonic()
+        self._rng = random.Random(seed)
+        self._base = self._static_body()
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        self.model_complexity = model_complexity
+
+    def _static_body(self) -> list[list[float]]:
+        # pontos que não mexem: tronco em pé sobre o quadril, cabeça acima
+        hx, hy = self.HIP
+        kps = [[hx, hy - 0.30, 0.95] for _ in range(N_LANDMARKS)]
+        for i in range(11):  # rosto
+            kps[i] = [hx + 0.02 * (i % 3), hy - 0.42, 0.9]
+        for i in (11, 12):  # ombros
+            kps[i] = [hx + 0.01 * (i - 11), hy - 0.30, 0.95]
+        for i in (23, 24):  # quadris
+            kps[i] = [hx, hy, 0.95]
+        return kps
+
+    def _burn(self) -> None:
+        # ocupa a CPU como a inferência real (sleep liberaria o event loop/GIL)
+        cost_s = self.cost_ms * COMPLEXITY_COST[max(0, min(self.model_complexity, 2))] / 1000
+        end = time.perf_counter() + cost_s
+        while time.perf_counter() < end:
+            pass
+
+    def keypoints_at(self, t_s: float) -> list[list[float]]:
+        theta = math.radians(knee_angle_at(t_s, self.min_deg, self.max_deg, self.period_s))
+        hx, hy = self.HIP
+        knee = (hx + self.THIGH, hy)
+        # ângulo no joelho entre joelho->quadril (-1, 0) e joelho->tornozelo
+        ankle = (knee[0] - self.SHANK * math.cos(theta), knee[1] + self.SHANK * math.sin(theta))
+        kps = [list(p) for p in self._base]
+        kps[HIP_R] = [hx, hy, 0.95]
+        kps[KNEE_R] = [knee[0], knee[1], 0.95]
+        kps[ANKLE_R] = [ankle[0], ankle[1], 0.9]
+        # perna esquerda (atrás, meio encoberta) acompanha a direita
+        kps[KNEE_R - 1] = [knee[0], knee[1], 0.6]
+        kps[ANKLE_R - 1] = [ankle[0], ankle[1], 0.5]
+        if self.noise > 0:
+            gauss = self._rng.gauss
+            for p in kps:
+                p[0] += gauss(0.0, self.noise)
+                p[1] += gauss(0.0, self.noise)
+        return kps
+
+    def process(self, rgb: np.ndarray) -> list[list[float]] | None:
+        t_s = self.frame / self.fps if self.fps else time.monotonic() - self._t0
+        self.frame += 1
+        if self.cost_ms > 0:
+            self._burn()
+        if self.dropout > 0 and self._rng.random() < self.dropout:
+            return None
+        return self.keypoints_at(t_s)
+
+
+def create_pose_backend(name: str, model_complexity: int = 1) -> PoseBackend:
+    if name == "mediapipe":
+        return MediaPipeBackend(model_complexity)
+    if name == "synthetic":
+        return SyntheticPoseBackend(
+            model_complexity,
+            fps=settings.synthetic_pose_fps or None,
+            period_s=settings.synthetic_pose_period_s,
+            noise=settings.synthetic_pose_noise,
+            dropout=settings.synthetic_pose_dropout,
+            cost_ms=settings.synthetic_pose_cost_ms,
+            seed=settings.synthetic_pose_seed,
+        )
+    raise ValueError(f"pose_backend inválido: {name} (use {', '.join(BACKENDS)})")
@@ -1,46 +1,45 @@
-# NOTE: Mediapipe é dependência opcional e pode não existir no ambiente.
-# Por isso, carregamos runtime sob demanda para não impedir a API de subir.
-
 from __future__ import annotations
 
 import cv2
 import numpy as np
 
-try:
-    import mediapipe as mp
-except ModuleNotFoundError:  # mediapipe não instalado
-    mp = None
+from app.core.config import settings
+from app.services.pose_backends import PoseBackend, create_pose_backend
 
 
 class PoseRuntime:
-    def __init__(self):
-        if mp is None:
-            raise RuntimeError(
-                "Dependência opcional ausente: 'mediapipe'. " "Instale com: pip install mediapipe"
-            )
-        self._mp_pose = mp.solutions.pose
-        self._pose = self._mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            enable_segmentation=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-
-    def infer_keypoints(self, bgr: np.ndarray) -> list[list[float]] | None:
-        """Retorna lista de keypoints [[x,y,vis], ...] normalizados (0..1) ou None."""
+    """
+    Decodifica o frame e roda o backend de pose configurado (POSE_BACKEND):
+    "mediapipe" (BlazePose) ou "synthetic" (benchmarks/CI sem mediapipe).
+    """
+
+    def __init__(self, model_complexity: int = 1, backend: PoseBackend | None = None):
+        self.model_complexity = model_complexity
+        self.backend = backend or create_pose_backend(settings.pose_backend, model_complexity)
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        """Troca o modelo (0 = lite, 1 = full, 2 = heavy). Perde o tracking atual."""
+        if model_complexity == self.model_complexity:
+            return
+        self.backend.set_model_complexity(model_complexity)
+        self.model_complexity = model_complexity
+
+    def infer_keypoints(self, bgr: np.ndarray, timer=None) -> list[list[float]] | None:
+        """
+        Retorna lista de keypoints [[x,y,vis], ...] normalizados (0..1) ou None.
+        timer (StageTimer, opcional) separa o tempo de cvtColor e de Pose.process.
+        """
         rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-        res = self._pose.process(rgb)
-        if not res.pose_landmarks:
-            return None
-        kps = []
-        for lm in res.pose_landmarks.landmark:
-            x = float(lm.x)  # 0..1
-            y = float(lm.y)  # 0..1
-            v = float(lm.visibility)
-            kps.append([x, y, v])
+        if timer is not None:
+            timer.lap("cvt_color")
+        kps = self.backend.process(rgb)
+        if timer is not None:
+            timer.lap("pose")
         return kps
 
+    def close(self) -> None:
+        self.backend.close()
+
     @staticmethod
     def decode_jpeg(jpeg_bytes: bytes) -> np.ndarray | None:
         arr = np.frombuffer(jpeg_bytes, np.uint8)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from types import CodeType, FrameType
+
+from app.core.config import settings
+from app.services.loop_monitor import task_labels
+
+MAX_STACK_DEPTH = 64
+# pilhas distintas guardadas; as novas depois disso caem num balde só
+MAX_STACKS = 5000
+TRUNCATED = "[pilhas demais]"
+# durante o perfil: sem isso a thread de amostragem só pega o GIL quando o loop
+# o solta por conta própria (select, I/O), e as amostras caem quase todas ali
+SWITCH_INTERVAL_S = 0.0005
+
+
+class ProfilerBusyError(Exception):
+    """Já existe um perfil rodando neste worker."""
+
+
+def _frame_label(code: CodeType) -> str:
+    # agrega por função (linha da definição), como o py-spy
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack_codes(frame: FrameType) -> tuple[CodeType, ...]:
+    codes = []
+    f: FrameType | None = frame
+    while f is not None and len(codes) < MAX_STACK_DEPTH:
+        codes.append(f.f_code)
+        f = f.f_back
+    codes.reverse()  # raiz -> folha
+    return tuple(codes)
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem, sem instrumentar o código: uma thread lê
+    sys._current_frames() a cada `interval_s` e conta as pilhas das threads que
+    estão trabalhando para o alvo (`matcher(thread_id, codes)`). O custo fica
+    limitado pelo intervalo, pela profundidade e pelo número de pilhas distintas.
+    """
+
+    def __init__(
+        self,
+        matcher: Callable[[int, tuple[CodeType, ...]], bool],
+        interval_s: float,
+    ) -> None:
+        self.matcher = matcher
+        self.interval_s = interval_s
+        self.stacks: Counter[tuple[CodeType, ...]] = Counter()
+        self.ticks = 0
+        self.samples = 0
+        self.truncated = 0
+        self.sampling_s = 0.0  # CPU gasta pela própria amostragem
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            t0 = time.perf_counter()
+            self.sample(exclude=me)
+            self.sampling_s += time.perf_counter() - t0
+
+    def sample(self, exclude: int | None = None) -> None:
+        self.ticks += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude:
+                continue
+            codes = _stack_codes(frame)
+            if not self.matcher(thread_id, codes):
+                continue
+            self.samples += 1
+            # guarda só os code objects; o texto é montado uma vez no fim
+            if codes in self.stacks or len(self.stacks) < MAX_STACKS:
+                self.stacks[codes] += 1
+            else:
+                self.truncated += 1
+
+    def collapsed(self) -> str:
+        """Formato "folded" do flamegraph.pl / speedscope: `a;b;c contagem` por linha."""
+        labels: dict[CodeType, str] = {}
+        lines = []
+        for codes, n in self.stacks.most_common():
+            names = [labels.get(c) or labels.setdefault(c, _frame_label(c)) for c in codes]
+            lines.append(f"{';'.join(names)} {n}\n")
+        if self.truncated:
+            lines.append(f"{TRUNCATED} {self.truncated}\n")
+        return "".join(lines)
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "overhead_ms": round(self.sampling_s * 1000, 1),
+        }
+
+
+def session_matcher(loop: asyncio.AbstractEventLoop, loop_thread_id: int, session_id: str):
+    """A inferência roda no event loop: conta o loop quando a task da sessão está rodando."""
+
+    def _match(thread_id: int, codes: tuple[CodeType, ...]) -> bool:
+        if thread_id != loop_thread_id:
+            return False
+        task = asyncio.current_task(loop)
+        return task is not None and task_labels(task).get("session_id") == session_id
+
+    return _match
+
+
+def code_matcher(endpoint_codes: set[CodeType]):
+    """Rota: qualquer thread (loop ou threadpool) com o endpoint na pilha."""
+
+    def _match(thread_id: int, codes: tuple[CodeType, ...]) -> bool:
+        return not endpoint_codes.isdisjoint(codes)
+
+    return _match
+
+
+_active_lock = threading.Lock()
+_active: SamplingProfiler | None = None
+
+
+async def run_profile(
+    matcher: Callable[[int, tuple[CodeType, ...]], bool],
+    seconds: float,
+    interval_s: float | None = None,
+) -> SamplingProfiler:
+    """Amostra por `seconds` sem bloquear o loop. Um perfil por worker de cada vez."""
+    global _active
+    profiler = SamplingProfiler(matcher, interval_s or settings.profiling_interval_ms / 1000)
+    with _active_lock:
+        if _active is not None:
+            raise ProfilerBusyError("Já existe um perfil em andamento neste worker.")
+        _active = profiler
+    switch_interval = sys.getswitchinterval()
+    try:
+        sys.setswitchinterval(min(switch_interval, SWITCH_INTERVAL_S))
+        profiler.start()
+        await asyncio.sleep(min(seconds, settings.profiling_max_seconds))
+    finally:
+        profiler.stop()
+        sys.setswitchinterval(switch_interval)
+        with _active_lock:
+            _active = None
+    return profiler
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session as DBSession
+
+from app.db.upsert import upsert_returning
+from app.models.progress import PatientDailyProgress
+from app.models.session import Session as SessionModel
+from app.models.session import SessionSummary as SessionSummaryModel
+from app.models.user import User
+
+
+class BadRequestError(Exception):
+    pass
+
+
+BUCKETS = ("day", "week")
+MAX_RANGE_DAYS = 366
+
+
+def _lock_rollup_key(db: DBSession, patient_id: str, day: date) -> None:
+    """
+    Serializa quem recalcula o mesmo (patient, day) até o fim da transação.
+
+    Sem isso, duas sessões do dia finalizando juntas agregam sem ver o summary
+    ainda não commitado da outra, e o segundo upsert sobrescreve o total do primeiro.
+    No Postgres é um advisory lock da transação; o SQLite já tem um escritor só
+    (o upsert do summary pega a trava de escrita antes de chegar aqui).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        key = f"rollup:{patient_id}:{day.isoformat()}"
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+
+def refresh_daily_rollup(db: DBSession, patient_id: str, day: date) -> None:
+    """
+    Recalcula a linha (patient, day) do rollup a partir de sessions + session_summaries.
+
+    Só toca as sessões daquele dia, então o custo é O(sessões do dia) e o resultado
+    é idempotente (finalizar duas vezes não conta em dobro). Não faz commit: roda
+    na mesma transação que grava o summary.
+    """
+    _lock_rollup_key(db, patient_id, day)
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1)
+
+    # depois do lock: em READ COMMITTED este statement já enxerga o commit de quem esperamos
+    agg = db.execute(
+        select(
+            func.count(SessionSummaryModel.session_id),
+            func.coalesce(func.sum(SessionSummaryModel.reps), 0),
+            func.coalesce(func.sum(SessionSummaryModel.rom), 0.0),
+            func.max(SessionSummaryModel.rom),
+            func.coalesce(func.sum(SessionSummaryModel.cadence), 0.0),
+            func.count(SessionSummaryModel.cadence),
+        )
+        .join(SessionModel, SessionModel.id == SessionSummaryModel.session_id)
+        .where(
+            SessionModel.patient_user_id == patient_id,
+            SessionModel.status == "FINISHED",
+            SessionModel.started_at >= start,
+            SessionModel.started_at < end,
+        )
+    ).one()
+
+    upsert_returning(
+        db,
+        PatientDailyProgress.__table__,
+        {
+            "patient_user_id": patient_id,
+            "day": day,
+            "sessions": agg[0],
+            "reps": int(agg[1]),
+            "rom_sum": float(agg[2]),
+            "rom_max": agg[3],
+            "cadence_sum": float(agg[4]),
+            "cadence_count": agg[5],
+            "updated_at": datetime.utcnow(),
+        },
+        index_elements=["patient_user_id", "day"],
+        update_cols=[
+            "sessions",
+            "reps",
+            "rom_sum",
+            "rom_max",
+            "cadence_sum",
+            "cadence_count",
+            "updated_at",
+        ],
+    )
+
+
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())  # segunda-feira
+    return day
+
+
+def get_progress(
+    db: DBSession,
+    user: User,
+    patient_id: str,
+    date_from: date | None,
+    date_to: date | None,
+    bucket: str = "day",
+) -> list[dict]:
+    """
+    Tendências do paciente por dia ou semana, lidas só do rollup (O(dias)).
+    cadence_drift = variação da cadência média em relação ao período anterior.
+    """
+    if user.role == "PATIENT" and user.id != patient_id:
+        raise BadRequestError("Sem permissão")
+    if bucket not in BUCKETS:
+        raise BadRequestError(f"bucket inválido: {bucket}")
+
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=90)
+    if date_from > date_to:
+        raise BadRequestError("from deve ser anterior a to")
+    if (date_to - date_from).days > MAX_RANGE_DAYS:
+        raise BadRequestError(f"Intervalo máximo é de {MAX_RANGE_DAYS} dias")
+
+    rows = (
+        db.execute(
+            select(PatientDailyProgress)
+            .where(
+                PatientDailyProgress.patient_user_id == patient_id,
+                PatientDailyProgress.day >= date_from,
+                PatientDailyProgress.day <= date_to,
+                PatientDailyProgress.sessions > 0,
+            )
+            .order_by(PatientDailyProgress.day)
+        )
+        .scalars()
+        .all()
+    )
+
+    buckets: dict[date, dict] = {}
+    for r in rows:
+        b = buckets.setdefault(
+            _bucket_start(r.day, bucket),
+            {
+                "sessions": 0,
+                "reps": 0,
+                "rom_sum": 0.0,
+                "rom_max": None,
+                "cadence_sum": 0.0,
+                "cadence_count": 0,
+            },
+        )
+        b["sessions"] += r.sessions
+        b["reps"] += r.reps
+        b["rom_sum"] += r.rom_sum
+        if r.rom_max is not None:
+            b["rom_max"] = r.rom_max if b["rom_max"] is None else max(b["rom_max"], r.rom_max)
+        b["cadence_sum"] += r.cadence_sum
+        b["cadence_count"] += r.cadence_count
+
+    out = []
+    prev_cadence: float | None = None
+    for start in sorted(buckets):
+        b = buckets[start]
+        avg_cadence = b["cadence_sum"] / b["cadence_count"] if b["cadence_count"] else None
+        drift = None
+        if avg_cadence is not None and prev_cadence is not None:
+            drift = avg_cadence - prev_cadence
+        out.append(
+            {
+                "period_start": start,
+                "sessions": b["sessions"],
+                "reps": b["reps"],
+                "avg_rom": b["rom_sum"] / b["sessions"],
+                "max_rom": b["rom_max"],
+                "avg_cadence": avg_cadence,
+                "cadence_drift": drift,
+            }
+        )
+        if avg_cadence is not None:
+            prev_cadence = avg_cadence
+    return out
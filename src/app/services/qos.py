@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+
+# Degraus de qualidade, do mais caro ao mais barato. O cliente aplica fps,
+# resolução e qualidade do JPEG; o servidor aplica o model_complexity do BlazePose.
+QOS_LEVELS: list[dict] = [
+    {"fps": 15, "width": 640, "height": 480, "jpeg_quality": 85, "model_complexity": 2},
+    {"fps": 10, "width": 640, "height": 480, "jpeg_quality": 80, "model_complexity": 1},
+    {"fps": 8, "width": 480, "height": 360, "jpeg_quality": 75, "model_complexity": 1},
+    {"fps": 6, "width": 424, "height": 320, "jpeg_quality": 70, "model_complexity": 0},
+    {"fps": 4, "width": 320, "height": 240, "jpeg_quality": 60, "model_complexity": 0},
+]
+# mesmo perfil que os clientes já usavam (640x480 a ~10 fps)
+DEFAULT_LEVEL = 1
+
+EWMA_ALPHA = 0.2
+# pressão = maior entre (tempo de processamento / intervalo do fps alvo) e uso do worker
+HIGH_PRESSURE = 0.85
+LOW_PRESSURE = 0.5
+# frame já estava esperando no socket quando fomos ler: sinal de fila no servidor
+QUEUED_WAIT_S = 0.002
+QUEUED_STREAK = 3
+# tempo mínimo entre trocas (o cliente precisa de tempo para se ajustar)
+COOLDOWN_S = 2.0
+# subir de nível exige folga sustentada por mais tempo que descer
+UPGRADE_AFTER_S = 5.0
+
+
+class QosController:
+    """
+    Controle de qualidade adaptativo de uma sessão de inferência.
+
+    Recebe, a cada frame, o tempo de processamento, quanto o loop esperou pelo
+    próximo frame e a utilização do worker; devolve uma mensagem de controle
+    quando o nível muda. Desce rápido sob pressão e sobe devagar, para a vazão
+    cair de forma gradual em vez de despencar.
+    """
+
+    def __init__(self, level: int = DEFAULT_LEVEL, now: float | None = None) -> None:
+        self.level = max(0, min(level, len(QOS_LEVELS) - 1))
+        self.proc_ms: float | None = None
+        self.queued_streak = 0
+        self._changed_at = time.monotonic() if now is None else now
+        self._calm_since: float | None = None
+
+    @property
+    def params(self) -> dict:
+        return QOS_LEVELS[self.level]
+
+    def control_message(self, reason: str | None = None) -> dict:
+        msg = {"type": "control", "level": self.level, **self.params}
+        if reason:
+            msg["reason"] = reason
+        return msg
+
+    def pressure(self, worker_utilization: float = 0.0) -> float:
+        if self.proc_ms is None:
+            return worker_utilization
+        frame_budget_ms = 1000 / self.params["fps"]
+        return max(self.proc_ms / frame_budget_ms, worker_utilization)
+
+    def observe(
+        self,
+        proc_s: float,
+        waited_s: float,
+        worker_utilization: float = 0.0,
+        now: float | None = None,
+    ) -> dict | None:
+        now = time.monotonic() if now is None else now
+        proc_ms = proc_s * 1000
+        self.proc_ms = (
+            proc_ms
+            if self.proc_ms is None
+            else (1 - EWMA_ALPHA) * self.proc_ms + EWMA_ALPHA * proc_ms
+        )
+        self.queued_streak = self.queued_streak + 1 if waited_s < QUEUED_WAIT_S else 0
+
+        pressure = self.pressure(worker_utilization)
+        if pressure < LOW_PRESSURE and self.queued_streak == 0:
+            if self._calm_since is None:
+                self._calm_since = now
+        else:
+            self._calm_since = None
+
+        if now - self._changed_at < COOLDOWN_S:
+            return None
+
+        if pressure > HIGH_PRESSURE or self.queued_streak >= QUEUED_STREAK:
+            if self.level < len(QOS_LEVELS) - 1:
+                reason = "queue" if self.queued_streak >= QUEUED_STREAK else "load"
+                return self._set_level(self.level + 1, now, reason)
+        elif self._calm_since is not None and now - self._calm_since >= UPGRADE_AFTER_S:
+            if self.level > 0:
+                return self._set_level(self.level - 1, now, "headroom")
+        return None
+
+    def _set_level(self, level: int, now: float, reason: str) -> dict:
+        self.level = level
+        self._changed_at = now
+        self._calm_since = None
+        self.queued_streak = 0
+        # a média de custo era do nível anterior; recomeça a medir
+        self.proc_ms = None
+        return self.control_message(reason)
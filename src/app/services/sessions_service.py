@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, select
 from sqlalchemy.orm import Session as DBSession
 
+from app.db.upsert import update_returning, upsert_returning
 from app.models.session import Session as SessionModel
 from app.models.session import SessionSummary as SessionSummaryModel
 from app.models.user import User
+from app.services.event_bus import publish_session_status, publish_session_summary
+from app.services.progress_service import refresh_daily_rollup
 
 
 class SessionAccessError(Exception):
@@ -41,21 +44,63 @@ def start_session(db: DBSession, user: User, session_id: str) -> SessionModel:
     db.add(s)
     db.commit()
     db.refresh(s)
+    publish_session_status(s)
     return s
 
 
-def finish_session(db: DBSession, user: User, session_id: str) -> SessionModel:
+def finish_session(db: DBSession, user: User, session_id: str) -> Row:
     s = get_session(db, session_id)
     ensure_session_access(user, s)
 
-    if s.status != "FINISHED":
-        s.status = "FINISHED"
-        s.finished_at = datetime.utcnow()
-
-    db.add(s)
+    row = _mark_finished(db, session_id)
+    db.commit()
+    publish_session_status(row)
+    return row
+
+
+def _mark_finished(db: DBSession, session_id: str) -> Row | None:
+    # idempotente: se já estava FINISHED, preserva o finished_at original
+    table = SessionModel.__table__
+    row = update_returning(
+        db,
+        table,
+        table.c.id == session_id,
+        {
+            "status": "FINISHED",
+            "finished_at": func.coalesce(table.c.finished_at, datetime.utcnow()),
+        },
+    )
+    if row is not None:
+        refresh_daily_rollup(db, row.patient_user_id, row.started_at.date())
+    return row
+
+
+def _upsert_summary_row(db: DBSession, session_id: str, values: dict) -> Row:
+    return upsert_returning(
+        db,
+        SessionSummaryModel.__table__,
+        {"session_id": session_id, **values},
+        index_elements=["session_id"],
+        update_cols=list(values),
+    )
+
+
+def save_final_summary(db: DBSession, session_id: str, summary: dict | None) -> Row | None:
+    """
+    Grava o summary (se houver) e a transição para FINISHED numa única transação.
+    Usado pelo finalize e pelo fechamento do WS; seguro se os dois correrem juntos.
+    Retorna a linha atualizada da sessão.
+    """
+    summary_row = _upsert_summary_row(db, session_id, summary) if summary else None
+    row = _mark_finished(db, session_id)
     db.commit()
-    db.refresh(s)
-    return s
+
+    # eventos só depois do commit, para quem reage já ler o estado gravado
+    if row is not None:
+        if summary_row is not None:
+            publish_session_summary(row.patient_user_id, summary_row)
+        publish_session_status(row)
+    return row
 
 
 def upsert_summary(
@@ -66,32 +111,18 @@ def upsert_summary(
     rom: float,
     cadence: float | None,
     alerts: list,
-) -> SessionSummaryModel:
+) -> Row:
     s = get_session(db, session_id)
     ensure_session_access(user, s)
 
-    summary = db.execute(
-        select(SessionSummaryModel).where(SessionSummaryModel.session_id == session_id)
-    ).scalar_one_or_none()
-
-    if summary:
-        summary.reps = reps
-        summary.rom = rom
-        summary.cadence = cadence
-        summary.alerts = alerts
-    else:
-        summary = SessionSummaryModel(
-            session_id=session_id,
-            reps=reps,
-            rom=rom,
-            cadence=cadence,
-            alerts=alerts,
-        )
-        db.add(summary)
-
+    row = _upsert_summary_row(
+        db, session_id, {"reps": reps, "rom": rom, "cadence": cadence, "alerts": alerts}
+    )
+    if s.status == "FINISHED":
+        refresh_daily_rollup(db, s.patient_user_id, s.started_at.date())
     db.commit()
-    db.refresh(summary)
-    return summary
+    publish_session_summary(s.patient_user_id, row)
+    return row
 
 
 def get_summary(db: DBSession, user: User, session_id: str) -> SessionSummaryModel:
@@ -114,35 +145,11 @@ def finalize_session(
     rom: float | None,
     cadence: float | None,
     alerts: list | None,
-) -> SessionModel:
+) -> Row | None:
     s = get_session(db, session_id)
     ensure_session_access(user, s)
 
-    has_any = any(v is not None for v in [reps, rom, cadence, alerts])
-    if has_any:
-        summary = db.execute(
-            select(SessionSummaryModel).where(SessionSummaryModel.session_id == session_id)
-        ).scalar_one_or_none()
-        if not summary:
-            summary = SessionSummaryModel(
-                session_id=session_id, reps=0, rom=0.0, cadence=None, alerts=[]
-            )
-            db.add(summary)
-
-        if reps is not None:
-            summary.reps = reps
-        if rom is not None:
-            summary.rom = rom
-        if cadence is not None:
-            summary.cadence = cadence
-        if alerts is not None:
-            summary.alerts = alerts
-
-    if s.status != "FINISHED":
-        s.status = "FINISHED"
-        s.finished_at = datetime.utcnow()
-
-    db.add(s)
-    db.commit()
-    db.refresh(s)
-    return s
+    # só sobrescreve os campos enviados; os demais ficam com o default na criação
+    fields = {"reps": reps, "rom": rom, "cadence": cadence, "alerts": alerts}
+    summary = {k: v for k, v in fields.items() if v is not None}
+    return save_final_summary(db, session_id, summary)
@@ -18,6 +18,9 @@ def main():
         print("Não conseguiu abrir a webcam. Verifique se há câmera disponível.")
         return
 
+    # perfil inicial; o servidor ajusta com mensagens {"type": "control", ...}
+    qos = {"fps": 10, "width": 640, "height": 480, "jpeg_quality": 80}
+
     try:
         while True:
             ret, frame = cap.read()
@@ -25,11 +28,10 @@ def main():
                 print("Falha ao capturar frame")
                 break
 
-            # Opcional: reduzir resolução para algo próximo de 480p
-            frame = cv2.resize(frame, (640, 480))
+            frame = cv2.resize(frame, (qos["width"], qos["height"]))
 
             # Codifica em JPEG
-            ok, buf = cv2.imencode(".jpg", frame)
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, qos["jpeg_quality"]])
             if not ok:
                 print("Falha ao codificar JPEG")
                 continue
@@ -45,7 +47,10 @@ def main():
                 msg = ws.recv()
                 try:
                     data = json.loads(msg)
-                    if data.get("type") == "metrics":
+                    if data.get("type") == "control":
+                        qos.update({k: data[k] for k in qos})
+                        print("Ajuste do servidor:", qos)
+                    elif data.get("type") == "metrics":
                         print(
                             f"reps={data.get('reps')}, "
                             f"rom={data.get('rom'):.1f}, "
@@ -60,8 +65,7 @@ def main():
                 # Sem mensagem no timeout, segue o loop
                 pass
 
-            # ~10 fps
-            time.sleep(0.1)
+            time.sleep(1 / qos["fps"])
 
     finally:
         cap.release()
@@ -2,6 +2,7 @@ import os
 
 # Import do app (lembrando: seu app está em src/)
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -11,6 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
+from app.db.query_stats import capture_queries  # noqa: E402
 from app.main import app  # noqa: E402
 
 
@@ -19,3 +21,22 @@ def client():
     # Garante que DATABASE_URL existe nos testes
     assert os.getenv("DATABASE_URL"), "DATABASE_URL não definido no ambiente de teste"
     return TestClient(app)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Uso: `with query_budget(5): client.get(...)` -> falha se o bloco fizer
+    mais de 5 queries (pega N+1 e lookups novos), listando os statements.
+    """
+
+    @contextmanager
+    def _budget(max_queries: int):
+        with capture_queries() as captured:
+            yield captured
+        statements = "\n".join(f"  {s}" for s in captured.statements)
+        assert (
+            captured.count <= max_queries
+        ), f"{captured.count} queries (orçamento {max_queries}):\n{statements}"
+
+    return _budget
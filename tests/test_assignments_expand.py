@@ -0,0 +1,77 @@
+import os
+import time
+
+
+def _auth(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_list_assignments_expand_constant_queries(client, query_budget):
+    headers = _auth(client)
+    unique = time.time_ns()
+
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"exp_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+
+    for i in range(3):
+        r = client.post("/v1/exercises", json={"title": f"Exp {unique} {i}"}, headers=headers)
+        exercise_id = r.json()["id"]
+        r = client.post(
+            "/v1/assignments/configs",
+            json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {"i": i}},
+            headers=headers,
+        )
+        config_id = r.json()["id"]
+        r = client.post(
+            "/v1/assignments",
+            json={
+                "patient_user_id": patient_id,
+                "exercise_id": exercise_id,
+                "config_id": config_id,
+            },
+            headers=headers,
+        )
+        assignment_id = r.json()["id"]
+        if i > 0:
+            for _ in range(2):
+                client.post(
+                    f"/v1/patients/{patient_id}/sessions",
+                    json={"exercise_id": exercise_id, "assignment_id": assignment_id},
+                    headers=headers,
+                )
+
+    url = f"/v1/assignments?patient_user_id={patient_id}&expand=exercise,config,last_session"
+    # usuário (auth) + listagem com joins + últimas sessões, independente de N
+    with query_budget(3):
+        r = client.get(url, headers=headers)
+    assert r.status_code == 200, r.text
+    items = r.json()
+    assert len(items) == 3
+    for a in items:
+        assert a["exercise"]["id"] == a["exercise_id"]
+        assert a["config"]["id"] == a["config_id"]
+    assert sum(1 for a in items if a["last_session"] is not None) == 2
+
+    # sem expand, campos aninhados vêm nulos e nada é carregado a mais
+    r = client.get(f"/v1/assignments?patient_user_id={patient_id}", headers=headers)
+    assert r.status_code == 200, r.text
+    assert all(a["exercise"] is None and a["last_session"] is None for a in r.json())
+
+
+def test_list_assignments_rejects_unknown_expand(client):
+    headers = _auth(client)
+    r = client.get("/v1/assignments?expand=exercise,foo", headers=headers)
+    assert r.status_code == 400, r.text
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.services.capacity import CapacityExceededError, CapacityManager, capacity
+
+
+def _manager(**kw) -> CapacityManager:
+    opts = {"max_sessions": 3, "cpu_budget_ms_per_s": 450, "default_session_cost_ms_per_s": 100}
+    return CapacityManager(**{**opts, **kw})
+
+
+def test_admission_uses_measured_session_cost():
+    m = _manager()
+    a = m.try_acquire("a")
+    b = m.try_acquire("b")
+
+    # 30 ms por frame a 10 fps = 300 ms/s: a sessão "a" pesa mais que o estimado
+    for i in range(10):
+        a.record_frame(0.030, now=i * 0.1)
+    assert a.load_ms_per_s == pytest.approx(300, rel=0.01)
+
+    with pytest.raises(CapacityExceededError) as exc:
+        m.try_acquire("c")
+    assert exc.value.retry_after_s == 5
+    assert m.occupancy()["accepting"] is False
+
+    b.release()
+    m.try_acquire("c")
+    assert m.occupancy()["active_sessions"] == 2
+
+
+def test_queued_session_gets_slot_when_released():
+    m = _manager(max_sessions=1, queue_timeout_s=2, max_queue=1)
+    first = m.try_acquire("a")
+
+    async def _scenario():
+        waiter = asyncio.create_task(m.acquire("b"))
+        await asyncio.sleep(0.15)
+        assert m.occupancy()["queued"] == 1
+        # fila cheia: o terceiro é recusado na hora
+        with pytest.raises(CapacityExceededError):
+            await m.acquire("c")
+        first.release()
+        return await waiter
+
+    lease = asyncio.run(_scenario())
+    assert lease.session_id == "b"
+    assert m.occupancy()["queued"] == 0
+
+
+def test_ws_refuses_when_worker_is_full(client, monkeypatch):
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = r.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    unique = time.time_ns()
+
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"cap_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Cap {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"]},
+        headers=headers,
+    )
+    session_id = r.json()["id"]
+
+    monkeypatch.setattr(capacity, "max_sessions", 0)
+
+    r = client.get("/v1/health/capacity")
+    assert r.status_code == 503
+    assert r.json()["accepting"] is False
+    assert int(r.headers["Retry-After"]) > 0
+
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}?token={token}") as ws:
+        msg = ws.receive_json()
+    assert msg["type"] == "busy"
+    assert msg["retry_after_s"] > 0
+
+    # recusado na admissão: a sessão continua CREATED para nova tentativa
+    r = client.get(f"/v1/sessions/{session_id}", headers=headers)
+    assert r.json()["status"] == "CREATED"
+
+    monkeypatch.undo()
+    assert client.get("/v1/health/capacity").status_code == 200
@@ -0,0 +1,72 @@
+import math
+import random
+
+import pytest
+
+from app.services.decimation import InferenceDecimator
+from app.services.exercise_analysis.dispatcher import create_analyzer
+
+FPS = 30
+PARAMS = {"low_deg": 95, "high_deg": 170}
+
+
+def _knee_angle(t_s: float) -> float:
+    # extensão lenta: 85° -> 178° -> 85° a cada 4 s, com ruído de medição
+    return 131.5 - 46.5 * math.cos(2 * math.pi * t_s / 4.0) + random.uniform(-1, 1)
+
+
+def _run(mode: str, stride: int, seconds: float = 20.0) -> tuple[int, InferenceDecimator]:
+    random.seed(7)
+    analyzer = create_analyzer("KNEE_EXTENSION_V1")
+    decimator = InferenceDecimator(mode, stride, thresholds=(95.0, 170.0))
+    reps = 0
+    for i in range(int(seconds * FPS)):
+        ts_ms = 1_000_000 + int(i * 1000 / FPS)
+        measured = _knee_angle(i / FPS)  # o que o BlazePose devolveria neste frame
+        rom = decimator.next_rom(ts_ms)
+        if rom is None:
+            rom = measured
+            decimator.record_keyframe(ts_ms, rom)
+        reps = analyzer.run(rom, PARAMS, ts_ms)["reps"]
+    return reps, decimator
+
+
+@pytest.mark.parametrize("mode,stride", [("FIXED", 3), ("ADAPTIVE", 6)])
+def test_decimation_keeps_rep_count_with_fewer_inferences(mode, stride):
+    full_reps, full = _run("FULL", 1)
+    reps, dec = _run(mode, stride)
+
+    assert full_reps == 5
+    assert reps == full_reps
+    assert full.keyframes == full.frames
+    # quase 1/N: o extra são os keyframes forçados perto dos limiares
+    assert dec.keyframes < dec.frames * 0.5
+    assert dec.stats()["estimados"] == dec.frames - dec.keyframes
+
+
+def test_extrapolation_uses_keyframe_timestamps_and_expires():
+    dec = InferenceDecimator("FIXED", 4)
+    assert dec.next_rom(0) is None
+    dec.record_keyframe(0, 120.0)
+    assert dec.next_rom(100) is None  # ainda sem velocidade
+    dec.record_keyframe(100, 130.0)
+
+    assert dec.next_rom(150) == pytest.approx(135.0)
+    assert dec.estimate(100 + 600) is None  # keyframe velho demais
+
+    # perda de pose zera o histórico
+    dec.record_keyframe(200, None)
+    assert dec.next_rom(250) is None
+
+
+def test_frame_that_fails_decode_is_not_counted_as_estimated():
+    dec = InferenceDecimator("FIXED", 2)
+    for ts_ms, rom in ((0, 120.0), (100, 130.0)):
+        assert dec.next_rom(ts_ms) is None
+        dec.record_keyframe(ts_ms, rom)
+    assert dec.next_rom(150) is not None
+    # keyframe pedido, mas o JPEG não decodifica: o WS descarta sem record_keyframe
+    assert dec.next_rom(200) is None
+
+    assert dec.stats() == {"modo": "FIXED", "keyframes": 2, "estimados": 1}
+    assert dec.frames == 4
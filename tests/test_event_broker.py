@@ -0,0 +1,72 @@
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.services.broker import Broker, coalesce, create_broker, pack_payloads
+from app.services.event_bus import EventBus
+
+
+def test_coalesce_keeps_status_and_last_metric_per_session():
+    batch = [(("live:a",), {"i": i}) for i in range(5)]
+    batch.insert(2, (("session:a", "patient:p"), {"type": "status"}))
+    batch.append((("live:b",), {"i": 0}))
+
+    assert coalesce(batch) == [
+        (("session:a", "patient:p"), {"type": "status"}),
+        (("live:a",), {"i": 4}),
+        (("live:b",), {"i": 0}),
+    ]
+
+
+def test_broker_without_publish_cannot_be_built():
+    class HalfBroker(Broker):
+        def start(self, deliver) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="publish"):
+        HalfBroker()
+
+
+def test_pack_payloads_respects_notify_limit():
+    batch = [(("live:x",), {"pad": "x" * 100, "i": i}) for i in range(200)]
+    payloads = pack_payloads(batch, limit=1000)
+
+    assert len(payloads) > 1
+    assert all(len(p.encode()) <= 1000 for p in payloads)
+    items = [item for p in payloads for item in json.loads(p)]
+    assert [e["i"] for _, e in items] == list(range(200))
+
+
+@pytest.mark.skipif(
+    make_url(os.getenv("DATABASE_URL", "sqlite://")).get_backend_name() != "postgresql",
+    reason="LISTEN/NOTIFY precisa de Postgres",
+)
+def test_postgres_broker_fans_out_between_buses():
+    channel = f"fisio_test_{time.time_ns()}"
+    brokers = [create_broker("postgres", os.environ["DATABASE_URL"], channel, 0.02) for _ in "ab"]
+    # dois EventBus = dois workers falando pelo mesmo canal
+    worker_a, worker_b = (EventBus(broker=b) for b in brokers)
+    try:
+        assert all(b.wait_ready() for b in brokers)
+        sub = worker_b.subscribe("session:s1", "live:s1")
+
+        worker_a.publish({"type": "status", "status": "RUNNING"}, "session:s1", "patient:p1")
+        for i in range(50):
+            worker_a.publish({"type": "metrics", "i": i}, "live:s1")
+
+        deadline = time.monotonic() + 5
+        while len(sub._events) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.1)
+
+        events = list(sub._events)
+        assert events[0] == {"type": "status", "status": "RUNNING"}
+        # métricas coalescidas: bem menos NOTIFY que frames, e a última sempre chega
+        assert len(events) < 51
+        assert events[-1] == {"type": "metrics", "i": 49}
+    finally:
+        for bus in (worker_a, worker_b):
+            bus.broker.stop()
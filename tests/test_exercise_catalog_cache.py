@@ -0,0 +1,78 @@
+import os
+import time
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _auth(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _count_queries(client, url: str, headers: dict | None = None) -> tuple[int, object]:
+    statements = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        r = client.get(url, headers=headers or {})
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+    return len(statements), r
+
+
+def test_exercise_catalog_etag_and_invalidation(client):
+    headers = _auth(client)
+    unique = time.time_ns()
+
+    r = client.post("/v1/exercises", json={"title": f"Cache {unique}"}, headers=headers)
+    assert r.status_code == 201, r.text
+    exercise_id = r.json()["id"]
+
+    r = client.get("/v1/exercises")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert any(e["id"] == exercise_id for e in r.json())
+
+    # catálogo já em memória: nem a listagem nem o detalhe tocam o banco
+    n, r = _count_queries(client, "/v1/exercises", {"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert n == 0
+
+    n, r = _count_queries(client, f"/v1/exercises/{exercise_id}")
+    assert r.status_code == 200
+    assert r.json()["title"] == f"Cache {unique}"
+    assert n == 0
+    item_etag = r.headers["ETag"]
+    r = client.get(f"/v1/exercises/{exercise_id}", headers={"If-None-Match": item_etag})
+    assert r.status_code == 304
+
+    # escrita invalida o cache e muda o ETag
+    r = client.put(
+        f"/v1/exercises/{exercise_id}", json={"title": f"Cache {unique} v2"}, headers=headers
+    )
+    assert r.status_code == 200, r.text
+
+    r = client.get("/v1/exercises", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    r = client.get(f"/v1/exercises/{exercise_id}", headers={"If-None-Match": item_etag})
+    assert r.status_code == 200
+    assert r.json()["title"] == f"Cache {unique} v2"
+
+    r = client.delete(f"/v1/exercises/{exercise_id}", headers=headers)
+    assert r.status_code == 204
+    assert client.get(f"/v1/exercises/{exercise_id}").status_code == 404
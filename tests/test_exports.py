@@ -0,0 +1,95 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+
+def _auth(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _patient_with_finished_session(client, headers) -> tuple[str, str]:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"exp_csv_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Export {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"]},
+        headers=headers,
+    )
+    session_id = r.json()["id"]
+    r = client.post(
+        f"/v1/sessions/{session_id}/finalize",
+        json={"reps": 7, "rom": 150.0, "alerts": ["ok"]},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    return patient_id, session_id
+
+
+def test_export_sessions_ndjson_csv_and_gzip(client):
+    headers = _auth(client)
+    patient_id, session_id = _patient_with_finished_session(client, headers)
+
+    r = client.get(f"/v1/exports/sessions?patient_user_id={patient_id}", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["session_id"] for row in rows] == [session_id]
+    assert rows[0]["reps"] == 7
+    assert rows[0]["alerts"] == ["ok"]
+
+    r = client.get(f"/v1/exports/sessions?format=csv&patient_user_id={patient_id}", headers=headers)
+    assert r.status_code == 200, r.text
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert rows[0]["session_id"] == session_id
+    assert rows[0]["status"] == "FINISHED"
+
+    r = client.get(
+        f"/v1/exports/sessions?format=csv&gzip=true&patient_user_id={patient_id}",
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/gzip"
+    text = gzip.decompress(r.content).decode("utf-8")
+    assert session_id in text
+
+
+def test_export_requires_pro_and_valid_format(client):
+    r = client.get("/v1/exports/sessions")
+    assert r.status_code == 401
+
+    headers = _auth(client)
+    r = client.get("/v1/exports/sessions?format=xml", headers=headers)
+    assert r.status_code == 400, r.text
@@ -121,3 +121,55 @@ def test_full_flow_patient_assignment_session_summary(client):
     s_finished = r.json()
     assert s_finished["status"] == "FINISHED"
     assert s_finished["finished_at"] is not None
+
+
+def test_finalize_is_idempotent_and_merges_summary(client):
+    token = _login_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    unique = time.time_ns()
+
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"fin_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Fin {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    config_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments",
+        json={"patient_user_id": patient_id, "exercise_id": exercise_id, "config_id": config_id},
+        headers=headers,
+    )
+    assignment_id = r.json()["id"]
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": assignment_id},
+        headers=headers,
+    )
+    session_id = r.json()["id"]
+
+    # finalize cria o summary só com o que foi enviado
+    r = client.post(f"/v1/sessions/{session_id}/finalize", json={"reps": 4}, headers=headers)
+    assert r.status_code == 200, r.text
+    first = r.json()
+    assert first["status"] == "FINISHED"
+    assert first["finished_at"] is not None
+
+    # segundo finalize atualiza o summary sem perder campos nem mudar finished_at
+    r = client.post(f"/v1/sessions/{session_id}/finalize", json={"rom": 120.5}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["finished_at"] == first["finished_at"]
+
+    r = client.get(f"/v1/sessions/{session_id}/summary", headers=headers)
+    assert r.status_code == 200, r.text
+    summary = r.json()
+    assert summary["reps"] == 4
+    assert summary["rom"] == 120.5
+    assert summary["alerts"] == []
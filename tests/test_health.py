@@ -10,3 +10,14 @@ def test_health_db_ok(client):
     body = r.json()
     assert body["status"] == "ok"
     assert body["db"] == "ok"
+
+
+def test_health_db_reports_pool(client):
+    r = client.get("/v1/health/db")
+    assert r.status_code == 200
+    pool = r.json()["pool"]
+    assert "class" in pool
+    if pool["class"] == "InstrumentedQueuePool":
+        # a própria requisição segura uma conexão durante o health check
+        assert pool["checked_out"] >= 1
+        assert pool["checkout_wait"]["checkouts"] >= 1
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import time
+import urllib.parse
+from pathlib import Path
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.config import settings
+from app.services import live_sessions as live_mod
+from app.services.broker import MAX_NOTIFY_PAYLOAD, pack_payloads
+from app.services.live_sessions import LATENCY_WINDOW, LiveSession, LiveSessionRegistry
+
+FRAME = Path(__file__).parent / "assets" / "frame.jpg"
+
+
+def test_session_stats():
+    async def run():
+        live = LiveSession("s1", "p1", "u1", "KNEE_EXTENSION_V1")
+        for i in range(20):
+            live.frame_in(1000, recv_wait_s=0.01)
+            live.processed((i + 1) / 1000)  # 1..20 ms
+            if i % 4 == 0:
+                live.drop("no_pose")
+            else:
+                live.frame_out()
+            await asyncio.sleep(0.01)
+        return live.snapshot()
+
+    snap = asyncio.run(run())
+    assert snap["frames_in"] == 20 and snap["frames_out"] == 15
+    assert snap["dropped"] == {"no_pose": 5} and snap["dropped_total"] == 5
+    assert snap["latency_ms_avg"] == pytest.approx(10.5)
+    assert snap["latency_ms_p95"] == pytest.approx(19.0)
+    assert 30 < snap["fps_in"] < 110
+    assert snap["fps_out"] < snap["fps_in"]
+    assert snap["recv_wait_ms_avg"] == pytest.approx(10.0)
+    assert snap["memory_bytes"] == 1000
+
+
+def _from_worker(worker: str, sessions: list[dict]) -> list[dict]:
+    """Eventos como publish() os manda: uma sessão por evento e depois os ids."""
+    return [{"type": "session", "worker": worker, "session": s} for s in sessions] + [
+        {"type": "worker", "worker": worker, "session_ids": [s["session_id"] for s in sessions]}
+    ]
+
+
+def test_registry_merges_recent_workers():
+    registry = LiveSessionRegistry(publish_interval_s=2.0)
+    for event in _from_worker("outro:1", [{"session_id": "x", "latency_ms_p95": 80.0}]):
+        registry._handle(event)
+    for event in _from_worker("velho:2", [{"session_id": "y", "latency_ms_p95": None}]):
+        registry._handle(event)
+    at, ids = registry._workers["velho:2"]
+    registry._workers["velho:2"] = (at - 60, ids)  # sem notícia há 1 min
+
+    snap = registry.snapshot()
+    assert [w["worker"] for w in snap["workers"]] == [live_mod.WORKER_ID, "outro:1"]
+    assert [s["session_id"] for s in snap["sessions"]] == ["x"]
+
+    # a sessão terminou lá: some no próximo publish daquele worker
+    for event in _from_worker("outro:1", []):
+        registry._handle(event)
+    assert registry.snapshot()["sessions"] == []
+
+
+@pytest.mark.parametrize(
+    "n_sessions", [settings.infer_max_sessions, 4 * settings.infer_max_sessions]
+)
+def test_publish_fits_in_notify_payloads(monkeypatch, n_sessions):
+    async def run():
+        registry = LiveSessionRegistry(publish_interval_s=2.0)
+        for i in range(n_sessions):
+            live = LiveSession(f"{i:08d}-0000-0000-0000-000000000000", "p" * 36, "u" * 36, "K" * 17)
+            for j in range(LATENCY_WINDOW):
+                live.frame_in(80_000, recv_wait_s=0.01)
+                live.processed(j / 1000)
+                live.frame_out()
+            for reason in ("no_pose", "decode_failed", "not_binary", "motion_gate"):
+                live.drop(reason)
+            registry.register(live)
+        registry.publish()
+
+    published = []
+    monkeypatch.setattr(live_mod.event_bus, "publish", lambda e, *t: published.append((t, e)))
+    asyncio.run(run())
+
+    payloads = pack_payloads(published)
+    assert all(len(p.encode()) <= MAX_NOTIFY_PAYLOAD for p in payloads)
+    delivered = [event for p in payloads for _, event in json.loads(p)]
+    assert len(delivered) == n_sessions + 1  # nada descartado
+
+    other = LiveSessionRegistry(publish_interval_s=2.0)
+    for event in delivered:
+        other._handle({**event, "worker": "outro:1"})
+    sessions = [s for s in other.snapshot()["sessions"] if s["worker"] == live_mod.WORKER_ID]
+    assert len(sessions) == n_sessions
+
+
+def _login_headers(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _create_session(client, headers) -> str:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "Paciente", "email": f"live{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post(
+        "/v1/exercises",
+        json={
+            "title": f"Extensão ao vivo {unique}",
+            "body_focus": "LOWER",
+            "analysis_kind": "KNEE_EXTENSION_V1",
+        },
+        headers=headers,
+    )
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+            "schedule": "DAILY",
+            "active": True,
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"], "config_snapshot": {}},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_list_and_kill_live_session(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug_api_enabled", True)
+    monkeypatch.setattr(settings, "debug_admins", "")
+    monkeypatch.setattr(settings, "pose_backend", "synthetic")
+    monkeypatch.setattr(settings, "synthetic_pose_cost_ms", 0.0)
+    monkeypatch.setattr(settings, "motion_gate_threshold", 0.0)
+    monkeypatch.setattr(settings, "infer_qos_enabled", False)
+
+    headers = _login_headers(client)
+    session_id = _create_session(client, headers)
+    token = urllib.parse.quote(headers["Authorization"].split()[1], safe="")
+    frame = FRAME.read_bytes()
+
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        for _ in range(5):
+            ws.send_bytes(frame)
+            assert ws.receive_json()["type"] == "metrics"
+
+        r = client.get("/v1/debug/live-sessions", headers=headers)
+        assert r.status_code == 200, r.text
+        live = next(s for s in r.json()["sessions"] if s["session_id"] == session_id)
+        assert live["analysis_kind"] == "KNEE_EXTENSION_V1"
+        assert live["frames_in"] == 5
+        assert live["latency_ms_p95"] is not None
+        assert live["memory_bytes"] >= len(frame)
+
+        r = client.delete(
+            f"/v1/debug/live-sessions/{session_id}", params={"reason": "teste"}, headers=headers
+        )
+        assert r.status_code == 202, r.text
+        assert r.json()["local"] is True
+
+        msg = ws.receive_json()
+        assert msg == {"type": "error", "detail": "Sessão encerrada pelo operador: teste"}
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+        assert exc.value.code == 1008
+
+    r = client.get("/v1/debug/live-sessions", headers=headers)
+    assert session_id not in [s["session_id"] for s in r.json()["sessions"]]
+    r = client.get(f"/v1/sessions/{session_id}", headers=headers)
+    assert r.json()["status"] == "FINISHED"
+    r = client.delete(f"/v1/debug/live-sessions/{session_id}", headers=headers)
+    assert r.status_code == 404
+
+
+def test_client_close_does_not_show_as_a_drop(client, monkeypatch):
+    monkeypatch.setattr(settings, "pose_backend", "synthetic")
+    monkeypatch.setattr(settings, "synthetic_pose_cost_ms", 0.0)
+    monkeypatch.setattr(settings, "infer_qos_enabled", False)
+    drops = []
+    original_drop = LiveSession.drop
+
+    def spy_drop(self, reason):
+        drops.append(reason)
+        original_drop(self, reason)
+
+    monkeypatch.setattr(LiveSession, "drop", spy_drop)
+
+    headers = _login_headers(client)
+    session_id = _create_session(client, headers)
+    token = urllib.parse.quote(headers["Authorization"].split()[1], safe="")
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_bytes(FRAME.read_bytes())
+        assert ws.receive_json()["type"] == "metrics"
+
+    assert "not_binary" not in drops
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import time
+
+from app.core.logging import session_id_ctx
+from app.services.loop_monitor import LoopMonitor, tag_task
+
+
+def _blocking_frame_handler():
+    # simula uma chamada síncrona (DB/visão) dentro de código async
+    time.sleep(0.35)
+
+
+def test_stall_is_logged_with_stack_and_session(caplog):
+    monitor = LoopMonitor(interval_s=0.02, threshold_s=0.1)
+
+    async def session_task():
+        session_id_ctx.set("sessao-123")
+        tag_task(session_id="sessao-123")
+        await asyncio.sleep(0.05)
+        _blocking_frame_handler()
+
+    async def main():
+        monitor.start()
+        try:
+            await asyncio.create_task(session_task())
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="app.loop"):
+        asyncio.run(main())
+
+    stalls = [r for r in caplog.records if getattr(r, "event", None) == "event_loop_stall"]
+    assert len(stalls) == 1
+    fields = stalls[0].fields
+    assert fields["session_id"] == "sessao-123"
+    assert "_blocking_frame_handler" in fields["stack"]
+    assert fields["stalled_ms"] >= 100
+    assert monitor.stalls == 1
+
+    snap = monitor.snapshot()
+    assert snap["lag_ms_max"] >= 300
+    assert not snap["running"]
+
+
+def test_percentiles_nearest_rank():
+    monitor = LoopMonitor(interval_s=0.1, threshold_s=0.25)
+    for ms in range(1, 101):
+        monitor.record(ms / 1000)
+    p = monitor.percentiles()
+    assert p[0.5] == 0.05
+    assert p[0.95] == 0.095
+    assert p[0.99] == 0.099
+
+
+def test_health_loop(client):
+    r = client.get("/v1/health/loop")
+    assert r.status_code == 200
+    assert {"lag_ms_p50", "lag_ms_p99", "stalls_total"} <= set(r.json())
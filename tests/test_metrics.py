@@ -0,0 +1,135 @@
+import os
+import time
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import Registry, _Metric
+from app.services.infer_metrics import STAGES, StageTimer, frames_dropped_total, stage_seconds
+
+FRAME = Path(__file__).parent / "assets" / "frame.jpg"
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    h = reg.histogram("x_seconds", "teste", ("stage",), buckets=(0.01, 0.1))
+    for v in (0.005, 0.05, 0.05, 3.0):
+        h.observe(v, stage="pose")
+    reg.counter("x_total", "teste").inc(2)
+
+    text = reg.render()
+    assert "# TYPE x_seconds histogram" in text
+    assert 'x_seconds_bucket{stage="pose",le="0.01"} 1' in text
+    assert 'x_seconds_bucket{stage="pose",le="0.1"} 3' in text
+    assert 'x_seconds_bucket{stage="pose",le="+Inf"} 4' in text
+    assert 'x_seconds_count{stage="pose"} 4' in text
+    assert "x_total 2.0" in text
+
+
+def test_metric_kind_must_render_samples():
+    class NoSamples(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError, match="samples"):
+        NoSamples("x", "teste")
+
+
+def test_stage_timers_overhead_is_negligible():
+    before = stage_seconds.count(stage="rom")
+    timer = StageTimer()
+    n = 2000
+    start = time.perf_counter()
+    for _ in range(n):
+        for stage in STAGES:
+            timer.lap(stage)
+    per_frame = (time.perf_counter() - start) / n
+
+    assert stage_seconds.count(stage="rom") == before + n
+    # 1% de um frame de 20 ms (50 fps) = 200 µs; sobra muita margem
+    assert per_frame < 0.0002
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    r = client.get("/v1/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for name in (
+        "fisio_infer_stage_seconds",
+        "fisio_infer_frames_total",
+        "fisio_infer_frames_dropped_total",
+        "fisio_infer_active_sessions",
+        "fisio_infer_fps",
+        "fisio_event_dropped_total",
+    ):
+        assert f"# TYPE {name} " in r.text
+
+
+def _login_headers(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _create_session(client, headers) -> str:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "Paciente", "email": f"metr{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post(
+        "/v1/exercises",
+        json={"title": f"Métricas {unique}", "analysis_kind": "KNEE_EXTENSION_V1"},
+        headers=headers,
+    )
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"]},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_client_close_is_not_counted_as_dropped_frame(client, monkeypatch):
+    monkeypatch.setattr(settings, "pose_backend", "synthetic")
+    monkeypatch.setattr(settings, "synthetic_pose_cost_ms", 0.0)
+    monkeypatch.setattr(settings, "infer_qos_enabled", False)
+    headers = _login_headers(client)
+    session_id = _create_session(client, headers)
+    token = urllib.parse.quote(headers["Authorization"].split()[1], safe="")
+    before = frames_dropped_total.value(reason="not_binary")
+
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_bytes(FRAME.read_bytes())
+        assert ws.receive_json()["type"] == "metrics"
+
+    assert frames_dropped_total.value(reason="not_binary") == before
+    r = client.get(f"/v1/sessions/{session_id}", headers=headers)
+    assert r.json()["status"] == "FINISHED"
@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.services.motion_gate import MotionGate
+
+
+def _frame(offset: int = 0, noise: int = 0, seed: int = 0) -> np.ndarray:
+    img = np.zeros((480, 640, 3), np.uint8)
+    img[100:380, 200 + offset : 300 + offset] = 200  # "perna"
+    if noise:
+        rng = np.random.default_rng(seed)
+        img = np.clip(img + rng.integers(-noise, noise, img.shape), 0, 255).astype(np.uint8)
+    return img
+
+
+def test_static_frames_are_skipped_and_motion_is_inferred():
+    gate = MotionGate(threshold=2.5, max_skip=100)
+
+    assert gate.should_infer(_frame()) is True
+    gate.record_inference(0.030)
+    # ruído de sensor sem movimento não dispara inferência
+    for i in range(5):
+        assert gate.should_infer(_frame(noise=6, seed=i)) is False
+    assert gate.should_infer(_frame(offset=80)) is True
+
+    stats = gate.stats()
+    assert stats["frames"] == 7
+    assert stats["puladas"] == 5
+    assert stats["economia_ms"] == 150.0
+
+
+def test_slow_drift_is_compared_against_last_inferred_frame():
+    gate = MotionGate(threshold=2.5, max_skip=100)
+    gate.should_infer(_frame())
+    # passos pequenos demais um a um, mas que somados já são movimento
+    decisions = [gate.should_infer(_frame(offset=step)) for step in range(2, 40, 2)]
+    assert True in decisions
+
+
+def test_max_skip_forces_inference_and_zero_disables():
+    gate = MotionGate(threshold=2.5, max_skip=3)
+    decisions = [gate.should_infer(_frame()) for _ in range(9)]
+    assert decisions == [True, False, False, False, True, False, False, False, True]
+
+    gate = MotionGate(threshold=0, max_skip=3)
+    assert all(gate.should_infer(_frame()) for _ in range(5))
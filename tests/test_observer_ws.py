@@ -0,0 +1,99 @@
+import asyncio
+import os
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.services.event_bus import EventBus, event_bus, live_topic
+
+
+def _token(client, email=None, password=None) -> str:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": email or os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": password or os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return r.json()["access_token"]
+
+
+def test_slow_subscriber_drops_oldest():
+    bus = EventBus()
+    sub = bus.subscribe("t", queue_size=2)
+    for i in range(5):
+        bus.publish({"i": i}, "t")
+    assert sub.dropped == 3
+
+    async def _drain():
+        return [await sub.get(timeout=0), await sub.get(timeout=0), await sub.get(timeout=0)]
+
+    assert asyncio.run(_drain()) == [{"i": 3}, {"i": 4}, None]
+    sub.close()
+    assert bus.subscriber_count("t") == 0
+
+
+def test_observer_receives_live_metrics_until_finished(client):
+    token = _token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    unique = time.time_ns()
+
+    patient_email = f"obs_{unique}@teste.com"
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": patient_email, "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Obs {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"]},
+        headers=headers,
+    )
+    session_id = r.json()["id"]
+
+    # paciente não pode observar
+    patient_token = _token(client, patient_email, "teste1234")
+    with client.websocket_connect(
+        f"/v1/infer/ws/session/{session_id}/observe?token={patient_token}"
+    ) as ws:
+        assert ws.receive_json()["type"] == "error"
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_json()
+
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}/observe?token={token}") as ws:
+        assert ws.receive_json() == {"type": "ready", "session_id": session_id, "status": "CREATED"}
+
+        # o WS do paciente publica exatamente assim a cada frame
+        event_bus.publish(
+            {"type": "metrics", "session_id": session_id, "repeticoes": 3}, live_topic(session_id)
+        )
+        msg = ws.receive_json()
+        assert msg["type"] == "metrics"
+        assert msg["repeticoes"] == 3
+        assert msg["descartados"] == 0
+
+        r = client.post(f"/v1/sessions/{session_id}/finish", headers=headers)
+        assert r.status_code == 200, r.text
+        msg = ws.receive_json()
+        assert msg["type"] == "status"
+        assert msg["status"] == "FINISHED"
@@ -0,0 +1,110 @@
+import os
+import time
+from datetime import datetime
+
+from app.db.pagination import encode_cursor
+
+
+def _auth(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _patient_with_sessions(client, headers, n: int) -> tuple[str, list[str]]:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"page_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Page {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    assignment_id = r.json()["id"]
+
+    session_ids = []
+    for _ in range(n):
+        r = client.post(
+            f"/v1/patients/{patient_id}/sessions",
+            json={"exercise_id": exercise_id, "assignment_id": assignment_id},
+            headers=headers,
+        )
+        assert r.status_code == 201, r.text
+        session_ids.append(r.json()["id"])
+    return patient_id, session_ids
+
+
+def test_sessions_keyset_pagination_walks_all_pages(client):
+    headers = _auth(client)
+    patient_id, created = _patient_with_sessions(client, headers, 5)
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        url = f"/v1/patients/{patient_id}/sessions?limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        r = client.get(url, headers=headers)
+        assert r.status_code == 200, r.text
+        page = r.json()
+        assert len(page) <= 2
+        seen.extend(s["id"] for s in page)
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    # mais recentes primeiro, sem repetir nem pular
+    assert seen == list(reversed(created))
+
+
+def test_invalid_cursor_is_rejected(client):
+    headers = _auth(client)
+    r = client.get("/v1/exercises?cursor=not-a-cursor", headers=headers)
+    assert r.status_code == 400, r.text
+
+
+def test_cursor_from_another_listing_is_rejected(client):
+    headers = _auth(client)
+    unique = time.time_ns()
+    for i in range(2):
+        client.post("/v1/exercises", json={"title": f"Cursor {unique} {i}"}, headers=headers)
+        client.post(
+            "/v1/patients",
+            json={"name": "P", "email": f"cursor_{unique}_{i}@teste.com", "password": "teste1234"},
+            headers=headers,
+        )
+
+    exercises_cursor = client.get("/v1/exercises?limit=1", headers=headers).headers["X-Next-Cursor"]
+    patients_cursor = client.get("/v1/patients?limit=1", headers=headers).headers["X-Next-Cursor"]
+
+    # id int (serial) numa listagem de uuid e vice-versa: 400, não 500
+    r = client.get(f"/v1/patients?cursor={exercises_cursor}", headers=headers)
+    assert r.status_code == 400, r.text
+    r = client.get(f"/v1/exercises?cursor={patients_cursor}", headers=headers)
+    assert r.status_code == 400, r.text
+
+    bogus = encode_cursor(datetime.utcnow(), {"id": 1})
+    r = client.get(f"/v1/patients?cursor={bogus}", headers=headers)
+    assert r.status_code == 400, r.text
@@ -0,0 +1,246 @@
+"""
+Microbenchmarks do caminho por frame, comparados com tests/perf_baseline.json.
+
+Mede ns/op (melhor de PERF_REPEAT rodadas) e bytes alocados por chamada
+(pico do tracemalloc). O tempo é normalizado por um laço de calibração em
+Python puro, então o baseline vale entre máquinas; falha quando um caso fica
+PERF_TOLERANCE vezes mais caro que o baseline.
+
+A calibração não compensa CPU disputada (runner ocupado), então os testes de
+tempo têm o marcador `perf` e ficam fora da suíte padrão; as alocações são
+determinísticas e rodam sempre.
+
+  pytest -m perf tests/test_perf_budgets.py       # tempo (máquina ociosa)
+  PERF_UPDATE_BASELINE=1 pytest -m "perf or not perf" tests/test_perf_budgets.py
+"""
+
+import gc
+import itertools
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.exercise_analysis.dispatcher import create_analyzer
+from app.services.exercise_analysis.knee_extension_v1 import (
+    KneeExtensionState,
+    update_knee_extension,
+)
+from app.services.pose_backends import SyntheticPoseBackend
+from app.services.pose_logic import (
+    ANKLE_R,
+    HIP_R,
+    KNEE_R,
+    RepConfig,
+    RepDetector,
+    _angle_between,
+    rom_from_keypoints,
+)
+
+BASELINE = Path(__file__).parent / "perf_baseline.json"
+TOLERANCE = float(os.getenv("PERF_TOLERANCE", "1.5"))
+REPEAT = int(os.getenv("PERF_REPEAT", "7"))
+UPDATE = os.getenv("PERF_UPDATE_BASELINE") == "1"
+# cada rodada dura pelo menos isso (escolhe o número de chamadas)
+MIN_ROUND_S = 0.01
+# folga absoluta de alocação (o tracemalloc tem ruído de dezenas de bytes)
+ALLOC_SLACK_BYTES = 256
+
+SESSION_FRAMES = 300  # 30 s a 10 fps
+
+
+def _session_keypoints() -> list[list[list[float]]]:
+    backend = SyntheticPoseBackend(fps=10, period_s=3.0, noise=0.003, seed=1)
+    rgb = np.zeros((1, 1, 3), np.uint8)
+    return [backend.process(rgb) for _ in range(SESSION_FRAMES)]
+
+
+KEYPOINTS = _session_keypoints()
+ROMS = [rom_from_keypoints(k) for k in KEYPOINTS]
+TS_MS = [i * 100 for i in range(SESSION_FRAMES)]
+
+
+def _calibration_workload() -> float:
+    # aritmética e chamadas no mesmo estilo do código medido
+    acc = 0.0
+    for i in range(100):
+        acc += math.hypot(i, 1.0) * 0.5
+    return acc
+
+
+def _cases() -> dict:
+    k0 = KEYPOINTS[0]
+    p1, p2, p3 = (k0[HIP_R][:2], k0[KNEE_R][:2], k0[ANKLE_R][:2])
+
+    kps_cycle = itertools.cycle(KEYPOINTS)
+    rom_cycle = itertools.cycle(ROMS)
+    frame_cycle = itertools.cycle(zip(ROMS, TS_MS, strict=True))
+    detector = RepDetector(RepConfig(low_deg=95, high_deg=170))
+    knee_state = KneeExtensionState()
+    analyzer = create_analyzer("KNEE_EXTENSION_V1")
+
+    def knee_single():
+        rom, ts = next(frame_cycle)
+        return update_knee_extension(rom, knee_state, {}, ts_ms=ts)
+
+    def analyzer_single():
+        rom, ts = next(frame_cycle)
+        return analyzer.run(rom, {}, ts)
+
+    def rom_batch():
+        return [rom_from_keypoints(k) for k in KEYPOINTS]
+
+    def rep_detector_batch():
+        det = RepDetector(RepConfig(low_deg=95, high_deg=170))
+        for rom in ROMS:
+            det.update(rom)
+        return det.reps
+
+    def knee_batch():
+        state = KneeExtensionState()
+        for rom, ts in zip(ROMS, TS_MS, strict=True):
+            update_knee_extension(rom, state, {}, ts_ms=ts)
+        return state.reps
+
+    def frame_path_batch():
+        # keypoints -> ROM -> analisador: o que o WS faz por frame depois do pose
+        an = create_analyzer("KNEE_EXTENSION_V1")
+        out = None
+        for kps, ts in zip(KEYPOINTS, TS_MS, strict=True):
+            out = an.run(rom_from_keypoints(kps), {}, ts)
+        return out
+
+    return {
+        "angle_between": lambda: _angle_between(p1, p2, p3),
+        "rom_from_keypoints": lambda: rom_from_keypoints(next(kps_cycle)),
+        "rep_detector_update": lambda: detector.update(next(rom_cycle)),
+        "update_knee_extension": knee_single,
+        "analyzer_run": analyzer_single,
+        "rom_from_keypoints_batch": rom_batch,
+        "rep_detector_update_batch": rep_detector_batch,
+        "update_knee_extension_batch": knee_batch,
+        "frame_path_batch": frame_path_batch,
+    }
+
+
+CASES = _cases()
+
+
+def _calls_per_round(fn) -> int:
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= MIN_ROUND_S:
+            return number
+        number *= 2
+
+
+def _round_ns(fn, number: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - t0) / number * 1e9
+
+
+def _measure(fn) -> tuple[float, float]:
+    """
+    (ns/op da calibração, ns/op do caso), melhor de REPEAT rodadas alternadas:
+    interferência de outras threads pega as duas medidas, não só uma.
+    Como o timeit, sem GC durante a medição.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        n_cal = _calls_per_round(_calibration_workload)
+        n_fn = _calls_per_round(fn)
+        cal = best = math.inf
+        for _ in range(REPEAT):
+            cal = min(cal, _round_ns(_calibration_workload, n_cal))
+            best = min(best, _round_ns(fn, n_fn))
+        return cal, best
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _alloc_bytes_per_call(fn) -> int:
+    fn()  # aquece caches/lazy imports fora da medição
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def _load_baseline() -> dict:
+    if not BASELINE.exists():
+        return {"cases": {}}
+    return json.loads(BASELINE.read_text(encoding="utf-8"))
+
+
+def _save_case(name: str, fields: dict, calibration_ns: float | None = None) -> None:
+    data = _load_baseline()
+    cases = data["cases"]
+    cases[name] = {**cases.get(name, {}), **fields}
+    data = {
+        "machine": f"{platform.python_implementation()} {platform.python_version()}",
+        "calibration_ns": (
+            round(calibration_ns, 1) if calibration_ns else data.get("calibration_ns")
+        ),
+        "cases": dict(sorted(cases.items())),
+    }
+    BASELINE.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def _baseline_case(name: str, key: str) -> dict:
+    base = _load_baseline()["cases"].get(name)
+    if base is None or key not in base:
+        pytest.skip(f"sem baseline para {name} (rode com PERF_UPDATE_BASELINE=1)")
+    return base
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", list(CASES))
+def test_hot_path_time_budget(name):
+    calibration_ns, ns = _measure(CASES[name])
+    result = {"ns_per_op": round(ns, 1), "relative": round(ns / calibration_ns, 4)}
+    if name.endswith("_batch"):
+        result["ns_per_frame"] = round(ns / SESSION_FRAMES, 1)
+
+    if UPDATE:
+        _save_case(name, result, calibration_ns)
+        return
+
+    base = _baseline_case(name, "relative")
+    limit = base["relative"] * TOLERANCE
+    assert result["relative"] <= limit, (
+        f"{name}: {result['ns_per_op']:.0f} ns/op, {result['relative']:.3f}x a calibração "
+        f"(baseline {base['relative']:.3f}x, limite {limit:.3f}x)"
+    )
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_hot_path_alloc_budget(name):
+    alloc_bytes = _alloc_bytes_per_call(CASES[name])
+
+    if UPDATE:
+        _save_case(name, {"alloc_bytes": alloc_bytes})
+        return
+
+    base = _baseline_case(name, "alloc_bytes")
+    alloc_limit = base["alloc_bytes"] * TOLERANCE + ALLOC_SLACK_BYTES
+    assert (
+        alloc_bytes <= alloc_limit
+    ), f"{name}: {alloc_bytes} bytes/chamada (baseline {base['alloc_bytes']})"
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.loop_monitor import tag_task
+from app.services.profiler import ProfilerBusyError, run_profile, session_matcher
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _busy_session_frame():
+    _busy(0.005)
+
+
+def _busy_other_frame():
+    _busy(0.005)
+
+
+def test_session_profile_only_counts_the_target_task():
+    async def worker(session_id: str, frame_fn, stop: asyncio.Event):
+        tag_task(session_id=session_id)
+        while not stop.is_set():
+            frame_fn()
+            await asyncio.sleep(0)
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        tasks = [
+            asyncio.create_task(worker("alvo", _busy_session_frame, stop)),
+            asyncio.create_task(worker("outra", _busy_other_frame, stop)),
+        ]
+        matcher = session_matcher(loop, threading.get_ident(), "alvo")
+        try:
+            return await run_profile(matcher, 0.5, interval_s=0.005)
+        finally:
+            stop.set()
+            await asyncio.gather(*tasks)
+
+    profiler = asyncio.run(main())
+    folded = profiler.collapsed()
+    assert profiler.samples > 10
+    assert "_busy_session_frame" in folded
+    assert "_busy_other_frame" not in folded
+    # formato folded: "raiz;...;folha contagem"
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_one_profile_per_worker():
+    async def main():
+        first = asyncio.create_task(run_profile(lambda *_: False, 0.2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ProfilerBusyError):
+            await run_profile(lambda *_: False, 0.1)
+        await first
+
+    asyncio.run(main())
+
+
+def _login_headers(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_profile_api_is_hidden_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug_api_enabled", False)
+    r = client.post(
+        "/v1/debug/profile", json={"route": "/v1/exercises"}, headers=_login_headers(client)
+    )
+    assert r.status_code == 404
+
+
+def test_profile_api_checks_admins_and_target(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug_api_enabled", True)
+    headers = _login_headers(client)
+
+    monkeypatch.setattr(settings, "debug_admins", "outra.pessoa@clinica.com")
+    r = client.post("/v1/debug/profile", json={"route": "/v1/exercises"}, headers=headers)
+    assert r.status_code == 403
+
+    monkeypatch.setattr(settings, "debug_admins", "")
+    r = client.post(
+        "/v1/debug/profile", json={"route": "/v1/exercises", "session_id": "x"}, headers=headers
+    )
+    assert r.status_code == 422
+    r = client.post("/v1/debug/profile", json={"session_id": "nao-existe"}, headers=headers)
+    assert r.status_code == 404
+    r = client.post("/v1/debug/profile", json={"route": "/v1/nada"}, headers=headers)
+    assert r.status_code == 404
+
+
+def test_profile_route_while_it_serves_requests(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug_api_enabled", True)
+    monkeypatch.setattr(settings, "debug_admins", "")
+    headers = _login_headers(client)
+
+    stop = threading.Event()
+
+    def load():
+        while not stop.is_set():
+            client.get("/v1/patients", headers=headers)
+
+    thread = threading.Thread(target=load)
+    thread.start()
+    try:
+        r = client.post(
+            "/v1/debug/profile",
+            json={"route": "/v1/patients", "method": "GET", "seconds": 1, "interval_ms": 2},
+            headers=headers,
+        )
+    finally:
+        stop.set()
+        thread.join()
+
+    assert r.status_code == 200, r.text
+    assert r.headers["X-Profile-Target"] == "route:GET /v1/patients"
+    assert int(r.headers["X-Profile-Samples"]) > 0
+    assert "attachment" in r.headers["Content-Disposition"]
+    assert "list_patients_endpoint (patients.py:" in r.text
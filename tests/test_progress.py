@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+def _auth(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_progress_rollup_is_updated_on_finalize(client):
+    headers = _auth(client)
+    unique = time.time_ns()
+
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"prog_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Prog {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    assignment_id = r.json()["id"]
+
+    for reps, rom, cadence in [(10, 150.0, 0.5), (6, 170.0, None)]:
+        r = client.post(
+            f"/v1/patients/{patient_id}/sessions",
+            json={"exercise_id": exercise_id, "assignment_id": assignment_id},
+            headers=headers,
+        )
+        session_id = r.json()["id"]
+        body = {"reps": reps, "rom": rom, "cadence": cadence}
+        r = client.post(f"/v1/sessions/{session_id}/finalize", json=body, headers=headers)
+        assert r.status_code == 200, r.text
+
+    # finalizar de novo não pode contar em dobro
+    r = client.post(f"/v1/sessions/{session_id}/finalize", json={"reps": 6}, headers=headers)
+    assert r.status_code == 200, r.text
+
+    r = client.get(f"/v1/patients/{patient_id}/progress?bucket=week", headers=headers)
+    assert r.status_code == 200, r.text
+    points = r.json()
+    assert len(points) == 1
+    p = points[0]
+    assert p["sessions"] == 2
+    assert p["reps"] == 16
+    assert p["avg_rom"] == 160.0
+    assert p["max_rom"] == 170.0
+    assert p["avg_cadence"] == 0.5
+
+
+def test_progress_rejects_unknown_bucket(client):
+    headers = _auth(client)
+    r = client.get("/v1/patients/whatever/progress?bucket=month", headers=headers)
+    assert r.status_code == 400, r.text
+
+
+def test_concurrent_finalizes_on_the_same_day_both_count(client):
+    """Duas transações finalizando sessões do mesmo (paciente, dia) ao mesmo tempo."""
+    from app.db.session import SessionLocal, engine
+    from app.services import sessions_service
+
+    if engine.dialect.name != "postgresql":
+        pytest.skip("o SQLite serializa as escritas (um escritor por vez)")
+
+    headers = _auth(client)
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"race_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"Race {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    assignment_id = r.json()["id"]
+    session_ids = []
+    for _ in range(2):
+        r = client.post(
+            f"/v1/patients/{patient_id}/sessions",
+            json={"exercise_id": exercise_id, "assignment_id": assignment_id},
+            headers=headers,
+        )
+        session_ids.append(r.json()["id"])
+
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        # A grava summary + rollup e segura a transação aberta
+        sessions_service._upsert_summary_row(first, session_ids[0], {"reps": 10, "rom": 150.0})
+        sessions_service._mark_finished(first, session_ids[0])
+
+        done = threading.Event()
+
+        def finalize_second():
+            sessions_service.save_final_summary(second, session_ids[1], {"reps": 6, "rom": 170.0})
+            done.set()
+
+        thread = threading.Thread(target=finalize_second)
+        thread.start()
+        time.sleep(0.5)
+        assert not done.is_set()  # B espera A
+        first.commit()
+        thread.join(timeout=10)
+        assert done.is_set()
+    finally:
+        first.close()
+        second.close()
+
+    r = client.get(f"/v1/patients/{patient_id}/progress", headers=headers)
+    assert r.status_code == 200, r.text
+    (point,) = r.json()
+    assert point["sessions"] == 2
+    assert point["reps"] == 16
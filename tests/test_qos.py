@@ -0,0 +1,51 @@
+from app.services.qos import COOLDOWN_S, DEFAULT_LEVEL, QOS_LEVELS, QosController
+
+
+def _feed(qos, start, seconds, proc_s, waited_s=0.05, util=0.0, fps=10):
+    """Simula frames a `fps` por `seconds`; devolve (instante final, controles emitidos)."""
+    controls = []
+    t = start
+    for _ in range(int(seconds * fps)):
+        t += 1 / fps
+        control = qos.observe(proc_s, waited_s, util, now=t)
+        if control:
+            controls.append(control)
+    return t, controls
+
+
+def test_downgrades_under_load_respecting_cooldown():
+    qos = QosController(now=0.0)
+    assert qos.control_message()["fps"] == QOS_LEVELS[DEFAULT_LEVEL]["fps"]
+
+    # 200 ms por frame: acima do orçamento de qualquer nível
+    t, controls = _feed(qos, 0.0, 1.0, proc_s=0.2)
+    assert controls == []  # ainda no cooldown inicial
+
+    t, controls = _feed(qos, t, COOLDOWN_S * 2, proc_s=0.2)
+    assert [c["level"] for c in controls] == [DEFAULT_LEVEL + 1, DEFAULT_LEVEL + 2]
+    assert controls[-1]["reason"] == "load"
+    assert controls[-1]["model_complexity"] == 0
+    assert controls[-1]["width"] < QOS_LEVELS[DEFAULT_LEVEL]["width"]
+
+
+def test_frames_piling_up_in_socket_count_as_pressure():
+    qos = QosController(now=0.0)
+    # processamento barato, mas o próximo frame já estava esperando (fila)
+    _, controls = _feed(qos, 0.0, COOLDOWN_S + 1, proc_s=0.005, waited_s=0.0)
+    assert controls[0]["reason"] == "queue"
+    assert controls[0]["level"] == DEFAULT_LEVEL + 1
+
+
+def test_upgrades_only_after_sustained_headroom():
+    qos = QosController(level=3, now=0.0)
+    t, controls = _feed(qos, 0.0, 4.0, proc_s=0.010)
+    assert controls == []
+
+    _, controls = _feed(qos, t, 3.0, proc_s=0.010)
+    assert [c["level"] for c in controls] == [2]
+    assert controls[0]["reason"] == "headroom"
+
+    # worker cheio segura a subida mesmo com a sessão barata
+    qos = QosController(level=3, now=0.0)
+    _, controls = _feed(qos, 0.0, 10.0, proc_s=0.010, util=0.7)
+    assert controls == []
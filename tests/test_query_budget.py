@@ -0,0 +1,131 @@
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.db.query_stats import redact_params
+
+
+def _login_headers(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _setup_assignment(client, headers) -> tuple[str, int, int]:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "Paciente", "email": f"qb{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    patient_id = r.json()["id"]
+
+    r = client.post(
+        "/v1/exercises",
+        json={
+            "title": f"Exercício QB {unique}",
+            "body_focus": "TRUNK",
+            "analysis_kind": "V1_LITE_THRESHOLDS",
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    exercise_id = r.json()["id"]
+
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    assert r.status_code in (200, 201), r.text
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+            "schedule": "DAILY",
+            "active": True,
+        },
+        headers=headers,
+    )
+    assert r.status_code in (200, 201), r.text
+    return patient_id, exercise_id, r.json()["id"]
+
+
+def test_create_session_query_budget(client, query_budget):
+    headers = _login_headers(client)
+    patient_id, exercise_id, assignment_id = _setup_assignment(client, headers)
+    payload = {"exercise_id": exercise_id, "assignment_id": assignment_id, "config_snapshot": {}}
+
+    # usuário do token + paciente, exercício, assignment + insert + refresh
+    with query_budget(6):
+        r = client.post(f"/v1/patients/{patient_id}/sessions", json=payload, headers=headers)
+    assert r.status_code == 201, r.text
+
+
+def test_list_endpoints_query_budget(client, query_budget):
+    headers = _login_headers(client)
+    patient_id, _, _ = _setup_assignment(client, headers)
+
+    with query_budget(2):
+        r = client.get("/v1/patients", headers=headers)
+    assert r.status_code == 200, r.text
+
+    # catálogo vem do cache; a segunda query só acontece com o cache frio
+    with query_budget(2):
+        r = client.get("/v1/exercises", headers=headers)
+    assert r.status_code == 200, r.text
+
+    # expand carrega os relacionamentos em lote, não uma query por item
+    with query_budget(3):
+        r = client.get(
+            f"/v1/assignments?patient_user_id={patient_id}&expand=exercise,config,last_session",
+            headers=headers,
+        )
+    assert r.status_code == 200, r.text
+
+    with query_budget(2):
+        r = client.get(f"/v1/patients/{patient_id}/sessions", headers=headers)
+    assert r.status_code == 200, r.text
+
+
+def test_debug_headers(client, monkeypatch):
+    monkeypatch.setattr(settings, "db_debug_headers", True)
+    r = client.get("/v1/health/db")
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) >= 1
+    assert float(r.headers["X-DB-Time"]) >= 0
+
+    monkeypatch.setattr(settings, "db_debug_headers", False)
+    r = client.get("/v1/health/db")
+    assert "X-DB-Queries" not in r.headers
+
+
+def test_slow_query_log_redacts_params(client, monkeypatch, caplog):
+    headers = _login_headers(client)
+    monkeypatch.setattr(settings, "db_slow_query_ms", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.db"):
+        r = client.get("/v1/patients/nao-existe", headers=headers)
+    assert r.status_code == 404
+
+    slow = [r for r in caplog.records if getattr(r, "event", None) == "slow_query"]
+    assert slow
+    assert all("nao-existe" not in r.getMessage() for r in slow)
+    assert any("str" in str(r.fields["params"]) for r in slow)
+
+
+def test_redact_params():
+    assert redact_params({"email": "a@b.com", "id": 3}) == {"email": "str", "id": "int"}
+    assert redact_params(("segredo",)) == ["str"]
+    assert redact_params([{"a": 1}, {"a": 2}], executemany=True) == "<2 linhas>"
+    assert redact_params(None) is None
@@ -0,0 +1,91 @@
+import json
+import logging
+
+from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi.testclient import TestClient
+
+from app.core.logging import JsonFormatter, log_event
+from app.middleware.request_logging import RequestLoggingMiddleware
+
+
+def _app(sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=sample_rate, slow_ms=10_000)
+
+    @app.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="nada")
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_json({"msg": "oi"})
+        await websocket.close(code=1000)
+
+    return app
+
+
+def _events(caplog) -> list[str]:
+    return [r.event for r in caplog.records if r.name == "app.request"]
+
+
+def test_request_id_header_and_log(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        r = client.get("/v1/health")
+    assert r.status_code == 200
+    request_id = r.headers["X-Request-ID"]
+    record = next(r for r in caplog.records if getattr(r, "event", None) == "request_finished")
+    assert record.fields["request_id"] == request_id
+    assert record.fields["status_code"] == 200
+    assert f"request_id={request_id}" in record.getMessage()
+
+
+def test_sampling_skips_success_but_keeps_errors(caplog):
+    client = TestClient(_app(sample_rate=0.0))
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        assert client.get("/ok").status_code == 200
+        assert client.get("/missing").status_code == 404
+
+    finished = [r for r in caplog.records if getattr(r, "event", None) == "request_finished"]
+    assert [r.fields["status_code"] for r in finished] == [404]
+
+
+def test_websocket_is_logged_with_request_id(caplog):
+    client = TestClient(_app(sample_rate=0.0))
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        with client.websocket_connect("/ws") as ws:
+            headers = dict(ws.extra_headers or [])
+            assert headers[b"x-request-id"]
+            assert ws.receive_json() == {"msg": "oi"}
+
+    assert _events(caplog) == ["websocket_closed"]
+    record = next(r for r in caplog.records if r.name == "app.request")
+    assert record.fields["accepted"] is True
+    assert record.fields["closed_by"] == "server"
+    assert record.fields["close_code"] == 1000
+
+
+def test_json_formatter_emits_fields():
+    logger = logging.getLogger("app.test_json")
+    records = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    handler = _Capture()
+    logger.addHandler(handler)
+    try:
+        log_event(logger, logging.WARNING, "algo", request_id="abc", duration_ms=1.5)
+    finally:
+        logger.removeHandler(handler)
+
+    data = json.loads(JsonFormatter().format(records[0]))
+    assert data["event"] == "algo"
+    assert data["request_id"] == "abc"
+    assert data["duration_ms"] == 1.5
+    assert data["level"] == "WARNING"
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+
+from app.services.event_bus import event_bus, session_topic
+
+
+def _token(client) -> str:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return r.json()["access_token"]
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _create_session(client, headers: dict) -> str:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "P", "email": f"sse_{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post("/v1/exercises", json={"title": f"SSE {unique}"}, headers=headers)
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"]},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_session_events_stream_status_and_summary(client):
+    token = _token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    session_id = _create_session(client, headers)
+
+    result = {}
+
+    def _listen():
+        # EventSource não manda headers: token vai na query
+        result["r"] = client.get(f"/v1/sessions/{session_id}/events?token={token}")
+
+    t = threading.Thread(target=_listen)
+    t.start()
+    deadline = time.monotonic() + 5
+    while event_bus.subscriber_count(session_topic(session_id)) == 0:
+        assert time.monotonic() < deadline, "SSE não assinou o bus"
+        time.sleep(0.01)
+
+    r = client.post(f"/v1/sessions/{session_id}/start", headers=headers)
+    assert r.status_code == 200, r.text
+    r = client.post(f"/v1/sessions/{session_id}/finalize", json={"reps": 7}, headers=headers)
+    assert r.status_code == 200, r.text
+
+    # o stream termina sozinho quando a sessão chega em FINISHED
+    t.join(timeout=5)
+    assert not t.is_alive()
+    r = result["r"]
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(r.text)
+    assert [(kind, e.get("status")) for kind, e in events] == [
+        ("status", "CREATED"),
+        ("status", "RUNNING"),
+        ("summary", None),
+        ("status", "FINISHED"),
+    ]
+    assert events[2][1]["reps"] == 7
+    assert event_bus.subscriber_count(session_topic(session_id)) == 0
+
+    # sessão já finalizada: só o estado atual, e o stream fecha
+    r = client.get(f"/v1/sessions/{session_id}/events", headers=headers)
+    assert [kind for kind, _ in _parse_sse(r.text)] == ["summary", "status"]
+
+
+def test_session_events_requires_token(client):
+    r = client.get("/v1/sessions/whatever/events")
+    assert r.status_code == 401
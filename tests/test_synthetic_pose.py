@@ -0,0 +1,174 @@
+import os
+import time
+import urllib.parse
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.exercise_analysis.knee_extension_v1 import (
+    KneeExtensionState,
+    update_knee_extension,
+)
+from app.services.pose_backends import PoseBackend, SyntheticPoseBackend, create_pose_backend
+from app.services.pose_logic import rom_from_keypoints
+from app.services.pose_runtime import PoseRuntime
+
+FRAME = Path(__file__).parent / "assets" / "frame.jpg"
+RGB = np.zeros((4, 4, 3), np.uint8)
+
+
+def _roms(backend: SyntheticPoseBackend, n: int) -> list[float | None]:
+    out = []
+    for _ in range(n):
+        kps = backend.process(RGB)
+        out.append(rom_from_keypoints(kps) if kps else None)
+    return out
+
+
+def test_trajectory_covers_the_exercise_range():
+    roms = _roms(SyntheticPoseBackend(fps=30, period_s=3.0), 90)
+    assert min(roms) == pytest.approx(85, abs=0.5)
+    assert max(roms) == pytest.approx(178, abs=0.5)
+
+
+def test_same_seed_same_sequence():
+    kwargs = {"fps": 10, "noise": 0.01, "dropout": 0.2, "seed": 7}
+    a = _roms(SyntheticPoseBackend(**kwargs), 50)
+    b = _roms(SyntheticPoseBackend(**kwargs), 50)
+    assert a == b
+    assert a.count(None) > 0  # quedas aparecem como frame sem pessoa
+
+
+def test_analyzer_counts_synthetic_reps():
+    backend = SyntheticPoseBackend(fps=10, period_s=3.0, noise=0.002)
+    state = KneeExtensionState()
+    for i in range(300):  # 30 s => 10 reps
+        rom = rom_from_keypoints(backend.process(RGB))
+        metrics = update_knee_extension(rom, state, ts_ms=i * 100)
+    assert metrics["reps"] in (9, 10)
+
+
+def test_simulated_cost_scales_with_model_complexity():
+    backend = SyntheticPoseBackend(fps=10, cost_ms=5)
+    t0 = time.perf_counter()
+    backend.process(RGB)
+    full = time.perf_counter() - t0
+    backend.set_model_complexity(0)
+    t0 = time.perf_counter()
+    backend.process(RGB)
+    lite = time.perf_counter() - t0
+    assert full >= 0.005
+    assert lite < full
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_pose_backend("openpose")
+
+
+def test_backend_must_implement_process():
+    class NoProcess(PoseBackend):
+        name = "vazio"
+
+    with pytest.raises(TypeError, match="process"):
+        NoProcess()
+
+
+def _login_headers(client) -> dict:
+    r = client.post(
+        "/v1/auth/login",
+        data={
+            "username": os.getenv("TEST_PRO_EMAIL", "admin@admin.com"),
+            "password": os.getenv("TEST_PRO_PASSWORD", "123456"),
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _create_session(client, headers) -> str:
+    unique = time.time_ns()
+    r = client.post(
+        "/v1/patients",
+        json={"name": "Paciente", "email": f"sint{unique}@teste.com", "password": "teste1234"},
+        headers=headers,
+    )
+    patient_id = r.json()["id"]
+    r = client.post(
+        "/v1/exercises",
+        json={
+            "title": f"Extensão sintética {unique}",
+            "body_focus": "LOWER",
+            "analysis_kind": "KNEE_EXTENSION_V1",
+        },
+        headers=headers,
+    )
+    exercise_id = r.json()["id"]
+    r = client.post(
+        "/v1/assignments/configs",
+        json={"exercise_id": exercise_id, "patient_user_id": patient_id, "params": {}},
+        headers=headers,
+    )
+    r = client.post(
+        "/v1/assignments",
+        json={
+            "patient_user_id": patient_id,
+            "exercise_id": exercise_id,
+            "config_id": r.json()["id"],
+            "schedule": "DAILY",
+            "active": True,
+        },
+        headers=headers,
+    )
+    r = client.post(
+        f"/v1/patients/{patient_id}/sessions",
+        json={"exercise_id": exercise_id, "assignment_id": r.json()["id"], "config_snapshot": {}},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_ws_pipeline_with_synthetic_backend(client, monkeypatch):
+    monkeypatch.setattr(settings, "pose_backend", "synthetic")
+    monkeypatch.setattr(settings, "synthetic_pose_fps", 0.0)  # tempo real
+    monkeypatch.setattr(settings, "synthetic_pose_period_s", 0.8)
+    monkeypatch.setattr(settings, "synthetic_pose_cost_ms", 0.0)
+    # o frame é sempre o mesmo: o gate pularia tudo
+    monkeypatch.setattr(settings, "motion_gate_threshold", 0.0)
+    monkeypatch.setattr(settings, "infer_qos_enabled", False)
+
+    headers = _login_headers(client)
+    session_id = _create_session(client, headers)
+    token = urllib.parse.quote(headers["Authorization"].split()[1], safe="")
+    frame = FRAME.read_bytes()
+
+    reps = 0
+    with client.websocket_connect(f"/v1/infer/ws/session/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        end = time.monotonic() + 2.2
+        while time.monotonic() < end:
+            ws.send_bytes(frame)
+            msg = ws.receive_json()
+            assert msg["type"] == "metrics" and msg["ok"], msg
+            reps = msg["repeticoes"]
+            time.sleep(0.02)
+
+    assert reps >= 2
+    r = client.get(f"/v1/sessions/{session_id}", headers=headers)
+    assert r.json()["status"] == "FINISHED"
+    r = client.get(f"/v1/sessions/{session_id}/summary", headers=headers)
+    assert r.status_code == 200, r.text
+
+
+def test_runtime_uses_configured_backend(monkeypatch):
+    monkeypatch.setattr(settings, "pose_backend", "synthetic")
+    runtime = PoseRuntime(model_complexity=2)
+    assert runtime.backend.name == "synthetic"
+    runtime.set_model_complexity(0)
+    assert runtime.backend.model_complexity == 0
+    bgr = runtime.decode_jpeg(FRAME.read_bytes())
+    assert rom_from_keypoints(runtime.infer_keypoints(bgr)) is not None